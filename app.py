@@ -2,18 +2,40 @@
 Flight Search Application - Caută cele mai ieftine zboruri
 """
 import streamlit as st
-import pandas as pd
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 from datetime import datetime, date, timedelta
-from typing import Optional, List
+from typing import TYPE_CHECKING, Optional, List, Dict, Tuple, Callable, Hashable, Iterable
+import hashlib
+import hmac
+import html
+import json
+import os
 import time
 
 # Importuri locale
-from services.flight_apis import FlightSearchService, FlightOffer
-from services.cache_manager import cache_manager
+from services.flight_apis import FlightOffer, get_flight_service
+from services.cache_manager import SearchKey
+from services.prefetch import get_prefetcher
+from services.fx import get_fx_rates
+from services.scheduler import Priority, request_context
+from services.export import (
+    EXPORT_FORMATS, CATALOG_COLUMNS, ExportCache, ExportFile, available_formats,
+    export_bytes, export_to_file, iter_catalog_rows
+)
+from services.events import (
+    EventListener, ServiceEvent, use_listener, DEBUG, INFO, SUCCESS, WARNING, ERROR
+)
+from services.tracing import current_span, span, trace, traced
+from services.profiler import SamplingProfiler, profile_path, sampling
 from utils.validators import validate_search_params
-from utils.helpers import format_price
+from utils.helpers import CURRENCY_SYMBOLS, format_price, page_bounds
 from config.settings import Settings
 
+# pandas (~0.4s la import) se încarcă abia când există date de afișat
+# (rezultate, istoric de prețuri, explorator); primul paint nu are nevoie de el
+if TYPE_CHECKING:
+    import pandas as pd
+
 # Configurare pagină
 st.set_page_config(
     page_title="✈️ Flight Search - Găsește Zboruri Ieftine",
@@ -74,6 +96,29 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+class StreamlitEventListener(EventListener):
+    """Randează evenimentele serviciilor în pagina Streamlit curentă"""
+    
+    def __init__(self, show_debug: bool = True):
+        self.show_debug = show_debug
+    
+    def on_event(self, event: ServiceEvent):
+        if event.level == DEBUG:
+            if self.show_debug:
+                with st.expander(event.message, expanded=False):
+                    for name, value in event.data.items():
+                        st.write(f"**{name.capitalize()}:** {value}")
+            return
+        
+        render = {
+            INFO: st.info,
+            SUCCESS: st.success,
+            WARNING: st.warning,
+            ERROR: st.error,
+        }.get(event.level, st.write)
+        render(event.message)
+
+
 def init_session_state():
     """Inițializează session state"""
     if 'search_results' not in st.session_state:
@@ -82,8 +127,6 @@ def init_session_state():
         st.session_state.monitored_routes = {}
     if 'last_search' not in st.session_state:
         st.session_state.last_search = None
-    if 'flight_service' not in st.session_state:
-        st.session_state.flight_service = FlightSearchService()
     
     # Pentru selectoare
     if 'origin_continent' not in st.session_state:
@@ -100,11 +143,153 @@ def init_session_state():
         st.session_state.dest_airport = None
 
 
-@st.cache_data(ttl=86400, show_spinner=False)
-def get_airports_by_continent():
+@st.cache_resource(show_spinner=False)
+def get_service():
+    """
+    Serviciul partajat de toate sesiunile din proces
+    
+    Local (get_flight_service) sau proxy către procesul worker, dacă e
+    configurat. Sesiunile nu mai păstrează propriul serviciu în session state.
+    """
+    if Settings.WORKER_ADDRESS:
+        from services.worker import WorkerClient, RemoteFlightSearchService
+        return RemoteFlightSearchService(WorkerClient(Settings.WORKER_ADDRESS))
+    service = get_flight_service()
+    if Settings.WARMUP_ENABLED:
+        from services.warmup import start_warmup
+        start_warmup(service)
+    return service
+
+
+def is_admin() -> bool:
+    """Sesiunea are acces la uneltele de administrare (?admin=<Settings.ADMIN_TOKEN>)"""
+    if st.session_state.get('is_admin'):
+        return True
+    token = Settings.ADMIN_TOKEN
+    if token and hmac.compare_digest(st.query_params.get('admin', ''), token):
+        st.session_state.is_admin = True
+        return True
+    return False
+
+
+def get_session_id() -> str:
+    """Identificatorul sesiunii Streamlit curente (pentru planificatorul de cereri)"""
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else 'default'
+
+
+# ============================================
+# PREFETCH SPECULATIV (formularul de căutare)
+# ============================================
+
+def form_prefetcher():
+    """Prefetcher-ul procesului; doar în modul local (cache-ul e în procesul aplicației)"""
+    if Settings.WORKER_ADDRESS:
+        return None
+    return get_prefetcher(get_service())
+
+
+def search_key(params: dict) -> SearchKey:
+    """Cheia de cache a unor parametri de căutare din formular (moneda de bază, oricare ar fi cea afișată)"""
+    return SearchKey.create(
+        params['origin'], params['destination'], params['departure_date'], params.get('return_date'),
+        params.get('adults', 1), params.get('children', 0), params.get('infants', 0),
+        params.get('cabin_class', 'ECONOMY'), Settings.BASE_CURRENCY
+    )
+
+
+def form_search_key() -> Optional[SearchKey]:
+    """
+    Cheia căutării pe care formularul o va trimite, dacă e completat
+
+    Pasagerii și clasa (în interiorul formularului, nevizibile până la
+    trimitere) sunt luate din ultima căutare a sesiunii.
+    """
+    state = st.session_state
+    origin, destination = state.get('origin_airport'), state.get('dest_airport')
+    departure = state.get('departure_date')
+    if not (origin and destination and departure) or origin == destination:
+        return None
+    return_date = state.get('return_date') if "Dus-întors" in state.get('trip_type', '') else None
+    return search_key({
+        **(state.get('last_search') or {}),
+        'origin': origin,
+        'destination': destination,
+        'departure_date': departure.strftime('%Y-%m-%d'),
+        'return_date': return_date.strftime('%Y-%m-%d') if return_date else None,
+    })
+
+
+def prefetch_airport(code: str):
+    """Rezolvă aeroportul ales în fundal, înainte de trimiterea formularului"""
+    prefetcher = form_prefetcher()
+    if prefetcher is not None:
+        prefetcher.prefetch_airport(code)
+
+
+def update_flight_prefetch():
+    """Programează căutarea pentru starea curentă a formularului (sau o anulează)"""
+    prefetcher = form_prefetcher()
+    if prefetcher is None:
+        return
+    key = form_search_key()
+    if key is None:
+        prefetcher.cancel(get_session_id())
+    else:
+        prefetcher.prefetch_flights(get_session_id(), key)
+
+
+@st.cache_resource(ttl=86400, show_spinner=False)
+def load_airport_catalog() -> Tuple[dict, str]:
+    """
+    Catalogul de aeroporturi (continent -> țară -> listă) și versiunea lui
+    
+    cache_resource: catalogul e partajat read-only, fără copiere la fiecare rerun.
+    Agregatele derivate sunt memorate per versiune.
+    """
+    service = get_service()
+    with use_listener(StreamlitEventListener(show_debug=False)):
+        airports = service.get_all_airports()
+    version = hashlib.md5(json.dumps(airports, sort_keys=True, default=str).encode()).hexdigest()[:12]
+    return airports, version
+
+
+def get_airports_by_continent() -> dict:
     """Obține aeroporturile organizate pe continente"""
-    service = FlightSearchService()
-    return service.get_all_airports()
+    return load_airport_catalog()[0]
+
+
+def get_catalog_version() -> str:
+    return load_airport_catalog()[1]
+
+
+@st.cache_data(ttl=86400, show_spinner=False)
+def get_country_options(version: str, continent: str) -> List[str]:
+    """Țările unui continent, sortate"""
+    return sorted(get_airports_by_continent().get(continent, {}).keys())
+
+
+@st.cache_data(ttl=86400, show_spinner=False)
+def get_catalog_stats(version: str) -> Dict[str, int]:
+    """Numărul de continente, țări și aeroporturi din catalog"""
+    airports = get_airports_by_continent()
+    return {
+        'continents': len(airports),
+        'countries': sum(len(countries) for countries in airports.values()),
+        'airports': sum(len(lst) for countries in airports.values() for lst in countries.values()),
+    }
+
+
+@st.cache_data(ttl=86400, show_spinner=False)
+def get_airport_options(version: str, continent: str, country: str) -> Dict[str, str]:
+    """Etichetele de afișare ale aeroporturilor unei țări -> cod IATA"""
+    options = {}
+    for a in get_airports_by_continent().get(continent, {}).get(country, []):
+        display_name = f"{a['iata']} - {a['name']}"
+        if a.get('city'):
+            display_name += f" ({a['city']})"
+        options[display_name] = a['iata']
+    return options
 
 
 def create_airport_selector(label: str, key_prefix: str) -> Optional[str]:
@@ -123,7 +308,10 @@ def create_airport_selector(label: str, key_prefix: str) -> Optional[str]:
             max_chars=3,
             placeholder="Ex: OTP"
         )
-        return manual_code.upper() if manual_code else None
+        st.session_state[f'{key_prefix}_airport'] = manual_code.upper() if manual_code else None
+        if manual_code and len(manual_code) == 3:
+            prefetch_airport(manual_code)
+        return st.session_state[f'{key_prefix}_airport']
     
     st.markdown(f"**{label}**")
     
@@ -159,8 +347,7 @@ def create_airport_selector(label: str, key_prefix: str) -> Optional[str]:
         countries = ["-- Selectează --"]
         
         if selected_continent and selected_continent != "-- Selectează --":
-            if selected_continent in airports:
-                countries = ["-- Selectează --"] + sorted(list(airports[selected_continent].keys()))
+            countries = ["-- Selectează --"] + get_country_options(get_catalog_version(), selected_continent)
         
         # Găsește indexul curent
         current_country = st.session_state.get(f'{key_prefix}_country', None)
@@ -183,20 +370,13 @@ def create_airport_selector(label: str, key_prefix: str) -> Optional[str]:
     
     with col3:
         # Selectare aeroport
-        airport_options = ["-- Selectează --"]
         airport_codes = {}
         
         if (selected_continent and selected_continent != "-- Selectează --" and
             selected_country and selected_country != "-- Selectează --"):
-            
-            if selected_continent in airports and selected_country in airports[selected_continent]:
-                airport_list = airports[selected_continent][selected_country]
-                for a in airport_list:
-                    display_name = f"{a['iata']} - {a['name']}"
-                    if a.get('city'):
-                        display_name += f" ({a['city']})"
-                    airport_options.append(display_name)
-                    airport_codes[display_name] = a['iata']
+            airport_codes = get_airport_options(get_catalog_version(), selected_continent, selected_country)
+        
+        airport_options = ["-- Selectează --"] + list(airport_codes)
         
         # Găsește indexul curent
         current_airport = st.session_state.get(f'{key_prefix}_airport', None)
@@ -220,20 +400,195 @@ def create_airport_selector(label: str, key_prefix: str) -> Optional[str]:
             selected_airport = airport_codes.get(selected_airport_display)
             if selected_airport:
                 st.session_state[f'{key_prefix}_airport'] = selected_airport
+                prefetch_airport(selected_airport)
     
     return selected_airport
 
 
+@st.fragment
+def render_airport_selector(label: str, key_prefix: str, heading: str):
+    """Selector de aeroport care se re-rulează independent de restul paginii"""
+    st.markdown(heading)
+    with st.container():
+        airport = create_airport_selector(label, key_prefix)
+        if airport:
+            st.success(f"✅ Selectat: **{airport}**")
+    update_flight_prefetch()
+
+
+# Coloanele afișate în tabelul de rezultate
+RESULT_TABLE_COLUMNS = ['Companie', 'Cod', 'De la', 'Către', 'Plecare', 'Sosire', 'Durată', 'Preț', 'Monedă', 'Escale', 'Locuri']
+
+
+def to_base_currency(amount: float, currency: str) -> Optional[float]:
+    """Suma convertită din `currency` în Settings.BASE_CURRENCY; None fără curs de schimb"""
+    if currency == Settings.BASE_CURRENCY:
+        return amount
+    table = get_fx_rates().table()
+    try:
+        return table.convert(amount, currency, Settings.BASE_CURRENCY) if table else None
+    except KeyError:
+        return None
+
+
+def get_results_version(offers: List[FlightOffer]) -> int:
+    """
+    Versiunea setului de rezultate, crescută la fiecare listă nouă
+    
+    Cheie pentru vizualizare, pagini și export: id() al unei liste eliberate
+    poate fi refolosit de lista următoarei căutări.
+    """
+    current = st.session_state.get('_results_version')
+    if current is None or current[0] is not offers:
+        current = (offers, current[1] + 1 if current else 1)
+        st.session_state._results_version = current
+    return current[1]
+
+
+def get_results_frame(offers: List[FlightOffer], currency: Optional[str] = None) -> 'pd.DataFrame':
+    """
+    DataFrame-ul rezultatelor, construit o singură dată per căutare
+    
+    Cu `currency`, prețurile sunt convertite local (memorat per monedă); schimbarea
+    monedei afișate nu repetă căutarea.
+    """
+    import pandas as pd
+    cached = st.session_state.get('_results_frame')
+    if cached is None or cached[0] is not offers:
+        cached = (offers, pd.DataFrame([offer.to_dict() for offer in offers]))
+        st.session_state._results_frame = cached
+    if currency is None:
+        return cached[1]
+    
+    converted = st.session_state.get('_results_frame_fx')
+    if converted is None or converted[0] is not offers or converted[1] != currency:
+        converted = (offers, currency, convert_results_frame(cached[1], currency))
+        st.session_state._results_frame_fx = converted
+    return converted[2]
+
+
+def convert_results_frame(df: 'pd.DataFrame', currency: str) -> 'pd.DataFrame':
+    """
+    Prețurile convertite în `currency` printr-o înmulțire pe coloană
+    
+    Fără cursuri de schimb (sau pentru o monedă necunoscută) întoarce cadrul
+    nemodificat; coloana 'Monedă' arată moneda în care au rămas prețurile.
+    """
+    if df.empty or (df['Monedă'] == currency).all():
+        return df
+    table = get_fx_rates().table()
+    if table is None:
+        return df
+    try:
+        prices = table.convert_column(df['Preț'], df['Monedă'], currency)
+    except KeyError:
+        return df
+    return df.assign(**{'Preț': prices.round(2), 'Monedă': currency})
+
+
+def get_results_view(offers: List[FlightOffer], df: 'pd.DataFrame', view_key: tuple,
+                     filter_direct: bool, sort_by: str) -> 'pd.DataFrame':
+    """Rezultatele filtrate și sortate; recalculate doar când se schimbă criteriile"""
+    cached = st.session_state.get('_results_view')
+    if cached is not None and cached[0] == view_key:
+        return cached[1]
+    
+    # Filtrare
+    df_view = df
+    if filter_direct:
+        df_view = df_view[df_view['Escale'] == 0]
+    
+    # Sortare
+    if sort_by == "Preț (crescător)":
+        df_view = df_view.sort_values(by='Preț', ascending=True)
+    elif sort_by == "Preț (descrescător)":
+        df_view = df_view.sort_values(by='Preț', ascending=False)
+    elif sort_by == "Durată":
+        df_view = df_view.sort_values(by='Durată')
+    elif sort_by == "Ora plecării":
+        df_view = df_view.sort_values(by='Plecare')
+    elif sort_by == "Escale":
+        df_view = df_view.sort_values(by=['Escale', 'Preț'])
+    
+    st.session_state._results_view = (view_key, df_view)
+    st.session_state._results_pages = {}
+    return df_view
+
+
+def move_results_page(delta: int):
+    st.session_state.results_page = st.session_state.get('results_page', 0) + delta
+
+
+def render_pagination(total: int, view_key: tuple) -> Tuple[int, int]:
+    """Controale de paginare; cursorul paginii revine la 0 când se schimbă vizualizarea"""
+    if st.session_state.get('_results_page_key') != view_key:
+        st.session_state._results_page_key = view_key
+        st.session_state.results_page = 0
+    
+    col1, col2, col3, col4 = st.columns([1, 2, 1, 2])
+    
+    with col4:
+        page_size = st.selectbox(
+            "Rezultate pe pagină",
+            options=Settings.RESULTS_PAGE_SIZES,
+            index=Settings.RESULTS_PAGE_SIZES.index(Settings.RESULTS_PAGE_SIZE),
+            key="results_page_size"
+        )
+    
+    # Callback-urile butoanelor mută cursorul înainte de randare
+    start, end, page_count = page_bounds(total, st.session_state.get('results_page', 0), page_size)
+    page = start // page_size
+    st.session_state.results_page = page
+    
+    with col1:
+        st.button("◀ Înapoi", disabled=page == 0, key="results_prev",
+                  on_click=move_results_page, args=(-1,))
+    with col3:
+        st.button("Înainte ▶", disabled=page >= page_count - 1, key="results_next",
+                  on_click=move_results_page, args=(1,))
+    with col2:
+        st.caption(f"Pagina {page + 1} din {page_count} · zborurile {start + 1}-{end} din {total}")
+    
+    return page, page_size
+
+
+def get_results_page(offers: List[FlightOffer], df_view: 'pd.DataFrame', view_key: tuple,
+                     page: int, page_size: int) -> dict:
+    """Felia unei pagini (tabel + oferte pentru carduri), memorată per vizualizare"""
+    pages = st.session_state.setdefault('_results_pages', {})
+    cache_key = (view_key, page, page_size)
+    if cache_key not in pages:
+        start, end, _ = page_bounds(len(df_view), page, page_size)
+        by_id = st.session_state.get('_results_by_id')
+        if by_id is None or by_id[0] is not offers:
+            by_id = (offers, {offer.id: offer for offer in offers})
+            st.session_state._results_by_id = by_id
+        page_df = df_view.iloc[start:end]
+        pages[cache_key] = {
+            'table': page_df[RESULT_TABLE_COLUMNS],
+            # Cardurile primesc prețul din cadru (convertit în moneda afișată)
+            'cards': [(by_id[1][offer_id], price) for offer_id, price in zip(page_df['ID'], page_df['Preț'])],
+        }
+        # Păstrează doar câteva pagini (curenta, următoarea, precedenta)
+        while len(pages) > 3:
+            pages.pop(next(iter(pages)))
+    return pages[cache_key]
+
+
+@traced('display_flight_results')
 def display_flight_results(offers: List[FlightOffer], currency: str = 'EUR'):
-    """Afișează rezultatele căutării într-un tabel"""
+    """Afișează rezultatele căutării într-un tabel, cu prețurile în moneda `currency`"""
+    current_span().set_attribute('offers', len(offers))
     
     if not offers:
         st.info("🔍 Nu s-au găsit zboruri pentru criteriile selectate. Încearcă alte date sau dezactivează filtrul 'Doar zboruri directe'.")
         return
     
-    # Creare DataFrame
-    data = [offer.to_dict() for offer in offers]
-    df = pd.DataFrame(data)
+    # Creare DataFrame (memorat pentru interacțiunile următoare), convertit local
+    df = get_results_frame(offers, currency)
+    if df['Monedă'].iloc[0] != currency:
+        st.caption(f"💱 Cursurile de schimb nu sunt disponibile; prețurile sunt afișate în {df['Monedă'].iloc[0]}.")
+        currency = df['Monedă'].iloc[0]
     
     # Statistici
     st.markdown("### 📊 Rezumat")
@@ -274,43 +629,30 @@ def display_flight_results(offers: List[FlightOffer], currency: str = 'EUR'):
     with col3:
         filter_direct = st.checkbox("Arată doar zboruri directe", key="filter_direct_results")
     
-    # Filtrare
-    df_filtered = df.copy()
-    if filter_direct:
-        df_filtered = df_filtered[df_filtered['Escale'] == 0]
+    # Vizualizare filtrată și sortată, memorată per (căutare, monedă, filtru, sortare)
+    view_key = (get_results_version(offers), currency, filter_direct, sort_by)
+    df_view = get_results_view(offers, df, view_key, filter_direct, sort_by)
     
-    # Sortare
-    if sort_by == "Preț (crescător)":
-        df_filtered = df_filtered.sort_values(by='Preț', ascending=True)
-    elif sort_by == "Preț (descrescător)":
-        df_filtered = df_filtered.sort_values(by='Preț', ascending=False)
-    elif sort_by == "Durată":
-        df_filtered = df_filtered.sort_values(by='Durată')
-    elif sort_by == "Ora plecării":
-        df_filtered = df_filtered.sort_values(by='Plecare')
-    elif sort_by == "Escale":
-        df_filtered = df_filtered.sort_values(by=['Escale', 'Preț'])
+    if df_view.empty:
+        st.info("Nu există zboruri directe pentru această rută.")
+        return
     
-    # Filtrare oferte pentru carduri
-    filtered_offers = [o for o in offers if o.id in df_filtered['ID'].values] if filter_direct else offers
+    # Paginare server-side: doar pagina vizibilă e trimisă către browser
+    page, page_size = render_pagination(len(df_view), view_key)
+    current = get_results_page(offers, df_view, view_key, page, page_size)
     
     if "Tabel" in view_mode:
         # Afișare tabel stil Excel
         st.markdown("### 📋 Rezultate Căutare")
         
-        # Selectează coloanele de afișat
-        columns_to_show = ['Companie', 'Cod', 'De la', 'Către', 'Plecare', 'Sosire', 'Durată', 'Preț', 'Monedă', 'Escale', 'Locuri']
-        df_display = df_filtered[columns_to_show].copy()
-        
-        # Afișare DataFrame
         st.dataframe(
-            df_display,
+            current['table'],
             use_container_width=True,
-            height=500,
+            height=min(500, 38 + 35 * len(current['table'])),
             column_config={
                 "Preț": st.column_config.NumberColumn(
                     "💰 Preț",
-                    format="%.2f €"
+                    format=f"%.2f {CURRENCY_SYMBOLS.get(currency, currency)}"
                 ),
                 "Escale": st.column_config.NumberColumn(
                     "🔄 Escale",
@@ -332,24 +674,18 @@ def display_flight_results(offers: List[FlightOffer], currency: str = 'EUR'):
             hide_index=True
         )
         
-        # Buton export
-        csv = df_filtered.to_csv(index=False)
-        st.download_button(
-            label="📥 Descarcă CSV",
-            data=csv,
-            file_name=f"zboruri_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
-            mime="text/csv"
+        # Export generat doar la cerere
+        render_export_controls(
+            "results", view_key,
+            lambda: (df_view.to_dict('records'), list(df_view.columns)),
+            f"zboruri_{datetime.now().strftime('%Y%m%d_%H%M')}"
         )
         
     else:
         # Afișare carduri
         st.markdown("### ✈️ Zboruri Găsite")
         
-        if not filtered_offers:
-            st.info("Nu există zboruri directe pentru această rută.")
-            return
-        
-        for i, offer in enumerate(filtered_offers[:30]):  # Limită 30 pentru performanță
+        for offer, price in current['cards']:
             with st.container():
                 col1, col2, col3, col4 = st.columns([2, 2, 1, 1])
                 
@@ -371,7 +707,7 @@ def display_flight_results(offers: List[FlightOffer], currency: str = 'EUR'):
                         st.warning(f"🔄 {offer.stops} {'escală' if offer.stops == 1 else 'escale'}")
                 
                 with col4:
-                    st.markdown(f"### {format_price(offer.price, offer.currency)}")
+                    st.markdown(f"### {format_price(price, currency)}")
                     if offer.seats_available:
                         if offer.seats_available <= 3:
                             st.error(f"🪑 Doar {offer.seats_available} locuri!")
@@ -379,6 +715,160 @@ def display_flight_results(offers: List[FlightOffer], currency: str = 'EUR'):
                             st.caption(f"🪑 {offer.seats_available} locuri")
                 
                 st.markdown("---")
+    
+    # Pregătește pagina următoare cât timp utilizatorul o citește pe cea curentă
+    if (page + 1) * page_size < len(df_view):
+        get_results_page(offers, df_view, view_key, page + 1, page_size)
+
+
+def render_export_controls(key: str, version: Hashable,
+                           build_rows: Callable[[], Tuple[Iterable[dict], List[str]]],
+                           file_stem: str):
+    """
+    Export în formatul ales; octeții se generează doar la cerere
+    
+    Rezultatul e memorat per (cheie, versiune, format) în sesiune, deci
+    rerun-urile următoare nu mai serializează nimic.
+    """
+    formats = available_formats()
+    cache = st.session_state.setdefault('_export_cache', ExportCache())
+    
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        fmt = st.selectbox(
+            "Format export",
+            options=formats,
+            format_func=lambda f: EXPORT_FORMATS[f].label,
+            key=f"{key}_export_format"
+        )
+    
+    export_format = EXPORT_FORMATS[fmt]
+    cache_key = (key, version, fmt)
+    data = cache.get(cache_key)
+    
+    with col2:
+        st.markdown("")
+        if data is None and st.button("📦 Pregătește export", key=f"{key}_export_prepare"):
+            rows, columns = build_rows()
+            data = cache.put(cache_key, export_bytes(rows, columns, fmt))
+        if data is not None:
+            st.download_button(
+                label=f"📥 Descarcă {export_format.label}",
+                data=data,
+                file_name=f"{file_stem}.{export_format.extension}",
+                mime=export_format.mime,
+                key=f"{key}_export_download"
+            )
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def get_catalog_export_file(version: str, fmt: str) -> ExportFile:
+    """
+    Exportul catalogului complet, scris în flux într-un fișier temporar (o dată per versiune)
+
+    Fișierul e șters când intrarea iese din cache sau la oprirea serverului.
+    """
+    return ExportFile(export_to_file(iter_catalog_rows(get_airports_by_continent()), CATALOG_COLUMNS, fmt))
+
+
+def render_catalog_export():
+    """Export al întregului catalog de aeroporturi"""
+    st.markdown("#### 📦 Catalog complet")
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        fmt = st.selectbox(
+            "Format catalog",
+            options=available_formats(),
+            format_func=lambda f: EXPORT_FORMATS[f].label,
+            key="catalog_export_format"
+        )
+    
+    export_format = EXPORT_FORMATS[fmt]
+    prepared = st.session_state.setdefault('_catalog_exports', set())
+    cache_key = (get_catalog_version(), fmt)
+    
+    with col2:
+        st.markdown("")
+        if cache_key not in prepared and st.button("📦 Pregătește catalogul", key="catalog_export_prepare"):
+            prepared.add(cache_key)
+        if cache_key in prepared:
+            export_file = get_catalog_export_file(*cache_key)
+            if not export_file.exists():
+                # Fișierul temporar a fost șters între timp; îl regenerăm
+                get_catalog_export_file.clear()
+                export_file = get_catalog_export_file(*cache_key)
+            with open(export_file.path, 'rb') as f:
+                st.download_button(
+                    label=f"📥 Descarcă toate aeroporturile ({export_format.label})",
+                    data=f,
+                    file_name=f"aeroporturi.{export_format.extension}",
+                    mime=export_format.mime,
+                    key="catalog_export_download"
+                )
+
+
+@st.fragment
+def render_results_panel():
+    """Panoul de rezultate; filtrele și sortarea re-rulează doar acest fragment"""
+    if not st.session_state.search_results:
+        return
+    
+    st.markdown("---")
+    
+    if st.session_state.pop('monitor_added', False):
+        st.success("✅ Rută adăugată la monitorizare!")
+        st.balloons()
+    
+    # Moneda afișată: cea aleasă la căutare, schimbabilă fără o căutare nouă
+    if 'display_currency' not in st.session_state:
+        st.session_state.display_currency = (st.session_state.last_search or {}).get('currency', Settings.BASE_CURRENCY)
+    
+    # Buton adăugare la monitor
+    if st.session_state.last_search:
+        with st.expander("📈 Adaugă la Monitorizare Prețuri"):
+            col1, col2 = st.columns(2)
+            
+            # Ținta se introduce în moneda afișată și se salvează în moneda de bază
+            # (cea a istoricului de prețuri); fără curs, direct în moneda de bază
+            target_currency = st.session_state.display_currency
+            if to_base_currency(1.0, target_currency) is None:
+                target_currency = Settings.BASE_CURRENCY
+            
+            with col1:
+                target_price = st.number_input(
+                    f"💰 Preț țintă în {target_currency} (opțional)",
+                    min_value=0.0,
+                    value=0.0,
+                    step=10.0,
+                    help="Vei fi notificat când prețul scade sub această valoare"
+                )
+            
+            with col2:
+                st.markdown("")
+                st.markdown("")
+                if st.button("📈 Adaugă la Monitor", use_container_width=True):
+                    params = st.session_state.last_search
+                    service = get_service()
+                    service.add_price_monitor(
+                        origin=params['origin'],
+                        destination=params['destination'],
+                        departure_date=params['departure_date'],
+                        target_price=round(to_base_currency(target_price, target_currency), 2)
+                        if target_price > 0 else None
+                    )
+                    # Rerun complet ca tab-ul de monitorizare să includă ruta nouă
+                    st.session_state.monitor_added = True
+                    st.rerun()
+    
+    currency = st.selectbox(
+        "💱 Monedă afișată",
+        options=Settings.CURRENCIES,
+        key="display_currency",
+        help=f"Căutarea se face în {Settings.BASE_CURRENCY}; prețurile sunt convertite local"
+    )
+    
+    # Afișare rezultate
+    display_flight_results(st.session_state.search_results, currency)
 
 
 def render_search_form():
@@ -395,60 +885,61 @@ def render_search_form():
     col1, col2 = st.columns(2)
     
     with col1:
-        st.markdown("##### De unde pleci?")
-        with st.container():
-            origin = create_airport_selector("Origine", "origin")
-            if origin:
-                st.success(f"✅ Selectat: **{origin}**")
+        render_airport_selector("Origine", "origin", "##### De unde pleci?")
     
     with col2:
-        st.markdown("##### Unde mergi?")
-        with st.container():
-            destination = create_airport_selector("Destinație", "dest")
-            if destination:
-                st.success(f"✅ Selectat: **{destination}**")
+        render_airport_selector("Destinație", "dest", "##### Unde mergi?")
     
     st.markdown("---")
     
     # ============================================
-    # RESTUL FORMULARULUI
+    # DATE CĂLĂTORIE (în afara formularului: o dată nouă
+    # reprogramează prefetch-ul căutării)
     # ============================================
     
-    with st.form("search_form"):
-        # Rând 1: Date
-        st.markdown("### 📅 Date Călătorie")
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            departure_date = st.date_input(
-                "Data plecării",
-                min_value=date.today(),
+    st.markdown("### 📅 Date Călătorie")
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        departure_date = st.date_input(
+            "Data plecării",
+            min_value=date.today(),
+            max_value=date.today() + timedelta(days=365),
+            value=date.today() + timedelta(days=30),
+            key="departure_date"
+        )
+    
+    with col2:
+        trip_type = st.radio(
+            "Tip călătorie",
+            ["✈️ Doar dus", "🔄 Dus-întors"],
+            horizontal=True,
+            key="trip_type"
+        )
+    
+    with col3:
+        return_date = None
+        if "Dus-întors" in trip_type:
+            return_date = st.date_input(
+                "Data întoarcerii",
+                min_value=departure_date + timedelta(days=1),
                 max_value=date.today() + timedelta(days=365),
-                value=date.today() + timedelta(days=30)
+                value=departure_date + timedelta(days=7),
+                key="return_date"
             )
-        
-        with col2:
-            trip_type = st.radio(
-                "Tip călătorie",
-                ["✈️ Doar dus", "🔄 Dus-întors"],
-                horizontal=True
-            )
-        
-        with col3:
-            return_date = None
-            if "Dus-întors" in trip_type:
-                return_date = st.date_input(
-                    "Data întoarcerii",
-                    min_value=departure_date + timedelta(days=1),
-                    max_value=date.today() + timedelta(days=365),
-                    value=departure_date + timedelta(days=7)
-                )
-            else:
-                st.empty()
-        
-        st.markdown("---")
-        
-        # Rând 2: Pasageri
+        else:
+            st.empty()
+    
+    update_flight_prefetch()
+    
+    st.markdown("---")
+    
+    # ============================================
+    # RESTUL FORMULARULUI
+    # ============================================
+    
+    with st.form("search_form"):
+        # Rând 1: Pasageri
         st.markdown("### 👥 Pasageri")
         col1, col2, col3, col4 = st.columns(4)
         
@@ -475,7 +966,7 @@ def render_search_form():
         
         st.markdown("---")
         
-        # Rând 3: Opțiuni
+        # Rând 2: Opțiuni
         st.markdown("### ⚙️ Opțiuni Căutare")
         col1, col2, col3 = st.columns(3)
         
@@ -485,7 +976,7 @@ def render_search_form():
         with col2:
             currency = st.selectbox(
                 "💱 Monedă",
-                options=['EUR', 'USD', 'GBP', 'RON'],
+                options=Settings.CURRENCIES,
                 index=0
             )
         
@@ -493,7 +984,7 @@ def render_search_form():
             max_results = st.slider(
                 "📊 Număr maxim rezultate",
                 min_value=10,
-                max_value=100,
+                max_value=500,
                 value=50,
                 step=10
             )
@@ -510,9 +1001,9 @@ def render_search_form():
             )
         
         if submitted:
-            # Preia valorile din session state pentru aeroporturi
-            final_origin = st.session_state.get('origin_airport') or origin
-            final_destination = st.session_state.get('dest_airport') or destination
+            # Selectoarele (fragmente) își păstrează alegerea în session state
+            final_origin = st.session_state.get('origin_airport')
+            final_destination = st.session_state.get('dest_airport')
             
             return {
                 'origin': final_origin,
@@ -531,13 +1022,24 @@ def render_search_form():
     return None
 
 
+@st.cache_data(max_entries=500, show_spinner=False)
+def get_price_history_series(route_key: str, version: tuple, _history: List[dict]) -> 'pd.Series':
+    """Seria de prețuri a unei rute, reconstruită doar când istoricul se schimbă"""
+    import pandas as pd
+    df = pd.DataFrame(_history)
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    return df.set_index('timestamp')['price']
+
+
+@st.fragment
 def render_price_monitor():
     """Randează secțiunea de monitorizare prețuri"""
     
     st.markdown("### 📈 Monitor Prețuri")
     st.caption("Urmărește evoluția prețurilor pentru rutele tale favorite")
     
-    monitors = cache_manager.get_price_monitors()
+    service = get_service()
+    monitors = service.get_monitored_routes()
     
     if not monitors:
         st.info("📭 Nu ai nicio rută monitorizată încă.\n\nCaută un zbor și apasă 'Adaugă la Monitor' pentru a urmări prețurile!")
@@ -550,14 +1052,14 @@ def render_price_monitor():
             with col1:
                 lowest = monitor.get('lowest_price')
                 if lowest:
-                    st.metric("💰 Preț minim", format_price(lowest, 'EUR'))
+                    st.metric("💰 Preț minim", format_price(lowest, Settings.BASE_CURRENCY))
                 else:
                     st.metric("💰 Preț minim", "N/A")
             
             with col2:
                 target = monitor.get('target_price')
                 if target:
-                    st.metric("🎯 Preț țintă", format_price(target, 'EUR'))
+                    st.metric("🎯 Preț țintă", format_price(target, Settings.BASE_CURRENCY))
                     if lowest and lowest <= target:
                         st.success("✅ Sub prețul țintă!")
                 else:
@@ -571,19 +1073,28 @@ def render_price_monitor():
             
             with col4:
                 if st.button(f"🗑️ Șterge", key=f"remove_{route_key}"):
-                    cache_manager.remove_price_monitor(route_key)
-                    st.rerun()
+                    service.remove_price_monitor(route_key)
+                    st.rerun(scope="fragment")
             
             # Istoric prețuri
-            history = cache_manager.get_price_history(route_key)
+            history = service.get_price_history(route_key)
             if history and len(history) > 1:
                 st.markdown("**📊 Evoluție prețuri:**")
-                df = pd.DataFrame(history)
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
-                df = df.set_index('timestamp')
-                st.line_chart(df['price'])
+                version = (len(history), str(history[-1]['timestamp']))
+                st.line_chart(get_price_history_series(route_key, version, history))
 
 
+@st.cache_data(ttl=86400, show_spinner=False)
+def get_country_airports_frame(version: str, continent: str, country: str) -> 'pd.DataFrame':
+    """Tabelul aeroporturilor unei țări pentru explorator"""
+    import pandas as pd
+    df = pd.DataFrame(get_airports_by_continent().get(continent, {}).get(country, []))
+    if not df.empty:
+        df.columns = ['Cod IATA', 'Nume Aeroport', 'Oraș', 'Latitudine', 'Longitudine']
+    return df
+
+
+@st.fragment
 def render_airport_explorer():
     """Randează exploratorul de aeroporturi"""
     
@@ -596,22 +1107,16 @@ def render_airport_explorer():
         st.warning("⚠️ Nu s-au putut încărca aeroporturile. Verifică conexiunea API.")
         return
     
-    # Statistici globale
-    total_airports = sum(
-        len(airports[cont][country])
-        for cont in airports
-        for country in airports[cont]
-    )
-    
-    total_countries = sum(len(airports[cont]) for cont in airports)
+    # Statistici globale (calculate o dată per versiune de catalog)
+    stats = get_catalog_stats(get_catalog_version())
     
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("🌍 Continente", len(airports))
+        st.metric("🌍 Continente", stats['continents'])
     with col2:
-        st.metric("🏳️ Țări", total_countries)
+        st.metric("🏳️ Țări", stats['countries'])
     with col3:
-        st.metric("✈️ Aeroporturi", total_airports)
+        st.metric("✈️ Aeroporturi", stats['airports'])
     
     st.markdown("---")
     
@@ -628,7 +1133,7 @@ def render_airport_explorer():
     selected_country = None
     with col2:
         if selected_continent:
-            countries = sorted(list(airports[selected_continent].keys()))
+            countries = get_country_options(get_catalog_version(), selected_continent)
             selected_country = st.selectbox(
                 "🏳️ Selectează Țara",
                 options=countries,
@@ -642,13 +1147,9 @@ def render_airport_explorer():
         st.markdown(f"### ✈️ Aeroporturi în {selected_country}")
         st.caption(f"Total: {len(airport_list)} aeroporturi")
         
-        # Creare DataFrame
-        df = pd.DataFrame(airport_list)
+        df = get_country_airports_frame(get_catalog_version(), selected_continent, selected_country)
         
         if not df.empty:
-            # Redenumește coloanele
-            df.columns = ['Cod IATA', 'Nume Aeroport', 'Oraș', 'Latitudine', 'Longitudine']
-            
             # Afișare tabel
             st.dataframe(
                 df[['Cod IATA', 'Nume Aeroport', 'Oraș']],
@@ -662,13 +1163,14 @@ def render_airport_explorer():
             )
             
             # Export
-            csv = df.to_csv(index=False)
-            st.download_button(
-                label=f"📥 Descarcă aeroporturi {selected_country}",
-                data=csv,
-                file_name=f"aeroporturi_{selected_country}.csv",
-                mime="text/csv"
+            render_export_controls(
+                "explorer", (get_catalog_version(), selected_continent, selected_country),
+                lambda: (df.to_dict('records'), list(df.columns)),
+                f"aeroporturi_{selected_country}"
             )
+    
+    st.markdown("---")
+    render_catalog_export()
 
 
 def render_sidebar():
@@ -685,7 +1187,7 @@ def render_sidebar():
         api_status = {
             "Amadeus": bool(keys.get('amadeus_key') and keys.get('amadeus_secret')),
             "AirLabs": bool(keys.get('airlabs_key')),
-            "RapidAPI": bool(keys.get('rapidapi_key'))
+            "RapidAPI": bool(keys.get('rapidapi_keys'))
         }
         
         for api, status in api_status.items():
@@ -694,6 +1196,10 @@ def render_sidebar():
             else:
                 st.error(f"❌ {api} - Neconfig.")
         
+        rapidapi_keys = keys.get('rapidapi_keys', [])
+        if len(rapidapi_keys) > 1:
+            st.caption(f"🔑 {len(rapidapi_keys)} chei RapidAPI în pool")
+        
         st.markdown("---")
         
         # Auto-refresh
@@ -724,12 +1230,28 @@ def render_sidebar():
         
         st.markdown("---")
         
+        # Diagnostic
+        st.markdown("### 🐞 Diagnostic")
+        
+        st.checkbox(
+            "Trace pe etapele căutării",
+            value=Settings.TRACING_ENABLED,
+            key="trace_searches",
+            help="Afișează sub rezultate unde se duce timpul fiecărei căutări"
+        )
+        
+        if is_admin():
+            render_profiler_controls()
+        
+        st.markdown("---")
+        
         # Acțiuni
         st.markdown("### 🛠️ Acțiuni")
         
         if st.button("🗑️ Golește Cache", use_container_width=True):
-            cache_manager.clear_cache()
+            get_service().clear_caches()
             st.cache_data.clear()
+            load_airport_catalog.clear()
             st.success("✅ Cache golit!")
             time.sleep(1)
             st.rerun()
@@ -755,122 +1277,259 @@ def render_sidebar():
         """)
 
 
+def start_profiling():
+    """Callback: profilează următoarele `profile_reruns` rerun-uri ale sesiunii"""
+    st.session_state.profiler = SamplingProfiler()
+    st.session_state.profile_reruns_left = st.session_state.get('profile_reruns', 5)
+
+
+def render_profiler_controls():
+    """Pornirea profiler-ului prin eșantionare (doar pentru administratori)"""
+    reruns_left = st.session_state.get('profile_reruns_left', 0)
+    if reruns_left:
+        st.info(f"⏱️ Profilare activă: încă {reruns_left} rerun-uri")
+        return
+    
+    st.number_input(
+        "Rerun-uri de profilat",
+        min_value=1,
+        max_value=Settings.PROFILER_MAX_RERUNS,
+        value=5,
+        key="profile_reruns"
+    )
+    st.button(
+        "⏱️ Profilează rerun-urile următoare",
+        on_click=start_profiling,
+        use_container_width=True,
+        help="Eșantionează stiva la fiecare rerun și scrie un fișier collapsed stacks (flamegraph)"
+    )
+
+
+def finish_profiled_rerun(profiler: SamplingProfiler):
+    """După un rerun profilat; la ultimul, scrie fișierul și păstrează raportul"""
+    st.session_state.profile_reruns_left -= 1
+    if st.session_state.profile_reruns_left > 0:
+        return
+    
+    del st.session_state['profiler']
+    collapsed = '\n'.join(profiler.collapsed()) + '\n'
+    try:
+        path = profiler.write_collapsed(profile_path(get_session_id()))
+    except OSError:
+        path = None
+    st.session_state.profile_report = {
+        'runs': profiler.runs,
+        'samples': profiler.samples,
+        'elapsed_ms': profiler.elapsed * 1000,
+        'wait_ms': profiler.wait_ms(),
+        'top': profiler.top_functions(),
+        'collapsed': collapsed,
+        'path': path,
+    }
+
+
+def render_profile_panel():
+    """Top-ul funcțiilor din ultima profilare și fișierul pentru flamegraph"""
+    report = st.session_state.get('profile_report')
+    if not report or not is_admin():
+        return
+    
+    import pandas as pd
+    
+    with st.expander(f"⏱️ Profil · {report['runs']} rerun-uri · {report['elapsed_ms']:.0f} ms", expanded=True):
+        st.caption(
+            f"{report['samples']} eșantioane la {Settings.PROFILER_INTERVAL * 1000:.0f} ms · "
+            f"blocat în I/O / lock-uri: {report['wait_ms']:.0f} ms"
+            + (f" · {report['path']}" if report['path'] else "")
+        )
+        st.dataframe(
+            pd.DataFrame([
+                {'Funcție': row['function'], 'Total (ms)': round(row['total_ms'], 1),
+                 'Propriu (ms)': round(row['self_ms'], 1), '% rerun': round(row['total_pct'], 1)}
+                for row in report['top']
+            ]),
+            use_container_width=True,
+            hide_index=True
+        )
+        st.download_button(
+            "📥 Collapsed stacks",
+            data=report['collapsed'],
+            file_name=os.path.basename(report['path'] or 'flight-profile.collapsed'),
+            mime="text/plain",
+            key="download_profile"
+        )
+
+
+def run_search(search_params: dict):
+    """Validează parametrii și execută căutarea; rezultatele ajung în session state"""
+    # Verificare selecție
+    if not search_params['origin']:
+        st.error("❌ Te rog selectează aeroportul de plecare!")
+        st.stop()
+    
+    if not search_params['destination']:
+        st.error("❌ Te rog selectează aeroportul de destinație!")
+        st.stop()
+    
+    # Validare
+    with span('validate'):
+        is_valid, errors = validate_search_params(
+            origin=search_params['origin'],
+            destination=search_params['destination'],
+            departure_date=search_params['departure_date'],
+            return_date=search_params['return_date'],
+            adults=search_params['adults'],
+            children=search_params['children'],
+            infants=search_params['infants']
+        )
+    
+    if not is_valid:
+        for error in errors:
+            st.error(f"❌ {error}")
+    else:
+        # Căutare
+        with st.spinner("🔍 Căutare în curs... Aceasta poate dura câteva secunde."):
+            service = get_service()
+            prefetcher = form_prefetcher()
+            if prefetcher is not None:
+                # Prefetch-ul nepornit e anulat; cel în curs pentru aceeași căutare e promovat
+                prefetcher.claim(get_session_id(), search_key(search_params))
+    
+            try:
+                deadline = time.time() + Settings.SEARCH_DEADLINE['app']
+                with request_context(priority=Priority.INTERACTIVE, session_id=get_session_id(),
+                                     deadline=deadline), \
+                        use_listener(StreamlitEventListener()):
+                    results = service.search_flights(
+                        origin=search_params['origin'],
+                        destination=search_params['destination'],
+                        departure_date=search_params['departure_date'],
+                        return_date=search_params['return_date'],
+                        adults=search_params['adults'],
+                        children=search_params['children'],
+                        infants=search_params['infants'],
+                        cabin_class=search_params['cabin_class'],
+                        non_stop=search_params['non_stop'],
+                        # Rezultatele rămân în moneda de bază; conversia se face la afișare
+                        currency=Settings.BASE_CURRENCY,
+                        max_results=search_params['max_results']
+                    )
+    
+                st.session_state.search_results = results
+                st.session_state.last_search = search_params
+                st.session_state.display_currency = search_params['currency']
+    
+                if results and getattr(results, 'partial', False):
+                    st.warning(f"⏱️ Am găsit {len(results)} zboruri, dar lista poate fi incompletă "
+                               f"(căutarea a depășit {Settings.SEARCH_DEADLINE['app']:.0f}s). "
+                               "Caută din nou pentru rezultate complete.")
+                elif results:
+                    st.success(f"✅ Am găsit {len(results)} zboruri!")
+    
+            except Exception as e:
+                st.error(f"❌ Eroare la căutare: {str(e)}")
+                st.session_state.search_results = []
+
+
+def render_trace_panel():
+    """Waterfall-ul ultimei căutări trasate (panoul de diagnostic)"""
+    rows = st.session_state.get('last_trace')
+    if not rows:
+        return
+    
+    import pandas as pd
+    
+    total = max(r['start_ms'] + r['duration_ms'] for r in rows) or 1.0
+    with st.expander(f"🐞 Trace căutare · {rows[0]['duration_ms']:.0f} ms", expanded=False):
+        bars = []
+        for r in rows:
+            left = r['start_ms'] / total * 100
+            width = max(r['duration_ms'] / total * 100, 0.3)
+            # Numele și atributele pot conține date din upstream sau de la utilizator
+            attrs = html.escape(', '.join(f"{k}={v}" for k, v in r['attributes'].items()), quote=True)
+            name = html.escape(str(r['name']))
+            color = '#e74c3c' if r['error'] else '#667eea'
+            bars.append(
+                f'<div style="display:flex;align-items:center;font-size:0.8rem;margin:2px 0">'
+                f'<div style="width:35%;padding-left:{int(r["depth"]) * 12}px;white-space:nowrap;overflow:hidden" '
+                f'title="{attrs}">{name}</div>'
+                f'<div style="width:50%;position:relative;height:12px;background:#f0f2f6">'
+                f'<div style="position:absolute;left:{left:.2f}%;width:{width:.2f}%;height:12px;'
+                f'background:{color}"></div></div>'
+                f'<div style="width:15%;text-align:right">{r["duration_ms"]:.1f} ms</div></div>'
+            )
+        st.markdown(''.join(bars), unsafe_allow_html=True)
+        st.dataframe(
+            pd.DataFrame([
+                {'Etapă': '· ' * r['depth'] + r['name'], 'Start (ms)': round(r['start_ms'], 1),
+                 'Durată (ms)': round(r['duration_ms'], 1),
+                 'Atribute': ', '.join(f"{k}={v}" for k, v in r['attributes'].items())}
+                for r in rows
+            ]),
+            use_container_width=True,
+            hide_index=True
+        )
+
+
+def render_search_section():
+    """Secțiunea de căutare: formular, căutare și panoul de rezultate"""
+    # Formular căutare
+    search_params = render_search_form()
+    
+    if search_params and st.session_state.get('trace_searches', Settings.TRACING_ENABLED):
+        # Căutarea și randarea rezultatelor, cronometrate pe etape
+        route = f"{search_params['origin']}-{search_params['destination']}"
+        with trace('search', route=route, session=get_session_id()) as search_trace:
+            run_search(search_params)
+            render_results_panel()
+        st.session_state.last_trace = search_trace.waterfall()
+    else:
+        if search_params:
+            run_search(search_params)
+        
+        # Afișare rezultate
+        render_results_panel()
+    
+    render_trace_panel()
+
+
+# Secțiunile principale; doar cea activă este randată la fiecare rerun
+SECTIONS = {
+    "🔍 Căutare Zboruri": render_search_section,
+    "📈 Monitor Prețuri": render_price_monitor,
+    "🌍 Explorează Aeroporturi": render_airport_explorer,
+}
+
+
 def main():
     """Funcția principală"""
     
     # Inițializare
     init_session_state()
     
-    # Sidebar
-    render_sidebar()
-    
-    # Tabs principale
-    tab1, tab2, tab3 = st.tabs([
-        "🔍 Căutare Zboruri",
-        "📈 Monitor Prețuri",
-        "🌍 Explorează Aeroporturi"
-    ])
+    # Profiler activ pentru rerun-ul curent (pornit din sidebar de un administrator)
+    profiler = st.session_state.get('profiler') if st.session_state.get('profile_reruns_left') else None
     
-    with tab1:
-        # Formular căutare
-        search_params = render_search_form()
-        
-        if search_params:
-            # Verificare selecție
-            if not search_params['origin']:
-                st.error("❌ Te rog selectează aeroportul de plecare!")
-                st.stop()
+    try:
+        with sampling(profiler):
+            # Sidebar
+            render_sidebar()
             
-            if not search_params['destination']:
-                st.error("❌ Te rog selectează aeroportul de destinație!")
-                st.stop()
-            
-            # Validare
-            is_valid, errors = validate_search_params(
-                origin=search_params['origin'],
-                destination=search_params['destination'],
-                departure_date=search_params['departure_date'],
-                return_date=search_params['return_date'],
-                adults=search_params['adults'],
-                children=search_params['children'],
-                infants=search_params['infants']
+            # Secțiuni încărcate lazy: monitorul și exploratorul nu se calculează
+            # cât timp utilizatorul rămâne pe căutare
+            active_section = st.radio(
+                "Secțiune",
+                options=list(SECTIONS),
+                horizontal=True,
+                key="active_section",
+                label_visibility="collapsed"
             )
-            
-            if not is_valid:
-                for error in errors:
-                    st.error(f"❌ {error}")
-            else:
-                # Căutare
-                with st.spinner("🔍 Căutare în curs... Aceasta poate dura câteva secunde."):
-                    service = st.session_state.flight_service
-                    
-                    try:
-                        results = service.search_flights(
-                            origin=search_params['origin'],
-                            destination=search_params['destination'],
-                            departure_date=search_params['departure_date'],
-                            return_date=search_params['return_date'],
-                            adults=search_params['adults'],
-                            children=search_params['children'],
-                            infants=search_params['infants'],
-                            cabin_class=search_params['cabin_class'],
-                            non_stop=search_params['non_stop'],
-                            currency=search_params['currency'],
-                            max_results=search_params['max_results']
-                        )
-                        
-                        st.session_state.search_results = results
-                        st.session_state.last_search = search_params
-                        
-                        if results:
-                            st.success(f"✅ Am găsit {len(results)} zboruri!")
-                        
-                    except Exception as e:
-                        st.error(f"❌ Eroare la căutare: {str(e)}")
-                        st.session_state.search_results = []
-        
-        # Afișare rezultate
-        if st.session_state.search_results:
-            st.markdown("---")
-            
-            # Buton adăugare la monitor
-            if st.session_state.last_search:
-                with st.expander("📈 Adaugă la Monitorizare Prețuri"):
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        target_price = st.number_input(
-                            "💰 Preț țintă (opțional)",
-                            min_value=0.0,
-                            value=0.0,
-                            step=10.0,
-                            help="Vei fi notificat când prețul scade sub această valoare"
-                        )
-                    
-                    with col2:
-                        st.markdown("")
-                        st.markdown("")
-                        if st.button("📈 Adaugă la Monitor", use_container_width=True):
-                            params = st.session_state.last_search
-                            service = st.session_state.flight_service
-                            service.add_price_monitor(
-                                origin=params['origin'],
-                                destination=params['destination'],
-                                departure_date=params['departure_date'],
-                                target_price=target_price if target_price > 0 else None
-                            )
-                            st.success("✅ Rută adăugată la monitorizare!")
-                            st.balloons()
-            
-            # Afișare rezultate
-            currency = st.session_state.last_search.get('currency', 'EUR')
-            display_flight_results(st.session_state.search_results, currency)
-    
-    with tab2:
-        render_price_monitor()
+            SECTIONS[active_section]()
+    finally:
+        if profiler is not None:
+            finish_profiled_rerun(profiler)
     
-    with tab3:
-        render_airport_explorer()
+    render_profile_panel()
 
 
 # Rulare aplicație
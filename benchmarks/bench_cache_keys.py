@@ -0,0 +1,74 @@
+"""
+Benchmark: costul unei interogări de cache per cheie
+
+Compară, pentru cache-ul 'flights', trei moduri de a construi cheia:
+  - json+md5:  cheia veche, json.dumps + md5 la fiecare interogare
+  - tuplu:     părțile simple folosite direct ca tuplu
+  - SearchKey: cheia normalizată, creată o dată per cerere și refolosită
+               (flights, flights_stale și map-ul de calcule în curs)
+
+O cerere de căutare face trei interogări pe aceeași cheie (flights,
+get_or_compute, flights_stale), așa că se raportează și costul per cerere.
+
+Rulare:
+    python benchmarks/bench_cache_keys.py [--probes 200000]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from services.cache_manager import CacheManager, SearchKey
+
+PARTS = ('OTP', 'FCO', '2030-01-01', None, 1, 0, 0, 'economy', 'EUR')
+PROBES_PER_REQUEST = 3
+
+
+def time_probes(manager: CacheManager, make_parts, probes: int) -> float:
+    """Timpul mediu per interogare (µs), cheia fiind construită de make_parts()"""
+    started = time.perf_counter()
+    for _ in range(probes):
+        manager.get('flights', *make_parts())
+    return (time.perf_counter() - started) / probes * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cost per interogare de cache: json+md5 vs chei tipizate")
+    parser.add_argument('--probes', type=int, default=200000)
+    args = parser.parse_args(argv)
+
+    legacy = CacheManager()
+    # Forțează calea veche pentru comparație
+    legacy._make_key = lambda key_parts: CacheManager._generate_key(*key_parts)
+    manager = CacheManager()
+    key = SearchKey.create(*PARTS)
+    for m, k in ((legacy, PARTS), (manager, PARTS), (manager, (key,))):
+        m.set('flights', ['offer'], *k)
+
+    rows = [
+        ('json+md5', time_probes(legacy, lambda: PARTS, args.probes)),
+        ('tuplu', time_probes(manager, lambda: PARTS, args.probes)),
+        ('SearchKey', time_probes(manager, lambda: (key,), args.probes)),
+    ]
+    started = time.perf_counter()
+    for _ in range(args.probes):
+        SearchKey.create(*PARTS)
+    create = (time.perf_counter() - started) / args.probes * 1e6
+
+    print(f"{args.probes} interogări (hit) pe cache-ul 'flights'")
+    print(f"{'Cheie':<12} {'µs/interogare':>14} {'µs/cerere':>10} {'câștig':>8}")
+    baseline = rows[0][1]
+    for name, per_probe in rows:
+        per_request = per_probe * PROBES_PER_REQUEST
+        if name == 'SearchKey':
+            # Cheia se creează o singură dată per cerere
+            per_request += create
+        print(f"{name:<12} {per_probe:>14.2f} {per_request:>10.2f} {baseline / per_probe:>7.1f}x")
+    print(f"(SearchKey.create: {create:.2f} µs, o dată per cerere)")
+
+
+if __name__ == '__main__':
+    main()
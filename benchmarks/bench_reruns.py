@@ -0,0 +1,174 @@
+"""
+Benchmark: timpul unui rerun per interacțiune, pagină completă vs fragment
+
+Fiecare interacțiune (sortare, filtru direct, alegere continent, țară în
+explorator) se măsoară de două ori:
+  - full:     rerun-ul întregului main(), ca înainte de fragmente
+  - fragment: rerun-ul doar al funcției-fragment care conține widget-ul
+
+A doua tabelă arată costul unui rerun pe secțiunea de căutare când
+catalogul de aeroporturi și numărul de monitoare cresc; cu secțiunile
+încărcate lazy acesta trebuie să rămână aproximativ constant.
+
+AppTest execută mereu scriptul complet, așa că rerun-ul de fragment se
+simulează rulând ca script numai funcția-fragment. Datele sunt sintetice
+(nu se face niciun apel upstream).
+
+Rulare:
+    python benchmarks/bench_reruns.py [--repeat 5] 2>/dev/null
+"""
+import argparse
+import gc
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest
+
+from services.cache_manager import cache_manager
+from services.flight_apis import FlightOffer
+
+
+def make_catalog(continents: int = 6, countries: int = 40, airports: int = 15) -> dict:
+    """Catalog sintetic de aeroporturi: continent -> țară -> listă"""
+    catalog = {}
+    for c in range(continents):
+        catalog[f"Continent {c}"] = {
+            f"Țara {c}-{k:02d}": [
+                {'iata': f"{chr(65 + c)}{k % 26 + 65:c}{a % 26 + 65:c}", 'name': f"Aeroport {a}",
+                 'city': f"Oraș {a}", 'lat': 40.0 + a, 'lng': 20.0 + k}
+                for a in range(airports)
+            ]
+            for k in range(countries)
+        }
+    return catalog
+
+
+def make_offers(count: int = 300) -> list:
+    """Oferte sintetice"""
+    start = datetime(2030, 1, 1, 6, 0)
+    return [
+        FlightOffer(
+            id=f"SKY-{i}", source='Skyscanner', airline=f"Air {i % 12}", airline_code=f"A{i % 12}",
+            origin='OTP', destination='FCO',
+            departure_time=start + timedelta(minutes=17 * i),
+            arrival_time=start + timedelta(minutes=17 * i + 150),
+            duration='2h 30m', price=50.0 + (i * 37) % 400, currency='EUR',
+            cabin_class='ECONOMY', stops=i % 3, segments=[], seats_available=i % 9
+        )
+        for i in range(count)
+    ]
+
+
+def app_script(root, catalog, section):
+    """Scriptul rulat de AppTest: main() complet sau doar o secțiune"""
+    import sys
+    from unittest import mock
+    sys.path.insert(0, root)
+    import app
+
+    with mock.patch.object(app, 'load_airport_catalog', lambda: (catalog, str(id(catalog)))):
+        if section == 'main':
+            app.main()
+        else:
+            app.init_session_state()
+            getattr(app, section)(*(('Origine', 'origin', '') if section == 'render_airport_selector' else ()))
+
+
+# (nume, tip widget, cheie, valoare nouă, fragmentul care îl conține)
+INTERACTIONS = [
+    ('Sortează după', 'selectbox', 'sort_by', 'Durată', 'render_results_panel'),
+    ('Doar zboruri directe', 'checkbox', 'filter_direct_results', True, 'render_results_panel'),
+    ('Continent origine', 'selectbox', 'origin_continent_select', 'Continent 2', 'render_airport_selector'),
+    ('Țară explorator', 'selectbox', 'explorer_country', 'Țara 0-07', 'render_airport_explorer'),
+]
+
+
+EXPLORER = "🌍 Explorează Aeroporturi"
+
+
+def prepare(section: str, catalog: dict, offers: list, active: Optional[str] = None) -> AppTest:
+    at = AppTest.from_function(app_script, args=(ROOT, catalog, section), default_timeout=60)
+    if active:
+        at.session_state['active_section'] = active
+    at.session_state['search_results'] = offers
+    at.session_state['last_search'] = {'origin': 'OTP', 'destination': 'FCO',
+                                       'departure_date': '2030-01-01', 'currency': 'EUR'}
+    at.run()
+    return at
+
+
+def time_interaction(section: str, kind: str, key: str, value, catalog: dict,
+                     offers: list, repeat: int) -> float:
+    """Mediana timpului de rerun (ms) după modificarea widget-ului"""
+    samples = []
+    for _ in range(repeat):
+        active = EXPLORER if key.startswith('explorer') else None
+        at = prepare(section, catalog, offers, active)
+        widget = getattr(at, kind)(key=key)
+        widget.set_value(value)
+        started = time.perf_counter()
+        at.run()
+        samples.append((time.perf_counter() - started) * 1000)
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+    return statistics.median(samples)
+
+
+def time_plain_rerun(catalog: dict, offers: list, monitors: int, repeat: int) -> float:
+    """Mediana unui rerun fără interacțiune, pe secțiunea de căutare (ms)"""
+    now = datetime.now()
+    with mock.patch.object(cache_manager, '_price_monitors', {}), \
+            mock.patch.object(cache_manager, '_price_history', {}):
+        for m in range(monitors):
+            route_key = f"OTP-R{m:03d}-2030-01-01"
+            cache_manager._price_monitors[route_key] = {
+                'route': {}, 'target_price': None, 'created_at': now,
+                'last_check': now, 'lowest_price': 99.0
+            }
+            cache_manager._price_history[route_key] = [
+                {'price': 100.0 + p, 'timestamp': now + timedelta(hours=p)} for p in range(100)
+            ]
+        samples = []
+        at = prepare('main', catalog, offers)
+        for _ in range(repeat):
+            started = time.perf_counter()
+            at.run()
+            samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark rerun Streamlit per interacțiune")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--offers', type=int, default=300)
+    args = parser.parse_args(argv)
+
+    catalog = make_catalog()
+    offers = make_offers(args.offers)
+
+    print(f"{'Interacțiune':<24} {'full (ms)':>10} {'fragment (ms)':>14} {'câștig':>8}")
+    for name, kind, key, value, fragment in INTERACTIONS:
+        full = time_interaction('main', kind, key, value, catalog, offers, args.repeat)
+        partial = time_interaction(fragment, kind, key, value, catalog, offers, args.repeat)
+        print(f"{name:<24} {full:>10.1f} {partial:>14.1f} {full / partial:>7.1f}x")
+
+    print()
+    print(f"{'Aeroporturi':>12} {'Monitoare':>10} {'rerun (ms)':>11}")
+    for countries, monitors in ((10, 5), (40, 20), (160, 80)):
+        scaled = make_catalog(countries=countries)
+        total = sum(len(a) for c in scaled.values() for a in c.values())
+        gc.collect()
+        elapsed = time_plain_rerun(scaled, offers, monitors, args.repeat)
+        print(f"{total:>12} {monitors:>10} {elapsed:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
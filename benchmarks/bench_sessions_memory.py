@@ -0,0 +1,109 @@
+"""
+Benchmark: memoria și apelurile upstream pentru N sesiuni simultane
+
+Compară două modele:
+  - per-session: fiecare sesiune își creează propriul FlightSearchService
+    (ca înainte), deci propriul catalog și propriul cache de entityId-uri
+  - shared:      toate sesiunile folosesc același serviciu per proces
+    (get_flight_service) și păstrează doar un handle
+
+Upstream-ul este simulat (catalog AirLabs și searchAirport sintetice), iar
+memoria se măsoară cu tracemalloc.
+
+Rulare:
+    python benchmarks/bench_sessions_memory.py [--sessions 200] 2>/dev/null
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from services.flight_apis import AirLabsAPI, FlightSearchService, SkyScrapperAPI
+
+COUNTRY_CODES = ['RO', 'IT', 'FR', 'DE', 'ES', 'GB', 'US', 'CA', 'BR', 'JP', 'CN', 'IN', 'AU', 'ZA', 'EG']
+
+
+def make_raw_airports(count: int = 8000) -> list:
+    """Răspuns AirLabs sintetic"""
+    return [
+        {'iata_code': f"{chr(65 + i // 676 % 26)}{chr(65 + i // 26 % 26)}{chr(65 + i % 26)}",
+         'name': f"Aeroport {i}", 'city': f"Oraș {i % 500}",
+         'country_code': COUNTRY_CODES[i % len(COUNTRY_CODES)],
+         'lat': 10.0 + i % 70, 'lng': -50.0 + i % 120}
+        for i in range(count)
+    ]
+
+
+def fake_search_airport(self, endpoint, params=None, hedge=False):
+    query = params['query']
+    return {'status': True, 'data': [{
+        'skyId': query, 'entityId': str(abs(hash(query)) % 10 ** 8),
+        'presentation': {'title': f"Aeroport {query}"},
+        'navigation': {'entityType': 'AIRPORT'},
+    }]}
+
+
+def simulate(mode: str, sessions: int, raw_airports: list, lookups: int) -> dict:
+    """Creează sesiunile, le încălzește cache-urile și măsoară memoria"""
+    calls = {'airports': 0, 'search_airport': 0}
+
+    def get_airports(self):
+        calls['airports'] += 1
+        return raw_airports
+
+    def make_request(self, endpoint, params=None, hedge=False):
+        calls['search_airport'] += 1
+        return fake_search_airport(self, endpoint, params, hedge)
+
+    codes = [a['iata_code'] for a in raw_airports[:lookups]]
+    with mock.patch.object(AirLabsAPI, 'get_airports', get_airports), \
+            mock.patch.object(SkyScrapperAPI, '_make_request', make_request):
+        tracemalloc.start()
+        started = time.perf_counter()
+
+        shared = FlightSearchService() if mode == 'shared' else None
+        handles = {}
+        for i in range(sessions):
+            service = shared or FlightSearchService()
+            service.get_all_airports()
+            for code in codes:
+                service.sky_scrapper.search_airport(code)
+            handles[f"session-{i}"] = service
+
+        elapsed = time.perf_counter() - started
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        'mode': mode,
+        'memory_mb': current / 1024 / 1024,
+        'peak_mb': peak / 1024 / 1024,
+        'warmup_s': elapsed,
+        **calls,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Memorie per sesiune: serviciu per sesiune vs partajat")
+    parser.add_argument('--sessions', type=int, default=200)
+    parser.add_argument('--airports', type=int, default=8000)
+    parser.add_argument('--lookups', type=int, default=30, help="entityId-uri căutate per sesiune")
+    args = parser.parse_args(argv)
+
+    raw_airports = make_raw_airports(args.airports)
+    print(f"{args.sessions} sesiuni, {args.airports} aeroporturi, {args.lookups} căutări entityId/sesiune")
+    print(f"{'Model':<12} {'memorie (MB)':>13} {'vârf (MB)':>10} {'încălzire (s)':>14} "
+          f"{'apeluri catalog':>16} {'apeluri entityId':>17}")
+    for mode in ('per-session', 'shared'):
+        r = simulate(mode, args.sessions, raw_airports, args.lookups)
+        print(f"{r['mode']:<12} {r['memory_mb']:>13.1f} {r['peak_mb']:>10.1f} {r['warmup_s']:>14.2f} "
+              f"{r['airports']:>16} {r['search_airport']:>17}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Timpul de import la pornirea unui worker, verificat față de un buget
+
+Fiecare țintă se importă într-un proces Python nou (cache-ul de module e rece,
+bytecode-ul e deja compilat), de --repeat ori; se păstrează minimul. Modulele
+din `preload` sunt importate înainte de cronometrare: într-un worker Streamlit,
+streamlit e deja încărcat când rulează scriptul aplicației.
+
+Bugetul (benchmarks/baselines/import_budget.json) are per țintă:
+  - budget_ms: timpul maxim de import
+  - forbidden: module grele care nu au voie să fie încărcate de import
+               (ex: pandas și requests se încarcă abia la prima căutare)
+
+Iese cu cod 1 dacă o țintă depășește bugetul sau încarcă un modul interzis.
+
+Rulare:
+    python benchmarks/import_time.py [--budget benchmarks/baselines/import_budget.json] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUDGET = os.path.join(ROOT, 'benchmarks', 'baselines', 'import_budget.json')
+
+_PROBE = """
+import json, logging, sys, time
+sys.path.insert(0, {root!r})
+logging.disable(logging.WARNING)
+for name in {preload!r}:
+    __import__(name)
+started = time.perf_counter()
+__import__({target!r})
+elapsed = time.perf_counter() - started
+print(json.dumps({{'ms': elapsed * 1000, 'loaded': [m for m in {watch!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import(target: str, preload: List[str] = (), watch: List[str] = (), repeat: int = 5) -> Dict:
+    """Timpul minim de import al `target` și modulele din `watch` încărcate de el"""
+    code = _PROBE.format(root=ROOT, preload=list(preload), target=target, watch=list(watch))
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True,
+                                capture_output=True, text=True).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    return {'ms': min(r['ms'] for r in runs), 'loaded': runs[0]['loaded']}
+
+
+def check_budget(budget: Dict, repeat: int = 5) -> List[Dict]:
+    """Măsoară fiecare țintă din buget; status 'ok', 'over_budget' sau 'forbidden'"""
+    rows = []
+    for target, spec in budget['targets'].items():
+        result = measure_import(target, spec.get('preload', []), spec.get('forbidden', []), repeat)
+        if result['loaded']:
+            status = 'forbidden'
+        elif result['ms'] > spec['budget_ms']:
+            status = 'over_budget'
+        else:
+            status = 'ok'
+        rows.append({'target': target, 'ms': result['ms'], 'budget_ms': spec['budget_ms'],
+                     'loaded': result['loaded'], 'status': status})
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Timpul de import față de buget")
+    parser.add_argument('--budget', default=DEFAULT_BUDGET)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with open(args.budget, encoding='utf-8') as f:
+        budget = json.load(f)
+    rows = check_budget(budget, args.repeat)
+
+    print(f"{'Țintă':<24} {'ms':>8} {'buget ms':>9}  status")
+    for row in rows:
+        extra = f" ({', '.join(row['loaded'])})" if row['loaded'] else ''
+        print(f"{row['target']:<24} {row['ms']:>8.1f} {row['budget_ms']:>9.0f}  {row['status']}{extra}")
+    failed = [r for r in rows if r['status'] != 'ok']
+    print(f"\n{len(failed)} ținte peste buget")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,245 @@
+"""
+Generator de încărcare: N sesiuni Streamlit simultane pe același proces
+
+Fiecare utilizator simulat este o sesiune AppTest (varianta care poate rula
+în paralel, ConcurrentAppTest) care rulează app.main() și parcurge fluxul
+real din interfață:
+  alege originea și destinația (continent -> țară -> aeroport), caută,
+  schimbă sortarea, filtrează zborurile directe și adaugă ruta la monitor.
+
+Upstream-ul este stub-ul local (services/stub_upstream.py), cu latență
+configurabilă; serviciul, cache-urile și planificatorul sunt cele reale și
+partajate de toate sesiunile, ca într-un worker Streamlit.
+
+Pentru fiecare N se raportează latența rerun-urilor (p50/p95/p99), creșterea
+RSS-ului procesului și apelurile upstream per utilizator. Cache-ul de zboruri
+se golește între niveluri, ca nivelurile să fie comparabile.
+
+Rulare:
+    python benchmarks/load_sessions.py [--users 1,5,10,25] [--latency-ms 80] 2>/dev/null
+"""
+import argparse
+import contextlib
+import gc
+import os
+import random
+import resource
+import statistics
+import sys
+import threading
+import time
+from typing import Dict, List
+from unittest import mock
+from urllib import parse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Cheile trebuie să existe înainte ca pool-ul de chei să fie creat
+os.environ.setdefault('RAPIDAPI_KEYS', ','.join(f"load-key-{i}" for i in range(4)))
+os.environ.setdefault('AIRLABS_API_KEY', 'load-key')
+
+from streamlit import config as st_config
+from streamlit.runtime import Runtime
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.runtime.pages_manager import PagesManager
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+from streamlit.testing.v1.util import build_mock_config_get_option
+
+from config.settings import Settings
+from services.cache_manager import cache_manager
+from services.stub_upstream import StubConfig, StubUpstreamServer
+
+PLACEHOLDER = "-- Selectează --"
+SEARCH_BUTTON = "🔍 CAUTĂ ZBORURI"
+MONITOR_BUTTON = "📈 Adaugă la Monitor"
+
+
+def app_script(root):
+    """Scriptul unei sesiuni: aplicația completă"""
+    import sys
+    sys.path.insert(0, root)
+    import app
+    app.main()
+
+
+class ConcurrentAppTest(AppTest):
+    """
+    AppTest care poate rula în paralel cu alte sesiuni
+
+    AppTest._run instalează și apoi șterge un Runtime global la fiecare rerun,
+    deci două sesiuni simultane își strică una alteia runtime-ul. Aici
+    runtime-ul e instalat o singură dată (shared_runtime), iar rerun-ul
+    doar execută scriptul pe session state-ul propriu.
+    """
+
+    def _run(self, widget_state=None, timeout=None) -> AppTest:
+        script_runner = LocalScriptRunner(
+            self._script_path, self.session_state,
+            PagesManager(self._script_path, setup_watcher=False),
+            args=self.args, kwargs=self.kwargs,
+        )
+        self._tree = script_runner.run(widget_state, self.query_params,
+                                       timeout if timeout is not None else self.default_timeout,
+                                       self._page_hash)
+        self._tree._runner = self
+        query_string = script_runner.event_data[-1]["client_state"].query_string
+        self.query_params = parse.parse_qs(query_string)
+        return self
+
+
+@contextlib.contextmanager
+def shared_runtime():
+    """Runtime-ul simulat și opțiunile de test, comune tuturor sesiunilor"""
+    runtime = mock.MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime._instance = runtime
+    try:
+        with mock.patch.object(st_config, 'get_option',
+                               new=build_mock_config_get_option({"global.appTest": True})):
+            yield runtime
+    finally:
+        Runtime._instance = None
+
+
+def rss_mb() -> float:
+    """RSS-ul curent al procesului (MB); pe sisteme fără /proc, vârful RSS"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class SimulatedUser:
+    """O sesiune care parcurge fluxul din interfață și cronometrează fiecare rerun"""
+
+    def __init__(self, index: int, timeout: float):
+        self.rng = random.Random(index)
+        script_path = AppTest.from_function(app_script, args=(ROOT,))._script_path
+        self.at = ConcurrentAppTest(script_path, default_timeout=timeout, args=(ROOT,))
+        self.samples: List[float] = []
+        self.errors: List[str] = []
+
+    def step(self, action=None):
+        if action is not None:
+            action()
+        started = time.perf_counter()
+        self.at.run()
+        self.samples.append((time.perf_counter() - started) * 1000)
+        if self.at.exception:
+            self.errors.append(self.at.exception[0].message)
+
+    def choose(self, key: str):
+        """Alege o opțiune (deterministă per utilizator) dintr-un selectbox"""
+        widget = self.at.selectbox(key=key)
+        options = [o for o in widget.options if o != PLACEHOLDER]
+        if options:
+            self.step(lambda: widget.set_value(options[self.rng.randrange(min(len(options), 5))]))
+
+    def button(self, label: str):
+        for button in self.at.button:
+            if button.label == label:
+                self.step(button.click)
+                return
+
+    def run_flow(self):
+        self.step()
+        for prefix in ('origin', 'dest'):
+            for level in ('continent', 'country', 'airport'):
+                self.choose(f"{prefix}_{level}_select")
+        self.button(SEARCH_BUTTON)
+        if self.at.session_state['search_results']:
+            self.step(lambda: self.at.selectbox(key='sort_by').set_value('Durată'))
+            self.step(lambda: self.at.checkbox(key='filter_direct_results').check())
+            self.button(MONITOR_BUTTON)
+
+
+def percentile(samples: List[float], p: int) -> float:
+    if len(samples) < 2:
+        return samples[0] if samples else 0.0
+    return statistics.quantiles(samples, n=100, method='inclusive')[p - 1]
+
+
+def run_level(users: int, stub: StubUpstreamServer, timeout: float) -> Dict[str, float]:
+    """Rulează `users` sesiuni simultan și agregă rezultatele"""
+    cache_manager.clear_cache('flights')
+    gc.collect()
+    rss_before = rss_mb()
+    calls_before = dict(stub.calls_by_endpoint())
+
+    sessions = [SimulatedUser(i, timeout) for i in range(users)]
+    barrier = threading.Barrier(users)
+
+    def drive(user: SimulatedUser):
+        barrier.wait()
+        try:
+            user.run_flow()
+        except Exception as e:
+            user.errors.append(f"{type(e).__name__}: {e}")
+
+    threads = [threading.Thread(target=drive, args=(user,)) for user in sessions]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    gc.collect()
+    calls = {k: v - calls_before.get(k, 0) for k, v in stub.calls_by_endpoint().items()}
+    samples = [s for user in sessions for s in user.samples]
+    return {
+        'users': users,
+        'reruns': len(samples),
+        'p50': percentile(samples, 50),
+        'p95': percentile(samples, 95),
+        'p99': percentile(samples, 99),
+        'elapsed': elapsed,
+        'rss_growth': rss_mb() - rss_before,
+        'airport_calls': calls.get('search_airport', 0) / users,
+        'flight_calls': calls.get('search_flights', 0) / users,
+        'errors': sum(len(user.errors) for user in sessions),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Încărcare cu N sesiuni Streamlit simultane")
+    parser.add_argument('--users', default='1,5,10,25', help="Nivelurile de utilizatori, separate prin virgulă")
+    parser.add_argument('--latency-ms', type=float, default=80.0, help="Latența mediană a stub-ului")
+    parser.add_argument('--latency-sigma', type=float, default=0.5)
+    parser.add_argument('--error-5xx', type=float, default=0.0)
+    parser.add_argument('--itineraries', type=int, default=100)
+    parser.add_argument('--airports', type=int, default=3000)
+    parser.add_argument('--client-limits', action='store_true',
+                        help="Păstrează limitele locale per cheie (implicit ridicate, stub-ul nu are cotă)")
+    parser.add_argument('--timeout', type=float, default=120.0, help="Timeout per rerun (s)")
+    args = parser.parse_args(argv)
+
+    config = StubConfig(itineraries=args.itineraries, airports=args.airports,
+                        latency_ms=args.latency_ms, latency_sigma=args.latency_sigma,
+                        error_5xx=args.error_5xx)
+    rate_limits = dict(Settings.RATE_LIMITS)
+    if not args.client_limits:
+        rate_limits['rapidapi'] = 10 ** 6
+
+    with StubUpstreamServer(config=config).start() as stub, shared_runtime(), \
+            mock.patch.multiple(Settings, SKY_SCRAPPER_BASE_URL=stub.url,
+                                AIRLABS_BASE_URL=stub.airlabs_url, RATE_LIMITS=rate_limits):
+        print(f"Stub upstream {stub.url}: latență mediană {args.latency_ms:.0f} ms, "
+              f"{args.itineraries} itinerarii, {args.airports} aeroporturi")
+        print(f"{'Utilizatori':>11} {'reruns':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+              f"{'durată s':>9} {'ΔRSS MB':>8} {'searchAirport/u':>16} {'searchFlights/u':>16} {'erori':>6}")
+        for users in (int(u) for u in args.users.split(',')):
+            r = run_level(users, stub, args.timeout)
+            print(f"{r['users']:>11} {r['reruns']:>7} {r['p50']:>8.1f} {r['p95']:>8.1f} {r['p99']:>8.1f} "
+                  f"{r['elapsed']:>9.1f} {r['rss_growth']:>8.1f} {r['airport_calls']:>16.2f} "
+                  f"{r['flight_calls']:>16.2f} {r['errors']:>6}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,340 @@
+"""
+Suita de benchmark-uri offline pentru căile fierbinți
+
+Toate cazurile rulează fără rețea, pe payload-urile sintetice din
+services/stub_upstream.py, la mai multe dimensiuni:
+  - parse_flights[n]:      SkyScrapperAPI._parse_flights
+  - get_all_airports[n]:   organizarea catalogului AirLabs pe continente/țări
+  - cache_get / cache_set: CacheManager, cu SearchKey
+  - rate_limiter[n]:       RateLimiter.can_call cu fereastra plină
+  - results_prep[n]:       pregătirea datelor din display_flight_results
+                           (DataFrame, filtrare/sortare, pagina curentă)
+  - search_e2e_*[n]:       FlightSearchService.search_flights cap-coadă, cu
+                           requests.get înlocuit (cache rece și cache cald)
+  - span_*:                costul unui span cu tracing inactiv / activ
+  - popularity_record[n]:  PopularityModel.record pe n rute distincte (n > capacitate
+                           = rotație continuă a candidaților top-K)
+
+Rezultatele (µs per apel, minimul din --repeat serii) se scriu ca JSON și pot
+fi comparate cu un baseline; compare iese cu cod 1 dacă vreun caz e mai lent
+decât baseline-ul cu mai mult de --threshold.
+
+Rulare:
+    python benchmarks/suite.py run --output benchmarks/baselines/baseline.json 2>/dev/null
+    python benchmarks/suite.py compare --baseline benchmarks/baselines/baseline.json [--threshold 0.2] 2>/dev/null
+"""
+import argparse
+import contextlib
+import itertools
+import json
+import logging
+import os
+import platform
+import sys
+import time
+import timeit
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from services.cache_manager import CacheManager, RateLimiter, SearchKey, cache_manager
+from services.flight_apis import FlightSearchService, SkyScrapperAPI
+from services.key_pool import APIKeyPool
+from services.popularity import PopularityModel
+from services.stub_upstream import airlabs_airports_payload, search_airport_payload, search_flights_payload
+from services.tracing import FileSpanExporter, span, trace
+
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'baselines', 'baseline.json')
+
+
+@dataclass
+class Case:
+    """Un caz de benchmark; setup(stack) pregătește datele și returnează funcția măsurată"""
+    name: str
+    setup: Callable[[contextlib.ExitStack], Callable[[], object]]
+
+
+class FakeResponse:
+    """Răspuns HTTP minimal pentru requests.get înlocuit"""
+
+    def __init__(self, url: str, payload: dict):
+        self.url = url
+        self.status_code = 200
+        self.headers = {}
+        self._payload = payload
+        self.text = ''
+        self.content = b''
+
+    def json(self) -> dict:
+        return self._payload
+
+
+def fake_upstream(flights: dict):
+    """requests.get care răspunde searchAirport și searchFlights din fixture-uri"""
+    def get(url, headers=None, params=None, timeout=None):
+        if url.endswith('searchAirport'):
+            return FakeResponse(url, search_airport_payload(params['query']))
+        return FakeResponse(url, flights)
+    return get
+
+
+# ============================================
+# CAZURI
+# ============================================
+
+def parse_flights_case(size: int) -> Case:
+    def setup(stack):
+        api = SkyScrapperAPI(key_pool=APIKeyPool(['bench'], max_calls=100))
+        payload = search_flights_payload(size)
+        return lambda: api._parse_flights(payload, 'EUR')
+    return Case(f"parse_flights[{size}]", setup)
+
+
+def airports_case(size: int) -> Case:
+    def setup(stack):
+        service = FlightSearchService()
+        airports = airlabs_airports_payload(size)['response']
+        stack.enter_context(mock.patch.object(service.airlabs, 'get_airports', lambda: airports))
+
+        def run():
+            service._airports_cache = {}
+            return service.get_all_airports()
+        return run
+    return Case(f"get_all_airports[{size}]", setup)
+
+
+def cache_get_case() -> Case:
+    def setup(stack):
+        manager = CacheManager()
+        key = SearchKey.create('OTP', 'FCO', '2030-01-01')
+        manager.set('flights', ['offer'], key)
+        return lambda: manager.get('flights', key)
+    return Case("cache_get", setup)
+
+
+def cache_set_case() -> Case:
+    def setup(stack):
+        manager = CacheManager()
+        keys = [SearchKey.create('OTP', 'FCO', f"2030-01-{d:02d}", adults=a)
+                for d in range(1, 29) for a in range(1, 10)]
+        state = {'i': 0}
+
+        def run():
+            state['i'] = (state['i'] + 1) % len(keys)
+            manager.set('flights', ['offer'], keys[state['i']])
+        return run
+    return Case("cache_set", setup)
+
+
+def rate_limiter_case(size: int) -> Case:
+    def setup(stack):
+        limiter = RateLimiter(max_calls=size, period=3600)
+        now = time.time()
+        limiter.calls = [now] * size
+        return limiter.can_call
+    return Case(f"rate_limiter[{size}]", setup)
+
+
+def results_prep_case(size: int) -> Case:
+    def setup(stack):
+        import app
+        # Fără ScriptRunContext, fiecare acces la session_state ar loga un avertisment
+        logging.getLogger('streamlit.runtime.scriptrunner_utils.script_run_context').setLevel(logging.ERROR)
+        api = SkyScrapperAPI(key_pool=APIKeyPool(['bench'], max_calls=100))
+        offers = api._parse_flights(search_flights_payload(size), 'EUR')
+        state = app.st.session_state
+
+        def run():
+            for key in ('_results_frame', '_results_view', '_results_pages', '_results_by_id'):
+                state.pop(key, None)
+            df = app.get_results_frame(offers)
+            view_key = ('bench', True, "Durată")
+            df_view = app.get_results_view(offers, df, view_key, True, "Durată")
+            return app.get_results_page(offers, df_view, view_key, 0, 25)
+        return run
+    return Case(f"results_prep[{size}]", setup)
+
+
+def search_e2e_case(size: int, warm: bool) -> Case:
+    def setup(stack):
+        service = FlightSearchService()
+        service.sky_scrapper.key_pool = APIKeyPool(['bench'], max_calls=10 ** 9)
+        stack.enter_context(mock.patch('requests.get', fake_upstream(search_flights_payload(size))))
+        stack.callback(cache_manager.clear_cache)
+
+        def run():
+            if not warm:
+                cache_manager.clear_cache('flights')
+                service.sky_scrapper._entity_cache.clear()
+            return service.search_flights('OTP', 'FCO', '2030-01-01', max_results=size)
+        run()
+        return run
+    return Case(f"search_e2e_{'warm' if warm else 'cold'}[{size}]", setup)
+
+
+def span_case(enabled: bool) -> Case:
+    def setup(stack):
+        if enabled:
+            stack.enter_context(trace('bench', exporter=FileSpanExporter(os.devnull)))
+
+        def run():
+            with span('stage', route='OTP-FCO') as s:
+                s.set_attribute('offers', 10)
+        return run
+    return Case(f"span_{'enabled' if enabled else 'disabled'}", setup)
+
+
+def popularity_case(routes: int) -> Case:
+    def setup(stack):
+        model = PopularityModel()
+        keys = [SearchKey.create('OTP', f"D{i % 500:03d}", f"2030-01-{i % 28 + 1:02d}") for i in range(routes)]
+        cycle = itertools.cycle(keys)
+
+        def run():
+            model.record(next(cycle))
+        return run
+    return Case(f"popularity_record[{routes}]", setup)
+
+
+CASES: List[Case] = [
+    *(parse_flights_case(n) for n in (10, 100, 1000)),
+    *(airports_case(n) for n in (1000, 8000)),
+    cache_get_case(),
+    cache_set_case(),
+    *(rate_limiter_case(n) for n in (10, 100, 1000)),
+    *(results_prep_case(n) for n in (100, 1000)),
+    *(search_e2e_case(n, warm=False) for n in (100, 1000)),
+    search_e2e_case(100, warm=True),
+    span_case(enabled=False),
+    span_case(enabled=True),
+    *(popularity_case(n) for n in (50, 5000)),
+]
+
+
+# ============================================
+# MĂSURARE ȘI COMPARARE
+# ============================================
+
+def measure(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """µs per apel: bucle calibrate la ~0.2s, minimul din `repeat` serii"""
+    timer = timeit.Timer(fn)
+    loops, _ = timer.autorange()
+    samples = timer.repeat(repeat=repeat, number=loops)
+    return {'us': min(samples) / loops * 1e6, 'loops': loops}
+
+
+def run_suite(repeat: int = 5, only: Optional[str] = None) -> dict:
+    """Rulează cazurile (filtrate după subșir) și returnează rezultatele"""
+    results = {}
+    for case in CASES:
+        if only and only not in case.name:
+            continue
+        with contextlib.ExitStack() as stack:
+            results[case.name] = measure(case.setup(stack), repeat)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare_results(baseline: dict, current: dict, threshold: float) -> List[dict]:
+    """
+    Compară rezultatele cu baseline-ul
+
+    Returns:
+        Un rând per caz, cu status regression / improved / ok / new / missing
+    """
+    rows = []
+    base, cur = baseline['results'], current['results']
+    for name in list(base) + [n for n in cur if n not in base]:
+        if name not in cur:
+            rows.append({'name': name, 'baseline': base[name]['us'], 'current': None,
+                         'ratio': None, 'status': 'missing'})
+            continue
+        if name not in base:
+            rows.append({'name': name, 'baseline': None, 'current': cur[name]['us'],
+                         'ratio': None, 'status': 'new'})
+            continue
+        ratio = cur[name]['us'] / base[name]['us']
+        if ratio > 1 + threshold:
+            status = 'regression'
+        elif ratio < 1 - threshold:
+            status = 'improved'
+        else:
+            status = 'ok'
+        rows.append({'name': name, 'baseline': base[name]['us'], 'current': cur[name]['us'],
+                     'ratio': ratio, 'status': status})
+    return rows
+
+
+def _fmt(value: Optional[float], spec: str) -> str:
+    return '-' if value is None else format(value, spec)
+
+
+def print_results(results: dict):
+    print(f"{'Caz':<28} {'µs/apel':>12}")
+    for name, r in results['results'].items():
+        print(f"{name:<28} {r['us']:>12.2f}")
+
+
+def print_comparison(rows: List[dict], threshold: float):
+    print(f"{'Caz':<28} {'baseline µs':>12} {'curent µs':>12} {'raport':>8}  status")
+    for row in rows:
+        print(f"{row['name']:<28} {_fmt(row['baseline'], '12.2f'):>12} {_fmt(row['current'], '12.2f'):>12} "
+              f"{_fmt(row['ratio'], '8.2f'):>8}  {row['status']}")
+    regressions = [r for r in rows if r['status'] == 'regression']
+    print(f"\n{len(regressions)} regresii peste {threshold:.0%}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark-uri offline pentru căile fierbinți")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run = sub.add_parser('run', help="Rulează suita și, opțional, salvează rezultatele")
+    run.add_argument('--output', help="Fișier JSON pentru rezultate (baseline)")
+
+    compare = sub.add_parser('compare', help="Compară cu un baseline")
+    compare.add_argument('--baseline', default=DEFAULT_BASELINE)
+    compare.add_argument('--current', help="Rezultate deja salvate (altfel se rulează suita)")
+    compare.add_argument('--threshold', type=float, default=0.2, help="Încetinire tolerată (0.2 = 20%%)")
+
+    for p in (run, compare):
+        p.add_argument('--repeat', type=int, default=5)
+        p.add_argument('--filter', dest='only', help="Doar cazurile care conțin acest text")
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        results = run_suite(args.repeat, args.only)
+        print_results(results)
+        if args.output:
+            os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+            print(f"\nRezultate salvate în {args.output}")
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    if args.current:
+        with open(args.current, encoding='utf-8') as f:
+            current = json.load(f)
+    else:
+        current = run_suite(args.repeat, args.only)
+        if args.only:
+            baseline['results'] = {k: v for k, v in baseline['results'].items() if args.only in k}
+    rows = compare_results(baseline, current, args.threshold)
+    print_comparison(rows, args.threshold)
+    return 1 if any(r['status'] == 'regression' for r in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,8 +3,9 @@ Configurări centrale pentru aplicația de căutare zboruri
 """
 import streamlit as st
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, List
 import os
+import tempfile
 
 
 @dataclass
@@ -20,14 +21,165 @@ class APIConfig:
 class Settings:
     """Manager central pentru configurări"""
     
+    # Adresele upstream; se pot îndrepta spre stub-ul local (python -m services.stub_upstream)
+    SKY_SCRAPPER_BASE_URL = os.getenv("SKY_SCRAPPER_BASE_URL", "https://sky-scrapper.p.rapidapi.com")
+    AIRLABS_BASE_URL = os.getenv("AIRLABS_BASE_URL", "https://airlabs.co/api/v9")
+    
     RATE_LIMITS = {
-        'rapidapi': 5,
+        'rapidapi': 5,   # per cheie, pe minut
         'airlabs': 10,
     }
     
+    # Cota lunară per cheie RapidAPI (0 = nelimitat)
+    RAPIDAPI_MONTHLY_QUOTA = 0
+    
+    # Durata carantinei (secunde) pentru o cheie care primește 429 / 403
+    KEY_QUARANTINE = {
+        429: 60,
+        403: 3600,
+    }
+    
+    # Cât așteaptă o cerere după o cheie liberă din pool (secunde)
+    KEY_ACQUIRE_TIMEOUT = 15
+    
+    # Reîncercări după 429, programate la resetarea raportată de upstream
+    RATE_LIMIT_RETRIES = 1
+    
+    # Timeout-ul unei cereri HTTP (secunde); termenul căutării îl poate scurta
+    HTTP_TIMEOUT = 30
+    
+    # Termenul limită al unei căutări, de la intrare până la răspuns (secunde), per
+    # punct de intrare; la expirare se întorc rezultatele disponibile, marcate parțiale
+    SEARCH_DEADLINE = {
+        'app': float(os.getenv("FLIGHT_SEARCH_DEADLINE", "5")),
+        'http_api': 5.0,
+        'batch': 30.0,
+    }
+    
+    # searchFlights poate răspunde cu context.status='incomplete'; restul
+    # itinerariilor se cer prin searchIncomplete, până la termenul căutării
+    INCOMPLETE_POLL_INTERVAL = 0.5
+    INCOMPLETE_MAX_POLLS = 10
+    
+    # Planificator cereri upstream: concurență totală și per clasă de prioritate
+    SCHEDULER_MAX_WORKERS = 8
+    SCHEDULER_CLASS_LIMITS = {
+        'interactive': 8,
+        'prefetch': 2,
+        'background': 1,
+    }
+    
+    # Circuit breaker per endpoint Sky-Scrapper
+    CIRCUIT_BREAKER = {
+        'window_seconds': 60,
+        'min_calls': 5,
+        'failure_rate': 0.5,
+        'open_seconds': 30,
+        'half_open_calls': 1,
+    }
+    
+    # Cereri hedged pentru searchAirport (ieftin și idempotent)
+    HEDGE_AIRPORT_SEARCH = True
+    HEDGE_MIN_SAMPLES = 20
+    HEDGE_DEFAULT_DELAY = 1.0
+    HEDGE_MIN_DELAY = 0.05
+    
+    # API HTTP local (python -m services.http_api)
+    HTTP_API_HOST = os.getenv("HTTP_API_HOST", "127.0.0.1")
+    HTTP_API_PORT = int(os.getenv("HTTP_API_PORT", "8080"))
+    
+    # Paginare rezultate în interfață
+    RESULTS_PAGE_SIZES = [10, 25, 50, 100]
+    RESULTS_PAGE_SIZE = 25
+    
+    # Proces worker pentru apelurile upstream (python -m services.worker).
+    # Gol = fiecare sesiune Streamlit face apelurile în propriul proces.
+    WORKER_ADDRESS = os.getenv("FLIGHT_WORKER_ADDRESS", "")
+    # Cheia de autentificare a conexiunilor; obligatorie pentru host:port (job-urile
+    # sunt obiecte pickle). Gol = doar socket Unix, cu cheie aleatoare generată de worker
+    WORKER_AUTHKEY = os.getenv("FLIGHT_WORKER_AUTHKEY", "").encode()
+    WORKER_RESULT_TTL = 300
+    
+    # Tracing pe etapele căutării: activ implicit în interfață și fișierul
+    # în care se adaugă trace-urile (OTLP/JSON, câte unul pe linie; gol = fără export)
+    TRACING_ENABLED = os.getenv("FLIGHT_TRACING", "") == "1"
+    TRACE_FILE = os.getenv("FLIGHT_TRACE_FILE", "")
+    
+    # Token pentru funcțiile de administrare din interfață (?admin=<token>; gol = dezactivate)
+    ADMIN_TOKEN = os.getenv("FLIGHT_ADMIN_TOKEN", "")
+    
+    # Profiler prin eșantionare: intervalul (secunde) și directorul fișierelor collapsed stacks
+    PROFILER_INTERVAL = 0.005
+    PROFILER_MAX_RERUNS = 50
+    PROFILE_DIR = os.getenv("FLIGHT_PROFILE_DIR", tempfile.gettempdir())
+    
+    # Jurnalul căutărilor (JSON pe linie, rotit după dimensiune; gol = dezactivat)
+    QUERY_LOG_FILE = os.getenv("FLIGHT_QUERY_LOG", "")
+    QUERY_LOG_MAX_BYTES = 10 * 1024 * 1024
+    QUERY_LOG_BACKUPS = 5
+    
+    # Popularitatea rutelor: timp de înjumătățire (s), candidați top-K, dimensiunea
+    # sketch-ului și câți timpi de înjumătățire din jurnal se reiau la pornire
+    POPULARITY = {
+        'half_life': 6 * 3600,
+        'capacity': 100,
+        'sketch_width': 2048,
+        'sketch_depth': 4,
+        'replay_half_lives': 4,
+    }
+    
+    # Pre-încălzirea cache-ului pentru rutele populare (python -m services.warmup
+    # sau în proces cu FLIGHT_WARMUP=1): rutele din top se reîmprospătează cu
+    # prioritate background, înainte să le expire TTL-ul
+    WARMUP_ENABLED = os.getenv("FLIGHT_WARMUP", "") == "1"
+    WARMUP = {
+        'interval': 30,
+        'top_k': 20,
+        'refresh_before': 60,
+        'min_score': 1.0,
+        'max_per_run': 10,
+    }
+    
+    # Prefetch speculativ din formularul de căutare (doar în modul local): aeroportul
+    # ales se rezolvă imediat, iar cu originea, destinația și data completate
+    # searchFlights pornește cu prioritate prefetch după `delay` secunde fără
+    # modificări ale formularului
+    PREFETCH_ENABLED = os.getenv("FLIGHT_PREFETCH", "1") == "1"
+    PREFETCH = {
+        'flights': os.getenv("FLIGHT_PREFETCH_FLIGHTS", "1") == "1",
+        'delay': 1.5,
+        'workers': 2,
+        # Secunde până la o nouă încercare pentru un aeroport nerezolvat
+        'airport_retry': 600,
+    }
+    
+    # Căutările se fac și se memorează într-o singură monedă; prețurile sunt
+    # convertite local (services/fx.py), deci schimbarea monedei nu costă apeluri
+    BASE_CURRENCY = os.getenv("FLIGHT_BASE_CURRENCY", "EUR").strip().upper()
+    CURRENCIES = ['EUR', 'USD', 'GBP', 'RON']
+    
+    # Cursurile de schimb: din fișier JSON (teste, medii fără rețea) sau din
+    # referința zilnică BCE; reîmprospătate în fundal după `refresh` secunde,
+    # reîncercate după `retry` secunde dacă încărcarea eșuează
+    FX_RATES_FILE = os.getenv("FLIGHT_FX_FILE", "")
+    FX = {
+        'url': os.getenv("FLIGHT_FX_URL", "https://www.ecb.europa.eu/stats/eurofxref/eurofxref-daily.xml"),
+        'refresh': 6 * 3600,
+        'retry': 300,
+        'timeout': 10,
+    }
+    
+    # Apeluri lăsate libere pe fiecare cheie pentru căutările interactive
+    BUDGET_RESERVE = {
+        'interactive': 0,
+        'prefetch': 1,
+        'background': 2,
+    }
+    
     CACHE_TTL = {
         'airports': 86400,
         'flights': 300,
+        'flights_stale': 86400,
         'prices': 180
     }
     
@@ -38,17 +190,37 @@ class Settings:
         'first': 'First Class'
     }
     
+    @staticmethod
+    def _merge_keys(*values) -> List[str]:
+        """Combină chei date ca string, listă sau listă separată prin virgulă"""
+        keys = []
+        for value in values:
+            items = value if isinstance(value, (list, tuple)) else str(value or '').split(',')
+            for item in items:
+                item = str(item).strip()
+                if item and item not in keys:
+                    keys.append(item)
+        return keys
+    
     @classmethod
     def get_api_keys(cls) -> dict:
         """Obține cheile API din Streamlit secrets"""
         try:
             return {
                 'rapidapi_key': st.secrets.get("RAPIDAPI_KEY", ""),
+                'rapidapi_keys': cls._merge_keys(
+                    st.secrets.get("RAPIDAPI_KEY", ""),
+                    st.secrets.get("RAPIDAPI_KEYS", "")
+                ),
                 'airlabs_key': st.secrets.get("AIRLABS_API_KEY", ""),
             }
         except Exception:
             return {
                 'rapidapi_key': os.getenv("RAPIDAPI_KEY", ""),
+                'rapidapi_keys': cls._merge_keys(
+                    os.getenv("RAPIDAPI_KEY", ""),
+                    os.getenv("RAPIDAPI_KEYS", "")
+                ),
                 'airlabs_key': os.getenv("AIRLABS_API_KEY", ""),
             }
     
@@ -57,7 +229,7 @@ class Settings:
         keys = cls.get_api_keys()
         return APIConfig(
             name="RapidAPI",
-            base_url="https://sky-scrapper.p.rapidapi.com",
+            base_url=cls.SKY_SCRAPPER_BASE_URL,
             key=keys['rapidapi_key'],
             rate_limit=cls.RATE_LIMITS['rapidapi']
         )
@@ -67,7 +239,7 @@ class Settings:
         keys = cls.get_api_keys()
         return APIConfig(
             name="AirLabs",
-            base_url="https://airlabs.co/api/v9",
+            base_url=cls.AIRLABS_BASE_URL,
             key=keys['airlabs_key'],
             rate_limit=cls.RATE_LIMITS['airlabs']
         )
@@ -1,5 +1,31 @@
 # Services package initialization
-from .flight_apis import FlightSearchService, FlightOffer, SkyScrapperAPI, AirLabsAPI
-from .cache_manager import CacheManager
+#
+# Exporturile se încarcă la primul acces (PEP 562): `import services.scheduler`
+# sau `from services import SearchKey` nu mai trag după ele flight_apis,
+# requests și restul pachetului.
+import importlib
 
-__all__ = ['FlightSearchService', 'FlightOffer', 'SkyScrapperAPI', 'AirLabsAPI', 'CacheManager']
+_EXPORTS = {
+    'FlightSearchService': 'flight_apis',
+    'get_flight_service': 'flight_apis',
+    'FlightOffer': 'flight_apis',
+    'SkyScrapperAPI': 'flight_apis',
+    'AirLabsAPI': 'flight_apis',
+    'CacheManager': 'cache_manager',
+    'SearchKey': 'cache_manager',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,454 @@
+"""
+Căutare batch headless pentru liste de (origine, destinație, dată)
+
+Utilizare:
+    python -m services.batch queries.csv --output results.jsonl
+    python -m services.batch queries.jsonl --output results.parquet --format parquet --workers 8
+
+Intrarea (CSV cu header sau JSONL) are câmpurile: origin, destination,
+departure_date și opțional return_date, adults, children, infants,
+cabin_class, currency. Rezultatele sunt scrise pe măsură ce sosesc; la
+o nouă rulare cu același output, interogările deja terminate sunt sărite.
+Fiecare interogare are termenul --deadline (implicit
+Settings.SEARCH_DEADLINE['batch']); cele terminate cu rezultate parțiale
+(status partial) sau fără rezultate din cauza termenului (status error) sunt
+reluate.
+"""
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, asdict
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+
+from config.settings import Settings
+from utils.validators import validate_search_params
+from .events import CollectingListener, use_listener
+from .flight_apis import FlightSearchService, get_flight_service
+from .scheduler import Priority, request_context
+
+# Statusuri care nu mai sunt reluate la --resume
+FINAL_STATUSES = ('ok', 'empty', 'invalid')
+
+# Coloanele fișierelor Parquet (câmpurile listă sunt serializate JSON)
+RESULT_COLUMNS = (
+    'query_key', 'origin', 'destination', 'departure_date', 'return_date',
+    'adults', 'children', 'infants', 'cabin_class', 'currency', 'status',
+    'errors', 'cache_hit', 'latency_ms', 'offers_count', 'min_price',
+    'offers', 'searched_at', 'input',
+)
+JSON_COLUMNS = ('errors', 'offers', 'input')
+
+
+@dataclass(frozen=True)
+class BatchQuery:
+    """O interogare normalizată din fișierul de intrare"""
+    origin: str
+    destination: str
+    departure_date: str
+    return_date: Optional[str] = None
+    adults: int = 1
+    children: int = 0
+    infants: int = 0
+    cabin_class: str = 'economy'
+    currency: str = 'EUR'
+
+    @classmethod
+    def from_record(cls, record: dict) -> 'BatchQuery':
+        def as_int(name: str, default: int) -> int:
+            value = record.get(name)
+            return int(value) if value not in (None, '') else default
+
+        return cls(
+            origin=str(record.get('origin') or '').strip().upper(),
+            destination=str(record.get('destination') or '').strip().upper(),
+            departure_date=str(record.get('departure_date') or '').strip(),
+            return_date=str(record.get('return_date')).strip() if record.get('return_date') else None,
+            adults=as_int('adults', 1),
+            children=as_int('children', 0),
+            infants=as_int('infants', 0),
+            cabin_class=str(record.get('cabin_class') or 'economy').strip().lower(),
+            currency=str(record.get('currency') or 'EUR').strip().upper(),
+        )
+
+    @property
+    def key(self) -> str:
+        return '|'.join(str(v) if v is not None else '' for v in asdict(self).values())
+
+
+def load_records(path: str) -> Iterator[dict]:
+    """Citește interogările dintr-un CSV cu header sau dintr-un JSONL"""
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.endswith(('.jsonl', '.ndjson', '.json')):
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(f)
+
+
+def input_key(record) -> str:
+    """Cheia stabilă a unei înregistrări care nu a putut fi citită ca interogare"""
+    canonical = json.dumps(record, sort_keys=True, ensure_ascii=False, default=str)
+    return 'input:' + hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+def prepare_queries(records: Iterable[dict]) -> Tuple[List[BatchQuery], List[dict], int]:
+    """
+    Normalizează, validează și elimină duplicatele
+
+    Returns:
+        Tuple (interogări valide, înregistrări invalide, număr duplicate)
+    """
+    queries, invalid, seen = [], [], set()
+    duplicates = 0
+
+    for record in records:
+        if not isinstance(record, dict):
+            invalid.append({'input': record,
+                            'errors': [f"Înregistrarea trebuie să fie un obiect, nu {type(record).__name__}"]})
+            continue
+        try:
+            query = BatchQuery.from_record(record)
+        except (TypeError, ValueError) as e:
+            invalid.append({'input': record, 'errors': [str(e)]})
+            continue
+
+        if query.key in seen:
+            duplicates += 1
+            continue
+        seen.add(query.key)
+
+        is_valid, errors = validate_search_params(
+            origin=query.origin,
+            destination=query.destination,
+            departure_date=query.departure_date,
+            return_date=query.return_date,
+            adults=query.adults,
+            children=query.children,
+            infants=query.infants
+        )
+        if is_valid:
+            queries.append(query)
+        else:
+            invalid.append({'query': query, 'errors': errors})
+
+    return queries, invalid, duplicates
+
+
+# ============================================
+# WRITERS
+# ============================================
+
+class JSONLResultWriter:
+    """Scrie câte o linie per interogare, cu flush imediat"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        # După un crash ultima linie poate fi incompletă; o închidem
+        needs_newline = False
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) != b'\n'
+        self._file = open(path, 'a', encoding='utf-8')
+        if needs_newline:
+            self._file.write('\n')
+
+    @staticmethod
+    def done_keys(path: str) -> Set[str]:
+        done = set()
+        if not os.path.exists(path):
+            return done
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # ultima linie poate fi trunchiată după un crash
+                if record.get('status') in FINAL_STATUSES:
+                    done.add(record.get('query_key'))
+        return done
+
+    def write(self, record: dict):
+        with self._lock:
+            self._file.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetResultWriter:
+    """Scrie rezultatele ca fișiere part-*.parquet într-un director, pe bucăți"""
+
+    def __init__(self, path: str, chunk_size: int = 100):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise SystemExit("❌ Pentru --format parquet instalează pyarrow (pip install pyarrow)")
+        self.path = path
+        self.chunk_size = chunk_size
+        self._buffer: List[dict] = []
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+        self._part = len(glob.glob(os.path.join(path, 'part-*.parquet')))
+
+    @staticmethod
+    def done_keys(path: str) -> Set[str]:
+        done = set()
+        parts = glob.glob(os.path.join(path, 'part-*.parquet'))
+        if not parts:
+            return done
+        import pyarrow.parquet as pq
+
+        for part in parts:
+            table = pq.read_table(part, columns=['query_key', 'status'])
+            for key, status in zip(table.column('query_key').to_pylist(),
+                                   table.column('status').to_pylist()):
+                if status in FINAL_STATUSES:
+                    done.add(key)
+        return done
+
+    def write(self, record: dict):
+        with self._lock:
+            self._buffer.append(record)
+            if len(self._buffer) >= self.chunk_size:
+                self._flush()
+
+    def _flush(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not self._buffer:
+            return
+        rows = [
+            {
+                column: (json.dumps(r.get(column), ensure_ascii=False, default=str)
+                         if column in JSON_COLUMNS else r.get(column))
+                for column in RESULT_COLUMNS
+            }
+            for r in self._buffer
+        ]
+        part_path = os.path.join(self.path, f'part-{self._part:05d}.parquet')
+        # Scriere atomică: un part parțial nu e niciodată vizibil la reluare
+        pq.write_table(pa.Table.from_pylist(rows), part_path + '.tmp')
+        os.replace(part_path + '.tmp', part_path)
+        self._part += 1
+        self._buffer = []
+
+    def close(self):
+        with self._lock:
+            self._flush()
+
+
+# ============================================
+# EXECUȚIE
+# ============================================
+
+@dataclass
+class BatchReport:
+    """Statistici la finalul unei rulări"""
+    total: int = 0
+    skipped: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    completed: int = 0
+    partial: int = 0
+    errors: int = 0
+    cache_hits: int = 0
+    elapsed: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+
+    def _percentile(self, p: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+    def summary(self) -> dict:
+        executed = self.completed + self.errors
+        return {
+            'total': self.total,
+            'skipped_resume': self.skipped,
+            'duplicates': self.duplicates,
+            'invalid': self.invalid,
+            'completed': self.completed,
+            'partial': self.partial,
+            'errors': self.errors,
+            'elapsed_s': round(self.elapsed, 2),
+            'throughput_qps': round(executed / self.elapsed, 2) if self.elapsed else 0.0,
+            'cache_hit_rate': round(self.cache_hits / executed, 3) if executed else 0.0,
+            'latency_ms': {
+                'p50': round(self._percentile(50) * 1000, 1),
+                'p95': round(self._percentile(95) * 1000, 1),
+                'p99': round(self._percentile(99) * 1000, 1),
+                'max': round(max(self.latencies, default=0) * 1000, 1),
+            },
+        }
+
+
+def _run_query(service: FlightSearchService, query: BatchQuery, priority: Priority,
+               max_results: int, deadline_s: float) -> dict:
+    listener = CollectingListener()
+    started = time.time()
+    record = {'query_key': query.key, **asdict(query)}
+
+    try:
+        deadline = time.time() + deadline_s
+        with request_context(priority=priority, session_id='batch', deadline=deadline), use_listener(listener):
+            offers = service.search_flights(
+                origin=query.origin,
+                destination=query.destination,
+                departure_date=query.departure_date,
+                return_date=query.return_date,
+                adults=query.adults,
+                children=query.children,
+                infants=query.infants,
+                cabin_class=query.cabin_class,
+                currency=query.currency,
+                max_results=max_results
+            )
+    except Exception as e:
+        offers = None
+        record['errors'] = [str(e)]
+
+    errors = [event.message for event in listener.events if event.level == 'error']
+    timed_out = listener.of_kind('deadline_exceeded')
+    if offers and getattr(offers, 'partial', False):
+        # Termen depășit sau rezultate vechi: interogarea e reluată la --resume
+        status = 'partial'
+    elif offers:
+        status = 'ok'
+    elif (offers is None or errors or timed_out or getattr(offers, 'partial', False)
+          or getattr(offers, 'outcome', None) == 'error'):
+        # Niciun răspuns (inclusiv termen depășit) nu înseamnă "fără zboruri"
+        status = 'error'
+        if timed_out and not errors:
+            errors = [timed_out[0].message]
+    else:
+        status = 'empty'
+
+    record.update({
+        'status': status,
+        'errors': record.get('errors', []) + errors,
+        'cache_hit': bool(listener.of_kind('cache_hit')),
+        'latency_ms': round((time.time() - started) * 1000, 1),
+        'offers_count': len(offers or []),
+        'min_price': min((o.price for o in offers), default=None) if offers else None,
+        'offers': [o.to_record() for o in offers or []],
+        'searched_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    })
+    return record
+
+
+def run_batch(records: Iterable[dict], writer, done_keys: Optional[Set[str]] = None,
+              service: Optional[FlightSearchService] = None, workers: int = 4,
+              max_results: int = 50, priority: Priority = Priority.BACKGROUND,
+              deadline: Optional[float] = None) -> BatchReport:
+    """
+    Rulează o listă de interogări în paralel, în limita bugetului de rate
+
+    Args:
+        records: Înregistrările de intrare
+        writer: JSONLResultWriter / ParquetResultWriter
+        done_keys: Interogări deja terminate (reluare după crash)
+        service: Serviciul folosit (implicit unul nou, partajat de toți workerii)
+        workers: Numărul de interogări simultane
+        max_results: Numărul maxim de oferte per interogare
+        priority: Clasa de prioritate în planificatorul de cereri
+        deadline: Termenul fiecărei interogări, în secunde (implicit Settings.SEARCH_DEADLINE['batch'])
+
+    Returns:
+        BatchReport cu statisticile rulării
+    """
+    records = list(records)
+    deadline = Settings.SEARCH_DEADLINE['batch'] if deadline is None else deadline
+    queries, invalid, duplicates = prepare_queries(records)
+    done_keys = done_keys or set()
+    service = service or get_flight_service()
+
+    report = BatchReport(total=len(records), duplicates=duplicates, invalid=len(invalid))
+
+    for item in invalid:
+        query = item.get('query')
+        # Și rândurile care nu sunt interogări au o cheie, ca --resume să nu le rescrie
+        key = query.key if query is not None else input_key(item['input'])
+        if key in done_keys:
+            continue
+        writer.write({
+            'query_key': key,
+            **(asdict(query) if query is not None else {'input': item['input']}),
+            'status': 'invalid',
+            'errors': item['errors'],
+            'offers': [],
+        })
+
+    pending = [q for q in queries if q.key not in done_keys]
+    report.skipped = len(queries) - len(pending)
+
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='batch') as pool:
+        futures = [pool.submit(_run_query, service, q, priority, max_results, deadline) for q in pending]
+        for future in as_completed(futures):
+            record = future.result()
+            writer.write(record)
+            report.latencies.append(record['latency_ms'] / 1000)
+            report.cache_hits += int(record['cache_hit'])
+            if record['status'] == 'error':
+                report.errors += 1
+            else:
+                report.completed += 1
+                report.partial += record['status'] == 'partial'
+    report.elapsed = time.time() - started
+
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Căutare batch de zboruri (headless)")
+    parser.add_argument('input', help="Fișier CSV sau JSONL cu interogări")
+    parser.add_argument('--output', '-o', required=True, help="Fișier JSONL sau director Parquet")
+    parser.add_argument('--format', choices=['jsonl', 'parquet'], default=None,
+                        help="Formatul output-ului (implicit după extensie)")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--max-results', type=int, default=50)
+    parser.add_argument('--priority', choices=[p.name.lower() for p in Priority], default='background')
+    parser.add_argument('--deadline', type=float, default=Settings.SEARCH_DEADLINE['batch'],
+                        help="Termenul fiecărei interogări (secunde); așteptarea unei chei API "
+                             "libere e limitată și de Settings.KEY_ACQUIRE_TIMEOUT")
+    parser.add_argument('--no-resume', action='store_true', help="Ignoră rezultatele existente")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ('parquet' if args.output.endswith('.parquet') else 'jsonl')
+    writer_cls = ParquetResultWriter if fmt == 'parquet' else JSONLResultWriter
+
+    done_keys = set() if args.no_resume else writer_cls.done_keys(args.output)
+    writer = writer_cls(args.output)
+    try:
+        report = run_batch(
+            load_records(args.input),
+            writer,
+            done_keys=done_keys,
+            workers=args.workers,
+            max_results=args.max_results,
+            priority=Priority[args.priority.upper()],
+            deadline=args.deadline
+        )
+    finally:
+        writer.close()
+
+    print(json.dumps(report.summary(), indent=2), file=sys.stderr)
+    return 0 if report.errors == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
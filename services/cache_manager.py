@@ -4,10 +4,12 @@ Manager pentru cache și rate limiting
 import time
 import hashlib
 import json
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Any, Optional, Dict
+from typing import Any, Callable, Dict, Hashable, Optional
 from cachetools import TTLCache
-from collections import defaultdict
+from collections import deque
+from concurrent.futures import Future
 import threading
 
 
@@ -24,27 +26,86 @@ class RateLimiter:
         self.period = period
         self.calls = []
         self.lock = threading.Lock()
+        # Bugetul raportat de upstream (headere x-ratelimit-*), dacă există
+        self.upstream_remaining: Optional[int] = None
+        self.upstream_reset_at: float = 0.0
+    
+    def _available(self, now: float) -> int:
+        """Apeluri disponibile acum; apelantul deține lock-ul"""
+        self.calls = [t for t in self.calls if now - t < self.period]
+        local = max(0, self.max_calls - len(self.calls))
+        if self.upstream_remaining is not None and now >= self.upstream_reset_at:
+            self.upstream_remaining = None
+        if self.upstream_remaining is None:
+            return local
+        return min(local, self.upstream_remaining)
+    
+    def _consume(self, now: float):
+        """Înregistrează un apel; apelantul deține lock-ul"""
+        self.calls.append(now)
+        if self.upstream_remaining is not None:
+            self.upstream_remaining = max(0, self.upstream_remaining - 1)
     
     def can_call(self) -> bool:
         """Verifică dacă poate face un apel"""
         with self.lock:
-            now = time.time()
-            # Elimină apelurile vechi
-            self.calls = [t for t in self.calls if now - t < self.period]
-            return len(self.calls) < self.max_calls
+            return self._available(time.time()) > 0
     
     def record_call(self):
         """Înregistrează un apel"""
         with self.lock:
-            self.calls.append(time.time())
-    
+            self._consume(time.time())
+
+    def try_acquire(self) -> bool:
+        """Verifică și înregistrează atomic un apel; False dacă limita e atinsă"""
+        with self.lock:
+            now = time.time()
+            if self._available(now) <= 0:
+                return False
+            self._consume(now)
+            return True
+
+    def refund(self):
+        """Anulează ultimul apel înregistrat (rezervat, dar netrimis upstream)"""
+        with self.lock:
+            if self.calls:
+                self.calls.pop()
+            if self.upstream_remaining is not None:
+                self.upstream_remaining += 1
+
+    def remaining(self) -> int:
+        """Returnează câte apeluri mai sunt disponibile în perioada curentă"""
+        with self.lock:
+            return self._available(time.time())
+
     def wait_time(self) -> float:
         """Returnează timpul de așteptare până la următorul apel disponibil"""
         with self.lock:
-            if len(self.calls) < self.max_calls:
+            now = time.time()
+            if self._available(now) > 0:
                 return 0
-            oldest = min(self.calls)
-            return max(0, self.period - (time.time() - oldest))
+            waits = []
+            if len(self.calls) >= self.max_calls:
+                waits.append(self.period - (now - min(self.calls)))
+            if self.upstream_remaining is not None and self.upstream_remaining <= 0:
+                waits.append(self.upstream_reset_at - now)
+            return max(0, max(waits)) if waits else 0
+    
+    def apply_upstream(self, remaining: Optional[int], reset_in: Optional[float] = None):
+        """
+        Ajustează limiter-ul după bugetul raportat de upstream
+        
+        Args:
+            remaining: Apeluri rămase conform upstream
+            reset_in: Secunde până la resetarea bugetului upstream
+        """
+        with self.lock:
+            now = time.time()
+            if remaining is None:
+                self.upstream_remaining = None
+                return
+            self.upstream_remaining = max(0, int(remaining))
+            self.upstream_reset_at = now + (reset_in if reset_in is not None else self.period)
     
     def __call__(self, func):
         """Decorator pentru rate limiting"""
@@ -57,16 +118,196 @@ class RateLimiter:
         return wrapper
 
 
+# Numărul de segmente (fiecare cu lock propriu) ale unui cache
+CACHE_STRIPES = 16
+
+# Înregistrări păstrate în istoricul de prețuri al unei rute
+PRICE_HISTORY_SIZE = 100
+
+_MISSING = object()
+
+# Părțile de cheie care se pot folosi direct într-un tuplu (hash ieftin, egalitate exactă)
+_PLAIN_KEY_TYPES = (str, int, float, bool, type(None))
+# 1, 1.0 și True au același hash și sunt egale: în cheie poartă și numele tipului
+_NUMERIC_KEY_TYPES = (int, float, bool)
+
+
+@dataclass(frozen=True)
+class SearchKey:
+    """
+    Cheia normalizată a unei căutări de zboruri
+    
+    Se creează o singură dată per cerere (SearchKey.create) și se refolosește
+    în toate cache-urile și în map-urile de calcule în curs. Hash-ul se
+    calculează o dată, la construire, și nu e serializat: hash()-ul
+    șirurilor diferă între procese, deci cheia încărcată dintr-un pickle
+    (ex: prin socket-ul worker-ului) și-l recalculează.
+    """
+    origin: str
+    destination: str
+    departure_date: str
+    return_date: Optional[str] = None
+    adults: int = 1
+    children: int = 0
+    infants: int = 0
+    cabin_class: str = 'economy'
+    currency: str = 'EUR'
+    _hash: int = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, '_hash', hash((
+            self.origin, self.destination, self.departure_date, self.return_date,
+            self.adults, self.children, self.infants, self.cabin_class, self.currency
+        )))
+    
+    def __hash__(self) -> int:
+        return self._hash
+    
+    def __reduce__(self):
+        return self.__class__, tuple(self.to_dict().values())
+    
+    @classmethod
+    def create(cls, origin: str, destination: str, departure_date: str,
+               return_date: Optional[str] = None, adults: int = 1, children: int = 0,
+               infants: int = 0, cabin_class: str = 'economy', currency: str = 'EUR') -> 'SearchKey':
+        """Normalizează parametrii (coduri IATA și monedă cu majuscule, clasă cu minuscule)"""
+        return cls(
+            origin.strip().upper(), destination.strip().upper(), str(departure_date),
+            str(return_date) if return_date else None,
+            int(adults), int(children), int(infants),
+            cabin_class.strip().lower(), currency.strip().upper()
+        )
+    
+    def to_dict(self) -> dict:
+        """Câmpurile cheii (fără hash), pentru serializare"""
+        return {
+            'origin': self.origin, 'destination': self.destination,
+            'departure_date': self.departure_date, 'return_date': self.return_date,
+            'adults': self.adults, 'children': self.children, 'infants': self.infants,
+            'cabin_class': self.cabin_class, 'currency': self.currency,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'SearchKey':
+        return cls.create(**{name: data[name] for name in cls.__dataclass_fields__
+                             if name != '_hash' and name in data})
+
+
+class _Stripe:
+    """Un segment de cache: TTLCache propriu, lock propriu, calcule în curs"""
+    
+    __slots__ = ('cache', 'lock', 'pending', 'written')
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.lock = threading.Lock()
+        self.pending: Dict[Hashable, Future] = {}
+        # Momentul scrierii fiecărei chei (ceasul TTLCache), pentru expires_in
+        self.written: Dict[Hashable, float] = {}
+    
+    def store(self, key: Hashable, value: Any):
+        """Scrie valoarea și momentul scrierii; apelantul deține lock-ul"""
+        self.cache[key] = value
+        self.written[key] = self.cache.timer()
+        if len(self.written) > 2 * self.cache.maxsize:
+            # Cheile evacuate sau expirate din TTLCache
+            self.written = {k: t for k, t in self.written.items() if k in self.cache}
+
+
+class StripedTTLCache:
+    """
+    TTLCache thread-safe, segmentat după hash-ul cheii
+    
+    Thread-urile care lucrează pe chei din segmente diferite nu se blochează
+    reciproc. get_or_compute calculează o singură dată valoarea unei chei,
+    chiar dacă o cer mai multe thread-uri simultan.
+    """
+    
+    def __init__(self, maxsize: int, ttl: float, stripes: int = CACHE_STRIPES):
+        per_stripe = max(1, -(-maxsize // stripes))
+        self._stripes = [_Stripe(per_stripe, ttl) for _ in range(stripes)]
+    
+    def _stripe(self, key: Hashable) -> _Stripe:
+        return self._stripes[hash(key) % len(self._stripes)]
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        stripe = self._stripe(key)
+        with stripe.lock:
+            return stripe.cache.get(key, default)
+    
+    def __setitem__(self, key: Hashable, value: Any):
+        stripe = self._stripe(key)
+        with stripe.lock:
+            stripe.store(key, value)
+    
+    def expires_in(self, key: Hashable) -> Optional[float]:
+        """Secundele până la expirarea cheii; None dacă nu e în cache"""
+        stripe = self._stripe(key)
+        with stripe.lock:
+            if key not in stripe.cache:
+                stripe.written.pop(key, None)
+                return None
+            return stripe.cache.ttl - (stripe.cache.timer() - stripe.written[key])
+    
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any],
+                       should_cache: Callable[[Any], bool] = lambda v: v is not None,
+                       timeout: Optional[float] = None) -> Any:
+        """
+        Valoarea din cache sau rezultatul lui compute(), calculat o singură dată
+        
+        compute() rulează fără lock; celelalte thread-uri care cer aceeași cheie
+        așteaptă rezultatul cel mult `timeout` secunde (altfel
+        concurrent.futures.TimeoutError). Implicit, valorile None nu sunt memorate.
+        """
+        stripe = self._stripe(key)
+        with stripe.lock:
+            value = stripe.cache.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            pending = stripe.pending.get(key)
+            owner = pending is None
+            if owner:
+                pending = stripe.pending[key] = Future()
+        
+        if not owner:
+            return pending.result(timeout=timeout)
+        
+        try:
+            value = compute()
+        except BaseException as e:
+            with stripe.lock:
+                stripe.pending.pop(key, None)
+            pending.set_exception(e)
+            raise
+        
+        with stripe.lock:
+            if should_cache(value):
+                stripe.store(key, value)
+            stripe.pending.pop(key, None)
+        pending.set_result(value)
+        return value
+    
+    def clear(self):
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.cache.clear()
+                stripe.written.clear()
+    
+    def __len__(self) -> int:
+        return sum(len(stripe.cache) for stripe in self._stripes)
+
+
 class CacheManager:
-    """Manager central pentru cache"""
+    """Manager central pentru cache (thread-safe, partajat de toate sesiunile)"""
     
     def __init__(self):
         # Cache-uri separate pentru diferite tipuri de date
-        self._caches: Dict[str, TTLCache] = {
-            'airports': TTLCache(maxsize=10000, ttl=86400),  # 24h
-            'flights': TTLCache(maxsize=1000, ttl=300),       # 5min
-            'prices': TTLCache(maxsize=500, ttl=180),         # 3min
-            'token': TTLCache(maxsize=10, ttl=1700)           # ~28min pentru Amadeus token
+        self._caches: Dict[str, StripedTTLCache] = {
+            'airports': StripedTTLCache(maxsize=10000, ttl=86400),  # 24h
+            'flights': StripedTTLCache(maxsize=1000, ttl=300),       # 5min
+            'flights_stale': StripedTTLCache(maxsize=1000, ttl=86400),  # 24h, rezervă când upstream-ul pică
+            'prices': StripedTTLCache(maxsize=500, ttl=180),         # 3min
+            'token': StripedTTLCache(maxsize=10, ttl=1700)           # ~28min pentru Amadeus token
         }
         
         # Rate limiters pentru fiecare API
@@ -76,10 +317,13 @@ class CacheManager:
             'airlabs': RateLimiter(max_calls=10, period=60),
             'aviationstack': RateLimiter(max_calls=5, period=60)
         }
+        self._limiters_lock = threading.Lock()
         
         # Monitorizare prețuri
         self._price_monitors: Dict[str, dict] = {}
-        self._price_history: Dict[str, list] = defaultdict(list)
+        self._monitors_lock = threading.Lock()
+        self._price_history: Dict[str, deque] = {}
+        self._history_locks = [threading.Lock() for _ in range(CACHE_STRIPES)]
     
     @staticmethod
     def _generate_key(*args) -> str:
@@ -87,25 +331,63 @@ class CacheManager:
         key_str = json.dumps(args, sort_keys=True, default=str)
         return hashlib.md5(key_str.encode()).hexdigest()
     
+    @classmethod
+    def _make_key(cls, key_parts: tuple) -> Hashable:
+        """
+        Cheia efectivă: un SearchKey se folosește direct, iar părțile simple
+        (str, int, float, bool, None) ca tuplu; restul trec prin _generate_key
+        
+        Părțile numerice devin (tip, valoare), ca 1, 1.0 și True să rămână chei
+        distincte (ca în forma JSON).
+        """
+        if len(key_parts) == 1 and type(key_parts[0]) is SearchKey:
+            return key_parts[0]
+        numeric = False
+        for part in key_parts:
+            part_type = type(part)
+            if part_type not in _PLAIN_KEY_TYPES:
+                return cls._generate_key(*key_parts)
+            numeric = numeric or part_type in _NUMERIC_KEY_TYPES
+        if not numeric:
+            return key_parts
+        return tuple((type(part).__name__, part) if type(part) in _NUMERIC_KEY_TYPES else part
+                     for part in key_parts)
+    
     def get(self, cache_type: str, *key_parts) -> Optional[Any]:
         """Obține valoare din cache"""
         if cache_type not in self._caches:
             return None
-        key = self._generate_key(*key_parts)
+        key = self._make_key(key_parts)
         return self._caches[cache_type].get(key)
     
     def set(self, cache_type: str, value: Any, *key_parts):
         """Setează valoare în cache"""
         if cache_type not in self._caches:
             return
-        key = self._generate_key(*key_parts)
+        key = self._make_key(key_parts)
         self._caches[cache_type][key] = value
     
+    def get_or_compute(self, cache_type: str, compute: Callable[[], Any], *key_parts,
+                       should_cache: Callable[[Any], bool] = lambda v: v is not None,
+                       timeout: Optional[float] = None) -> Any:
+        """Obține valoarea din cache sau o calculează o singură dată (atomic per cheie)"""
+        if cache_type not in self._caches:
+            return compute()
+        key = self._make_key(key_parts)
+        return self._caches[cache_type].get_or_compute(key, compute, should_cache, timeout)
+    
+    def expires_in(self, cache_type: str, *key_parts) -> Optional[float]:
+        """Secundele rămase din TTL-ul unei intrări; None dacă lipsește"""
+        if cache_type not in self._caches:
+            return None
+        return self._caches[cache_type].expires_in(self._make_key(key_parts))
+    
     def get_rate_limiter(self, api_name: str) -> RateLimiter:
         """Obține rate limiter pentru un API"""
-        if api_name not in self._rate_limiters:
-            self._rate_limiters[api_name] = RateLimiter(max_calls=10, period=60)
-        return self._rate_limiters[api_name]
+        with self._limiters_lock:
+            if api_name not in self._rate_limiters:
+                self._rate_limiters[api_name] = RateLimiter(max_calls=10, period=60)
+            return self._rate_limiters[api_name]
     
     def can_call_api(self, api_name: str) -> bool:
         """Verifică dacă poate apela un API"""
@@ -116,46 +398,53 @@ class CacheManager:
         self.get_rate_limiter(api_name).record_call()
     
     # Monitorizare prețuri
+    def _history_lock(self, route_key: str) -> threading.Lock:
+        return self._history_locks[hash(route_key) % len(self._history_locks)]
+    
     def add_price_monitor(self, route_key: str, search_params: dict, 
                           target_price: Optional[float] = None):
         """Adaugă un monitor de prețuri pentru o rută"""
-        self._price_monitors[route_key] = {
-            'params': search_params,
-            'target_price': target_price,
-            'created_at': datetime.now(),
-            'last_check': None,
-            'lowest_price': None
-        }
+        with self._monitors_lock:
+            self._price_monitors[route_key] = {
+                'params': search_params,
+                'target_price': target_price,
+                'created_at': datetime.now(),
+                'last_check': None,
+                'lowest_price': None
+            }
     
     def remove_price_monitor(self, route_key: str):
         """Elimină un monitor de prețuri"""
-        if route_key in self._price_monitors:
-            del self._price_monitors[route_key]
+        with self._monitors_lock:
+            self._price_monitors.pop(route_key, None)
     
     def update_price_history(self, route_key: str, price: float):
         """Actualizează istoricul prețurilor"""
-        self._price_history[route_key].append({
-            'price': price,
-            'timestamp': datetime.now()
-        })
-        # Păstrează doar ultimele 100 de înregistrări
-        if len(self._price_history[route_key]) > 100:
-            self._price_history[route_key] = self._price_history[route_key][-100:]
+        now = datetime.now()
+        with self._history_lock(route_key):
+            history = self._price_history.get(route_key)
+            if history is None:
+                # Păstrează doar ultimele PRICE_HISTORY_SIZE înregistrări
+                history = self._price_history[route_key] = deque(maxlen=PRICE_HISTORY_SIZE)
+            history.append({'price': price, 'timestamp': now})
         
         # Actualizează monitorul
-        if route_key in self._price_monitors:
-            monitor = self._price_monitors[route_key]
-            monitor['last_check'] = datetime.now()
-            if monitor['lowest_price'] is None or price < monitor['lowest_price']:
-                monitor['lowest_price'] = price
+        with self._monitors_lock:
+            monitor = self._price_monitors.get(route_key)
+            if monitor is not None:
+                monitor['last_check'] = now
+                if monitor['lowest_price'] is None or price < monitor['lowest_price']:
+                    monitor['lowest_price'] = price
     
     def get_price_monitors(self) -> Dict[str, dict]:
-        """Returnează toate monitoarele de prețuri"""
-        return self._price_monitors.copy()
+        """Returnează o copie a monitoarelor de prețuri (sigură de iterat)"""
+        with self._monitors_lock:
+            return {key: dict(monitor) for key, monitor in self._price_monitors.items()}
     
     def get_price_history(self, route_key: str) -> list:
         """Returnează istoricul prețurilor pentru o rută"""
-        return self._price_history.get(route_key, [])
+        with self._history_lock(route_key):
+            return list(self._price_history.get(route_key, ()))
     
     def clear_cache(self, cache_type: Optional[str] = None):
         """Golește cache-ul"""
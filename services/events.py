@@ -0,0 +1,98 @@
+"""
+Evenimente de progres și diagnostic emise de servicii
+
+Serviciile nu randează nimic: emit evenimente către listener-ul activ în
+contextul curent. Interfața Streamlit este un abonat; pentru execuție
+headless (thread-uri, procese, batch) se folosește NullListener.
+"""
+import time
+import threading
+import contextvars
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import List
+
+# Niveluri de eveniment
+DEBUG = 'debug'
+INFO = 'info'
+SUCCESS = 'success'
+WARNING = 'warning'
+ERROR = 'error'
+
+
+@dataclass(frozen=True)
+class ServiceEvent:
+    """Un eveniment emis de servicii"""
+    kind: str           # ex: 'api_request', 'airport_lookup', 'search_done'
+    level: str
+    message: str
+    data: dict = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+
+
+class EventListener(ABC):
+    """Abonat la evenimentele serviciilor"""
+
+    @abstractmethod
+    def on_event(self, event: ServiceEvent):
+        """Primește un eveniment emis în contextul listener-ului"""
+
+
+class NullListener(EventListener):
+    """Ignoră toate evenimentele (execuție headless)"""
+
+    def on_event(self, event: ServiceEvent):
+        pass
+
+
+class CollectingListener(EventListener):
+    """Păstrează evenimentele în memorie (batch, teste)"""
+
+    def __init__(self):
+        self._events: List[ServiceEvent] = []
+        self._lock = threading.Lock()
+
+    def on_event(self, event: ServiceEvent):
+        with self._lock:
+            self._events.append(event)
+
+    @property
+    def events(self) -> List[ServiceEvent]:
+        with self._lock:
+            return list(self._events)
+
+    def of_kind(self, kind: str) -> List[ServiceEvent]:
+        return [e for e in self.events if e.kind == kind]
+
+
+NULL_LISTENER = NullListener()
+
+_current_listener: contextvars.ContextVar = contextvars.ContextVar(
+    'event_listener', default=NULL_LISTENER
+)
+
+
+@contextmanager
+def use_listener(listener: EventListener):
+    """Trimite evenimentele emise în bloc către listener"""
+    token = _current_listener.set(listener)
+    try:
+        yield listener
+    finally:
+        _current_listener.reset(token)
+
+
+def emit(kind: str, level: str, message: str, **data):
+    """Emite un eveniment către listener-ul activ"""
+    listener = _current_listener.get()
+    if listener is NULL_LISTENER:
+        return
+    listener.on_event(ServiceEvent(kind=kind, level=level, message=message, data=data))
+
+
+def dispatch(event: ServiceEvent):
+    """Retrimite un eveniment deja construit (ex: primit de la un proces worker)"""
+    listener = _current_listener.get()
+    if listener is not NULL_LISTENER:
+        listener.on_event(event)
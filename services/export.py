@@ -0,0 +1,250 @@
+"""
+Export de date în CSV, JSON, Parquet și XLSX
+
+Octeții se generează doar la cerere, în flux (câte un lot de rânduri), deci
+un export mare nu construiește niciodată un singur string uriaș. Parquet și
+XLSX folosesc dependențe opționale (pyarrow, openpyxl); formatele lor apar
+doar dacă acestea sunt instalate.
+"""
+import csv
+import importlib.util
+import io
+import json
+import os
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Hashable, Iterable, Iterator, List, Optional
+
+# Dimensiunea chunk-urilor citite din fișierele temporare
+FILE_CHUNK_BYTES = 64 * 1024
+
+
+@dataclass(frozen=True)
+class ExportFormat:
+    """Descrierea unui format de export"""
+    label: str
+    extension: str
+    mime: str
+    requires: Optional[str] = None   # modul opțional necesar
+
+
+EXPORT_FORMATS = {
+    'csv': ExportFormat('CSV', 'csv', 'text/csv'),
+    'json': ExportFormat('JSON', 'json', 'application/json'),
+    'parquet': ExportFormat('Parquet', 'parquet', 'application/vnd.apache.parquet', requires='pyarrow'),
+    'xlsx': ExportFormat('Excel', 'xlsx',
+                         'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+                         requires='openpyxl'),
+}
+
+
+def available_formats() -> List[str]:
+    """Formatele utilizabile în mediul curent"""
+    return [
+        name for name, fmt in EXPORT_FORMATS.items()
+        if fmt.requires is None or importlib.util.find_spec(fmt.requires) is not None
+    ]
+
+
+def _batches(rows: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _iter_csv(rows: Iterable[dict], columns: List[str], batch_rows: int) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction='ignore')
+    writer.writeheader()
+    for batch in _batches(rows, batch_rows):
+        writer.writerows(batch)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def _iter_json(rows: Iterable[dict], columns: List[str], batch_rows: int) -> Iterator[bytes]:
+    yield b'['
+    first = True
+    for batch in _batches(rows, batch_rows):
+        parts = []
+        for row in batch:
+            item = json.dumps({c: row.get(c) for c in columns}, ensure_ascii=False, default=str)
+            parts.append(item if first else ',' + item)
+            first = False
+        yield ''.join(parts).encode('utf-8')
+    yield b']'
+
+
+def _write_parquet(rows: Iterable[dict], columns: List[str], batch_rows: int, path: str):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for batch in _batches(rows, batch_rows):
+            table = pa.Table.from_pylist([{c: row.get(c) for c in columns} for row in batch])
+            if writer is None:
+                # Coloanele goale în primul lot ar fixa tipul null pentru tot fișierul
+                schema = pa.schema([
+                    pa.field(f.name, pa.string() if pa.types.is_null(f.type) else f.type)
+                    for f in table.schema
+                ])
+                writer = pq.ParquetWriter(path, schema)
+            writer.write_table(table.cast(writer.schema))
+        if writer is None:
+            pq.write_table(pa.table({c: pa.array([], pa.string()) for c in columns}), path)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _write_xlsx(rows: Iterable[dict], columns: List[str], path: str):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(columns)
+    for row in rows:
+        sheet.append([row.get(c) for c in columns])
+    workbook.save(path)
+
+
+def _iter_file(path: str) -> Iterator[bytes]:
+    try:
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(FILE_CHUNK_BYTES)
+                if not chunk:
+                    break
+                yield chunk
+    finally:
+        os.unlink(path)
+
+
+def iter_export(rows: Iterable[dict], columns: List[str], fmt: str,
+                batch_rows: int = 1000) -> Iterator[bytes]:
+    """
+    Generează exportul în chunk-uri de octeți
+
+    Args:
+        rows: Rândurile (dict-uri), consumate o singură dată
+        columns: Coloanele exportate, în ordine
+        fmt: Cheie din EXPORT_FORMATS
+        batch_rows: Rânduri procesate per chunk
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Format de export necunoscut: {fmt}")
+    if fmt == 'csv':
+        return _iter_csv(rows, columns, batch_rows)
+    if fmt == 'json':
+        return _iter_json(rows, columns, batch_rows)
+    if fmt not in available_formats():
+        raise ValueError(f"Formatul {fmt} necesită {EXPORT_FORMATS[fmt].requires}")
+
+    # Formatele binare se scriu incremental într-un fișier temporar
+    fd, path = tempfile.mkstemp(suffix=f".{EXPORT_FORMATS[fmt].extension}")
+    os.close(fd)
+    try:
+        if fmt == 'parquet':
+            _write_parquet(rows, columns, batch_rows, path)
+        else:
+            _write_xlsx(rows, columns, path)
+    except Exception:
+        os.unlink(path)
+        raise
+    return _iter_file(path)
+
+
+def export_bytes(rows: Iterable[dict], columns: List[str], fmt: str) -> bytes:
+    """Exportul complet, ca octeți"""
+    return b''.join(iter_export(rows, columns, fmt))
+
+
+def export_to_file(rows: Iterable[dict], columns: List[str], fmt: str,
+                   directory: Optional[str] = None) -> str:
+    """Scrie exportul chunk cu chunk într-un fișier temporar și returnează calea"""
+    fd, path = tempfile.mkstemp(suffix=f".{EXPORT_FORMATS[fmt].extension}", dir=directory)
+    with os.fdopen(fd, 'wb') as f:
+        for chunk in iter_export(rows, columns, fmt):
+            f.write(chunk)
+    return path
+
+
+def _remove_file(path: str):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+class ExportFile:
+    """
+    Un export scris pe disc (export_to_file), deținut de acest obiect
+
+    Fișierul e șters când obiectul nu mai e referit (ex: eliminat dintr-un
+    cache) sau, cel târziu, la ieșirea din proces.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._finalizer = weakref.finalize(self, _remove_file, path)
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+
+def iter_catalog_rows(organized: dict) -> Iterator[dict]:
+    """Rândurile catalogului continent -> țară -> aeroporturi, fără a construi o listă"""
+    for continent, countries in organized.items():
+        for country, airports in countries.items():
+            for airport in airports:
+                yield {**airport, 'country': country, 'continent': continent}
+
+
+CATALOG_COLUMNS = ['iata', 'name', 'city', 'country', 'continent', 'lat', 'lng']
+
+
+class ExportCache:
+    """Cache LRU pentru exporturi generate, limitat la un număr total de octeți"""
+
+    def __init__(self, max_bytes: int = 50 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._items: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        with self._lock:
+            data = self._items.get(key)
+            if data is not None:
+                self._items.move_to_end(key)
+            return data
+
+    def put(self, key: Hashable, data: bytes) -> bytes:
+        with self._lock:
+            if key in self._items:
+                self._size -= len(self._items.pop(key))
+            self._items[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes and len(self._items) > 1:
+                _, evicted = self._items.popitem(last=False)
+                self._size -= len(evicted)
+        return data
+
+    def get_or_build(self, key: Hashable, build: Callable[[], bytes]) -> bytes:
+        data = self.get(key)
+        return data if data is not None else self.put(key, build())
+
+    def __len__(self) -> int:
+        return len(self._items)
@@ -1,150 +1,44 @@
 """
 Servicii pentru căutarea zborurilor - Sky-Scrapper (Skyscanner via RapidAPI)
 """
-import requests
+import threading
 import time
+from collections import defaultdict
+from concurrent.futures import Future, TimeoutError as FutureTimeout
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-from dataclasses import dataclass
-import streamlit as st
+from typing import List, Dict, Optional, Tuple
+from dataclasses import dataclass, replace
 
 from config.settings import Settings
-from .cache_manager import cache_manager
+from .cache_manager import SearchKey, cache_manager
+from .key_pool import APIKeyPool, APIKeyState, get_rapidapi_key_pool, parse_rate_limit_headers
+from .scheduler import (
+    Priority, DeadlineExceeded, JobExpired, request_scheduler, current_priority, current_deadline,
+    deadline_exceeded, remaining_time
+)
+from .resilience import LatencyTracker, get_circuit_breaker, hedged
+from .events import emit, DEBUG, INFO, SUCCESS, WARNING, ERROR
+from .tracing import current_span, span, traced
+from .popularity import get_popularity_model
+from .query_log import get_query_log
+from .fx import get_fx_rates
 
 
 # ============================================
 # DICȚIONARE ȚĂRI ȘI CONTINENTE  
 # ============================================
 
-COUNTRY_NAMES = {
-    "AD": "Andorra", "AL": "Albania", "AT": "Austria", "BA": "Bosnia și Herțegovina",
-    "BE": "Belgia", "BG": "Bulgaria", "BY": "Belarus", "CH": "Elveția",
-    "CY": "Cipru", "CZ": "Cehia", "DE": "Germania", "DK": "Danemarca",
-    "EE": "Estonia", "ES": "Spania", "FI": "Finlanda", "FO": "Insulele Feroe",
-    "FR": "Franța", "GB": "Marea Britanie", "GI": "Gibraltar", "GR": "Grecia",
-    "HR": "Croația", "HU": "Ungaria", "IE": "Irlanda", "IS": "Islanda",
-    "IT": "Italia", "LI": "Liechtenstein", "LT": "Lituania", "LU": "Luxemburg",
-    "LV": "Letonia", "MC": "Monaco", "MD": "Moldova", "ME": "Muntenegru",
-    "MK": "Macedonia de Nord", "MT": "Malta", "NL": "Olanda", "NO": "Norvegia",
-    "PL": "Polonia", "PT": "Portugalia", "RO": "România", "RS": "Serbia",
-    "RU": "Rusia", "SE": "Suedia", "SI": "Slovenia", "SK": "Slovacia",
-    "SM": "San Marino", "UA": "Ucraina", "VA": "Vatican", "XK": "Kosovo",
-    "AE": "Emiratele Arabe Unite", "AF": "Afganistan", "AM": "Armenia",
-    "AZ": "Azerbaidjan", "BD": "Bangladesh", "BH": "Bahrain", "BN": "Brunei",
-    "BT": "Bhutan", "CN": "China", "GE": "Georgia", "HK": "Hong Kong",
-    "ID": "Indonezia", "IL": "Israel", "IN": "India", "IQ": "Irak",
-    "IR": "Iran", "JO": "Iordania", "JP": "Japonia", "KG": "Kârgâzstan",
-    "KH": "Cambodgia", "KP": "Coreea de Nord", "KR": "Coreea de Sud",
-    "KW": "Kuweit", "KZ": "Kazahstan", "LA": "Laos", "LB": "Liban",
-    "LK": "Sri Lanka", "MM": "Myanmar", "MN": "Mongolia", "MO": "Macao",
-    "MV": "Maldive", "MY": "Malaezia", "NP": "Nepal", "OM": "Oman",
-    "PH": "Filipine", "PK": "Pakistan", "PS": "Palestina", "QA": "Qatar",
-    "SA": "Arabia Saudită", "SG": "Singapore", "SY": "Siria", "TH": "Thailanda",
-    "TJ": "Tadjikistan", "TL": "Timorul de Est", "TM": "Turkmenistan",
-    "TR": "Turcia", "TW": "Taiwan", "UZ": "Uzbekistan", "VN": "Vietnam",
-    "YE": "Yemen",
-    "AO": "Angola", "BF": "Burkina Faso", "BI": "Burundi", "BJ": "Benin",
-    "BW": "Botswana", "CD": "Congo (RD)", "CF": "Republica Centrafricană",
-    "CG": "Congo", "CI": "Coasta de Fildeș", "CM": "Camerun", "CV": "Capul Verde",
-    "DJ": "Djibouti", "DZ": "Algeria", "EG": "Egipt", "EH": "Sahara Occidentală",
-    "ER": "Eritreea", "ET": "Etiopia", "GA": "Gabon", "GH": "Ghana",
-    "GM": "Gambia", "GN": "Guineea", "GQ": "Guineea Ecuatorială",
-    "GW": "Guineea-Bissau", "KE": "Kenya", "KM": "Comore", "LR": "Liberia",
-    "LS": "Lesotho", "LY": "Libia", "MA": "Maroc", "MG": "Madagascar",
-    "ML": "Mali", "MR": "Mauritania", "MU": "Mauritius", "MW": "Malawi",
-    "MZ": "Mozambic", "NA": "Namibia", "NE": "Niger", "NG": "Nigeria",
-    "RE": "Réunion", "RW": "Rwanda", "SC": "Seychelles", "SD": "Sudan",
-    "SL": "Sierra Leone", "SN": "Senegal", "SO": "Somalia", "SS": "Sudanul de Sud",
-    "ST": "São Tomé și Príncipe", "SZ": "Eswatini", "TD": "Ciad", "TG": "Togo",
-    "TN": "Tunisia", "TZ": "Tanzania", "UG": "Uganda", "YT": "Mayotte",
-    "ZA": "Africa de Sud", "ZM": "Zambia", "ZW": "Zimbabwe",
-    "AG": "Antigua și Barbuda", "AI": "Anguilla", "AW": "Aruba", "BB": "Barbados",
-    "BM": "Bermuda", "BS": "Bahamas", "BZ": "Belize", "CA": "Canada",
-    "CR": "Costa Rica", "CU": "Cuba", "CW": "Curaçao", "DM": "Dominica",
-    "DO": "Republica Dominicană", "GD": "Grenada", "GL": "Groenlanda",
-    "GP": "Guadelupa", "GT": "Guatemala", "HN": "Honduras", "HT": "Haiti",
-    "JM": "Jamaica", "KN": "Saint Kitts și Nevis", "KY": "Insulele Cayman",
-    "LC": "Saint Lucia", "MQ": "Martinica", "MS": "Montserrat", "MX": "Mexic",
-    "NI": "Nicaragua", "PA": "Panama", "PM": "Saint Pierre și Miquelon",
-    "PR": "Puerto Rico", "SV": "El Salvador", "SX": "Sint Maarten",
-    "TC": "Insulele Turks și Caicos", "TT": "Trinidad și Tobago",
-    "US": "Statele Unite", "VC": "Saint Vincent și Grenadine",
-    "VG": "Insulele Virgine Britanice", "VI": "Insulele Virgine Americane",
-    "AR": "Argentina", "BO": "Bolivia", "BR": "Brazilia", "CL": "Chile",
-    "CO": "Columbia", "EC": "Ecuador", "FK": "Insulele Falkland",
-    "GF": "Guyana Franceză", "GY": "Guyana", "PE": "Peru", "PY": "Paraguay",
-    "SR": "Surinam", "UY": "Uruguay", "VE": "Venezuela",
-    "AS": "Samoa Americană", "AU": "Australia", "CK": "Insulele Cook",
-    "FJ": "Fiji", "FM": "Micronezia", "GU": "Guam", "KI": "Kiribati",
-    "MH": "Insulele Marshall", "NC": "Noua Caledonie", "NF": "Insula Norfolk",
-    "NR": "Nauru", "NU": "Niue", "NZ": "Noua Zeelandă", "PF": "Polinezia Franceză",
-    "PG": "Papua Noua Guinee", "PN": "Insulele Pitcairn", "PW": "Palau",
-    "SB": "Insulele Solomon", "TO": "Tonga", "TV": "Tuvalu", "VU": "Vanuatu",
-    "WF": "Wallis și Futuna", "WS": "Samoa",
-}
-
-CONTINENT_MAPPING = {
-    "AD": "EU", "AL": "EU", "AT": "EU", "BA": "EU", "BE": "EU", "BG": "EU",
-    "BY": "EU", "CH": "EU", "CY": "EU", "CZ": "EU", "DE": "EU", "DK": "EU",
-    "EE": "EU", "ES": "EU", "FI": "EU", "FO": "EU", "FR": "EU", "GB": "EU",
-    "GI": "EU", "GR": "EU", "HR": "EU", "HU": "EU", "IE": "EU", "IS": "EU",
-    "IT": "EU", "LI": "EU", "LT": "EU", "LU": "EU", "LV": "EU", "MC": "EU",
-    "MD": "EU", "ME": "EU", "MK": "EU", "MT": "EU", "NL": "EU", "NO": "EU",
-    "PL": "EU", "PT": "EU", "RO": "EU", "RS": "EU", "RU": "EU", "SE": "EU",
-    "SI": "EU", "SK": "EU", "SM": "EU", "UA": "EU", "VA": "EU", "XK": "EU",
-    "AE": "AS", "AF": "AS", "AM": "AS", "AZ": "AS", "BD": "AS", "BH": "AS",
-    "BN": "AS", "BT": "AS", "CN": "AS", "GE": "AS", "HK": "AS", "ID": "AS",
-    "IL": "AS", "IN": "AS", "IQ": "AS", "IR": "AS", "JO": "AS", "JP": "AS",
-    "KG": "AS", "KH": "AS", "KP": "AS", "KR": "AS", "KW": "AS", "KZ": "AS",
-    "LA": "AS", "LB": "AS", "LK": "AS", "MM": "AS", "MN": "AS", "MO": "AS",
-    "MV": "AS", "MY": "AS", "NP": "AS", "OM": "AS", "PH": "AS", "PK": "AS",
-    "PS": "AS", "QA": "AS", "SA": "AS", "SG": "AS", "SY": "AS", "TH": "AS",
-    "TJ": "AS", "TL": "AS", "TM": "AS", "TR": "AS", "TW": "AS", "UZ": "AS",
-    "VN": "AS", "YE": "AS",
-    "AO": "AF", "BF": "AF", "BI": "AF", "BJ": "AF", "BW": "AF", "CD": "AF",
-    "CF": "AF", "CG": "AF", "CI": "AF", "CM": "AF", "CV": "AF", "DJ": "AF",
-    "DZ": "AF", "EG": "AF", "EH": "AF", "ER": "AF", "ET": "AF", "GA": "AF",
-    "GH": "AF", "GM": "AF", "GN": "AF", "GQ": "AF", "GW": "AF", "KE": "AF",
-    "KM": "AF", "LR": "AF", "LS": "AF", "LY": "AF", "MA": "AF", "MG": "AF",
-    "ML": "AF", "MR": "AF", "MU": "AF", "MW": "AF", "MZ": "AF", "NA": "AF",
-    "NE": "AF", "NG": "AF", "RE": "AF", "RW": "AF", "SC": "AF", "SD": "AF",
-    "SL": "AF", "SN": "AF", "SO": "AF", "SS": "AF", "ST": "AF", "SZ": "AF",
-    "TD": "AF", "TG": "AF", "TN": "AF", "TZ": "AF", "UG": "AF", "YT": "AF",
-    "ZA": "AF", "ZM": "AF", "ZW": "AF",
-    "AG": "NA", "AI": "NA", "AW": "NA", "BB": "NA", "BM": "NA", "BS": "NA",
-    "BZ": "NA", "CA": "NA", "CR": "NA", "CU": "NA", "CW": "NA", "DM": "NA",
-    "DO": "NA", "GD": "NA", "GL": "NA", "GP": "NA", "GT": "NA", "HN": "NA",
-    "HT": "NA", "JM": "NA", "KN": "NA", "KY": "NA", "LC": "NA", "MQ": "NA",
-    "MS": "NA", "MX": "NA", "NI": "NA", "PA": "NA", "PM": "NA", "PR": "NA",
-    "SV": "NA", "SX": "NA", "TC": "NA", "TT": "NA", "US": "NA", "VC": "NA",
-    "VG": "NA", "VI": "NA",
-    "AR": "SA", "BO": "SA", "BR": "SA", "CL": "SA", "CO": "SA", "EC": "SA",
-    "FK": "SA", "GF": "SA", "GY": "SA", "PE": "SA", "PY": "SA", "SR": "SA",
-    "UY": "SA", "VE": "SA",
-    "AS": "OC", "AU": "OC", "CK": "OC", "FJ": "OC", "FM": "OC", "GU": "OC",
-    "KI": "OC", "MH": "OC", "NC": "OC", "NF": "OC", "NR": "OC", "NU": "OC",
-    "NZ": "OC", "PF": "OC", "PG": "OC", "PN": "OC", "PW": "OC", "SB": "OC",
-    "TO": "OC", "TV": "OC", "VU": "OC", "WF": "OC", "WS": "OC",
-}
-
-CONTINENT_NAMES = {
-    "AF": "Africa",
-    "AS": "Asia", 
-    "EU": "Europa",
-    "NA": "America de Nord",
-    "OC": "Oceania",
-    "SA": "America de Sud"
-}
-
-
-def get_country_name(country_code: str) -> str:
-    return COUNTRY_NAMES.get(country_code.upper(), country_code)
-
-def get_continent_code(country_code: str) -> str:
-    return CONTINENT_MAPPING.get(country_code.upper(), "EU")
-
-def get_continent_name(continent_code: str) -> str:
-    return CONTINENT_NAMES.get(continent_code.upper(), continent_code)
+# Tabelele și funcțiile de lookup stau în services/countries.py și se încarcă
+# la primul acces (PEP 562), nu la importul modulului.
+_COUNTRY_EXPORTS = ('COUNTRY_NAMES', 'CONTINENT_MAPPING', 'CONTINENT_NAMES',
+                    'get_country_name', 'get_continent_code', 'get_continent_name')
+
+
+def __getattr__(name):
+    if name in _COUNTRY_EXPORTS:
+        from . import countries
+        return getattr(countries, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ============================================
@@ -188,6 +82,74 @@ class FlightOffer:
             'Escale': self.stops,
             'Locuri': self.seats_available or 'N/A',
         }
+    
+    def to_record(self) -> dict:
+        """Reprezentare JSON-serializabilă (batch, API HTTP)"""
+        return {
+            'id': self.id,
+            'airline': self.airline,
+            'airline_code': self.airline_code,
+            'origin': self.origin,
+            'destination': self.destination,
+            'departure_time': self.departure_time.isoformat(),
+            'arrival_time': self.arrival_time.isoformat(),
+            'duration': self.duration,
+            'price': float(self.price),
+            'currency': self.currency,
+            'stops': self.stops,
+        }
+
+
+# Parsarea verifică termenul căutării o dată la atâtea itinerarii
+_PARSE_DEADLINE_CHECK = 64
+
+
+def emit_deadline(endpoint: str):
+    emit('deadline_exceeded', WARNING, "⏱️ Termenul căutării a expirat", endpoint=endpoint)
+
+
+def _is_complete(offers) -> bool:
+    """Doar răspunsurile nevide și complete intră în cache-ul de zboruri"""
+    return bool(offers) and not getattr(offers, 'partial', False)
+
+
+def convert_offers(offers: List[FlightOffer], currency: str) -> List[FlightOffer]:
+    """
+    Ofertele cu prețurile convertite local în `currency` (copii; originalele
+    rămân în cache în moneda de bază)
+    
+    Fără cursuri de schimb (sau pentru o monedă necunoscută) ofertele sunt
+    întoarse neschimbate, cu moneda lor.
+    """
+    currency = currency.strip().upper()
+    if all(offer.currency == currency for offer in offers):
+        return offers
+    table = get_fx_rates().table()
+    try:
+        if table is None:
+            raise KeyError(currency)
+        return [replace(offer, price=round(table.convert(offer.price, offer.currency, currency), 2),
+                        currency=currency)
+                for offer in offers]
+    except KeyError:
+        emit('fx_unavailable', WARNING, f"💱 Conversia în {currency} nu e disponibilă; prețuri în {offers[0].currency}",
+             currency=currency)
+        return offers
+
+
+class SearchResults(list):
+    """
+    Ofertele unei căutări, cu proveniența lor
+
+    partial: răspunsul nu e complet și proaspăt - termenul căutării a expirat
+    (itinerarii doar din primele loturi) sau s-au folosit rezultatele salvate
+    anterior (flights_stale). outcome: ca în SkyScrapperAPI.lookup_flights.
+    """
+    
+    def __init__(self, offers=(), partial: bool = False, outcome: str = 'miss'):
+        super().__init__(offers)
+        self.partial = partial
+        self.outcome = outcome
 
 
 # ============================================
@@ -197,64 +159,177 @@ class FlightOffer:
 class SkyScrapperAPI:
     """Client pentru Sky-Scrapper API (Skyscanner via RapidAPI)"""
     
-    def __init__(self):
+    def __init__(self, key_pool: Optional[APIKeyPool] = None):
+        self.key_pool = key_pool if key_pool is not None else get_rapidapi_key_pool()
         keys = Settings.get_api_keys()
         self.api_key = keys.get('rapidapi_key', '')
-        self.base_url = "https://sky-scrapper.p.rapidapi.com/api/v1"
+        self.base_url = f"{Settings.SKY_SCRAPPER_BASE_URL.rstrip('/')}/api/v1"
         self.headers = {
             'x-rapidapi-host': 'sky-scrapper.p.rapidapi.com',
-            'x-rapidapi-key': self.api_key
         }
         self._entity_cache = {}
+        self._latency: Dict[str, LatencyTracker] = defaultdict(LatencyTracker)
     
-    def _make_request(self, endpoint: str, params: dict = None) -> dict:
-        """Face request către API"""
-        if not self.api_key:
-            st.error("❌ RapidAPI key nu este configurat!")
-            return {}
+    def _send(self, url: str, params: Optional[dict], key_state: APIKeyState,
+              deadline: Optional[float] = None):
+        """Execută cererea HTTP cu o cheie din pool (rulează în planificator)"""
+        headers = {**self.headers, 'x-rapidapi-key': key_state.key}
+        status_code = None
+        rate_info = None
+        started = time.time()
+        sent = False
         
-        url = f"{self.base_url}/{endpoint}"
+        import requests
         
         try:
+            # Timeout-ul nu depășește termenul căutării care a lansat cererea
+            timeout = Settings.HTTP_TIMEOUT if deadline is None else min(Settings.HTTP_TIMEOUT, deadline - started)
+            if timeout <= 0:
+                raise DeadlineExceeded("Termenul căutării a expirat înainte de trimitere")
+            sent = True
             response = requests.get(
                 url, 
-                headers=self.headers, 
+                headers=headers, 
                 params=params, 
-                timeout=30
+                timeout=timeout
             )
-            
-            # Debug info
-            with st.expander("🔧 Debug API Request", expanded=False):
-                st.write(f"**URL:** {response.url}")
-                st.write(f"**Status:** {response.status_code}")
-            
-            if response.status_code == 429:
-                st.error("❌ Rate limit depășit. Așteaptă 1 minut și încearcă din nou.")
-                return {}
-            
-            if response.status_code != 200:
-                st.error(f"❌ API Error: {response.status_code} - {response.text[:200]}")
-                return {}
-            
-            data = response.json()
-            return data
-            
-        except requests.exceptions.Timeout:
-            st.error("❌ Timeout - Serverul nu a răspuns în timp util")
+            status_code = response.status_code
+            rate_info = parse_rate_limit_headers(response.headers)
+            self._latency[url].record(time.time() - started)
+            return response, key_state.label
+        finally:
+            # Apelul netrimis nu consumă bugetul cheii
+            self.key_pool.release(key_state, status_code, rate_info, refund=not sent)
+    
+    def _submit(self, url: str, params: Optional[dict], key_state: APIKeyState) -> Future:
+        """Trimite cererea în planificator; cheia e eliberată (și apelul returnat) dacă job-ul nu rulează"""
+        future = request_scheduler.submit(self._send, url, params, key_state, current_deadline())
+        
+        def release_if_skipped(f: Future):
+            # Un job care a rulat și-a eliberat cheia în _send
+            if f.cancelled() or isinstance(f.exception(), JobExpired):
+                self.key_pool.release(key_state, refund=True)
+        
+        future.add_done_callback(release_if_skipped)
+        return future
+    
+    def _make_request(self, endpoint: str, params: dict = None, hedge: bool = False) -> dict:
+        """
+        Face request către API, alegând cheia prin pool
+        
+        Args:
+            endpoint: Endpoint-ul API
+            params: Parametrii cererii
+            hedge: Trimite o a doua cerere dacă prima depășește p95 (doar pentru cereri idempotente)
+        """
+        import requests
+        
+        if not len(self.key_pool):
+            emit('config_error', ERROR, "❌ RapidAPI key nu este configurat!")
             return {}
-        except Exception as e:
-            st.error(f"❌ Eroare conexiune: {str(e)}")
+        
+        breaker = get_circuit_breaker(endpoint)
+        if not breaker.allow_request():
+            emit('circuit_open', WARNING,
+                 f"⚠️ Serviciul nu răspunde momentan. Reîncercare automată în {breaker.retry_after():.0f}s.",
+                 endpoint=endpoint)
+            return {}
+        
+        url = f"{self.base_url}/{endpoint}"
+        reserve = Settings.BUDGET_RESERVE.get(current_priority().name.lower(), 0)
+        
+        def start_hedge() -> Optional[Future]:
+            extra_key = self.key_pool.acquire(timeout=0, reserve=reserve)
+            return self._submit(url, params, extra_key) if extra_key else None
+        
+        outcome = None
+        try:
+            # O cheie în carantină (429/403) e ocolită; reîncercăm cu următoarea.
+            # Tentativa suplimentară reia cererea exact la resetarea bugetului upstream.
+            for _ in range(len(self.key_pool) + Settings.RATE_LIMIT_RETRIES):
+                key_state = self.key_pool.acquire(timeout=remaining_time(Settings.KEY_ACQUIRE_TIMEOUT), reserve=reserve)
+                if key_state is None:
+                    if deadline_exceeded():
+                        emit_deadline(endpoint)
+                        return {}
+                    emit('rate_limited', ERROR,
+                         "❌ Rate limit depășit pe toate cheile. Așteaptă 1 minut și încearcă din nou.",
+                         endpoint=endpoint)
+                    return {}
+                
+                try:
+                    with span('http', endpoint=endpoint, hedge=hedge) as http_span:
+                        future = self._submit(url, params, key_state)
+                        if hedge:
+                            response, key_label = hedged(future, start_hedge, self._latency[url].hedge_delay(),
+                                                         timeout=remaining_time())
+                        else:
+                            response, key_label = future.result(timeout=remaining_time())
+                        http_span.set_attributes(status=response.status_code, key=key_label,
+                                                 bytes=len(response.content))
+                except (DeadlineExceeded, FutureTimeout):
+                    emit_deadline(endpoint)
+                    return {}
+                except requests.exceptions.Timeout:
+                    # Timeout scurtat de termenul căutării: upstream-ul nu e de vină
+                    if deadline_exceeded():
+                        emit_deadline(endpoint)
+                        return {}
+                    outcome = False
+                    emit('api_error', ERROR, "❌ Timeout - Serverul nu a răspuns în timp util", endpoint=endpoint)
+                    return {}
+                except Exception as e:
+                    outcome = False
+                    emit('api_error', ERROR, f"❌ Eroare conexiune: {str(e)}", endpoint=endpoint)
+                    return {}
+                
+                # Debug info
+                emit('api_request', DEBUG, "🔧 Debug API Request",
+                     url=response.url, status=response.status_code, key=key_label)
+                
+                if response.status_code in (429, 403):
+                    continue
+                
+                if response.status_code != 200:
+                    if response.status_code >= 500:
+                        outcome = False
+                    emit('api_error', ERROR, f"❌ API Error: {response.status_code} - {response.text[:200]}",
+                         endpoint=endpoint, status=response.status_code)
+                    return {}
+                
+                try:
+                    with span('json_decode', endpoint=endpoint):
+                        data = response.json()
+                except ValueError:
+                    outcome = False
+                    emit('api_error', ERROR, "❌ Răspuns invalid de la API", endpoint=endpoint)
+                    return {}
+                
+                outcome = True
+                return data
+            
+            emit('rate_limited', ERROR, "❌ Rate limit depășit. Așteaptă 1 minut și încearcă din nou.",
+                 endpoint=endpoint)
             return {}
+        finally:
+            if outcome is True:
+                breaker.record_success()
+            elif outcome is False:
+                breaker.record_failure()
+            else:
+                breaker.record_ignored()
     
     def search_airport(self, query: str) -> Optional[dict]:
         """Caută un aeroport după cod IATA și returnează entityId"""
         
         # Verifică cache
-        if query.upper() in self._entity_cache:
+        cached = query.upper() in self._entity_cache
+        current_span().set_attribute('cache_hit', cached)
+        if cached:
             return self._entity_cache[query.upper()]
         
         params = {'query': query, 'locale': 'en-US'}
-        data = self._make_request('flights/searchAirport', params)
+        data = self._make_request('flights/searchAirport', params, hedge=Settings.HEDGE_AIRPORT_SEARCH)
         
         if not data.get('status') or not data.get('data'):
             return None
@@ -285,24 +360,77 @@ class SkyScrapperAPI:
         cabin_class: str = 'economy',
         currency: str = 'EUR'
     ) -> List[FlightOffer]:
-        """Caută zboruri"""
-        
-        # Obține entity IDs
-        st.info(f"🔍 Se caută aeroportul {origin}...")
-        origin_data = self.search_airport(origin)
+        """Caută zboruri (în moneda de bază, convertite apoi local în `currency`)"""
         
-        st.info(f"🔍 Se caută aeroportul {destination}...")
-        dest_data = self.search_airport(destination)
+        # Cheia se normalizează o singură dată și servește tuturor cache-urilor
+        key = SearchKey.create(origin, destination, departure_date, return_date,
+                               adults, children, infants, cabin_class, Settings.BASE_CURRENCY)
+        return convert_offers(self.lookup_flights(key)[0], currency)
+    
+    @traced('flights_lookup')
+    def lookup_flights(self, key: SearchKey) -> Tuple[List[FlightOffer], str]:
+        """
+        Zborurile pentru o cheie și proveniența lor
+        
+        Returns:
+            (oferte, rezultat cache): 'hit', 'miss' (cerere upstream), 'partial'
+            (termenul a expirat; doar primele loturi, posibil niciunul), 'stale'
+            (rezerva flights_stale) sau 'error' (niciun rezultat)
+        """
+        cached = cache_manager.get('flights', key)
+        current_span().set_attribute('cache_hit', cached is not None)
+        if cached is not None:
+            emit('cache_hit', DEBUG, "💾 Rezultate din cache", route=f"{key.origin}-{key.destination}", count=len(cached))
+            return list(cached), 'hit'
+        
+        # Căutările identice simultane (din sesiuni diferite) fac un singur apel upstream;
+        # doar răspunsurile complete intră în cache
+        try:
+            offers = cache_manager.get_or_compute('flights', lambda: self._fetch_flights(key), key,
+                                                  should_cache=_is_complete, timeout=remaining_time())
+        except FutureTimeout:
+            # Căutarea la care ne-am alăturat nu s-a terminat în termenul nostru
+            emit_deadline('flights/searchFlights')
+            offers = None
+        if getattr(offers, 'partial', False):
+            # Rezultatele salvate sunt complete; primele loturi (chiar zero), doar dacă nu avem altceva
+            stale = self._stale_offers(key)
+            return (stale, 'stale') if stale else (list(offers), 'partial')
+        if offers is None:
+            stale = self._stale_offers(key)
+            if stale:
+                return stale, 'stale'
+            return [], 'partial' if deadline_exceeded() else 'error'
+        return list(offers), 'miss'
+    
+    def refresh_flights(self, key: SearchKey) -> bool:
+        """Reîmprospătează intrarea din cache a unei căutări, ignorând-o pe cea curentă"""
+        offers = self._fetch_flights(key)
+        if not _is_complete(offers):
+            return False
+        cache_manager.set('flights', offers, key)
+        return True
+    
+    def _fetch_flights(self, key: SearchKey) -> Optional[List[FlightOffer]]:
+        """Apelurile upstream pentru o căutare; None dacă nu s-a putut obține un răspuns"""
+        origin, destination = key.origin, key.destination
         
+        # Obține entity IDs
+        emit('airport_lookup', INFO, f"🔍 Se caută aeroportul {origin}...", query=origin)
+        with span('resolve_origin', query=origin):
+            origin_data = self.search_airport(origin)
         if not origin_data:
-            st.error(f"❌ Nu s-a găsit aeroportul: {origin}")
-            return []
+            self._airport_not_found(origin)
+            return None
         
+        emit('airport_lookup', INFO, f"🔍 Se caută aeroportul {destination}...", query=destination)
+        with span('resolve_destination', query=destination):
+            dest_data = self.search_airport(destination)
         if not dest_data:
-            st.error(f"❌ Nu s-a găsit aeroportul: {destination}")
-            return []
+            self._airport_not_found(destination)
+            return None
         
-        st.success(f"✅ Aeroporturi găsite: {origin_data['name']} → {dest_data['name']}")
+        emit('airports_resolved', SUCCESS, f"✅ Aeroporturi găsite: {origin_data['name']} → {dest_data['name']}")
         
         # Parametri căutare
         params = {
@@ -310,46 +438,110 @@ class SkyScrapperAPI:
             'destinationSkyId': dest_data['skyId'],
             'originEntityId': origin_data['entityId'],
             'destinationEntityId': dest_data['entityId'],
-            'date': departure_date,
-            'adults': str(adults),
-            'currency': currency,
-            'cabinClass': cabin_class,
+            'date': key.departure_date,
+            'adults': str(key.adults),
+            'currency': key.currency,
+            'cabinClass': key.cabin_class,
             'countryCode': 'RO',
             'market': 'ro-RO'
         }
         
-        if return_date:
-            params['returnDate'] = return_date
-        if children > 0:
-            params['childrens'] = str(children)
-        if infants > 0:
-            params['infants'] = str(infants)
+        if key.return_date:
+            params['returnDate'] = key.return_date
+        if key.children > 0:
+            params['childrens'] = str(key.children)
+        if key.infants > 0:
+            params['infants'] = str(key.infants)
         
-        st.info("🔍 Se caută zboruri...")
-        data = self._make_request('flights/searchFlights', params)
+        emit('flight_search', INFO, "🔍 Se caută zboruri...")
+        with span('search_flights_request'):
+            data = self._make_request('flights/searchFlights', params)
         
         if not data:
-            return []
+            return None
         
-        return self._parse_flights(data, currency)
+        data, complete = self._poll_incomplete(data, key)
+        offers = self._parse_flights(data, key.currency)
+        if not complete:
+            offers.partial = True
+        if offers and not offers.partial:
+            cache_manager.set('flights_stale', offers, key)
+        return offers
+    
+    @staticmethod
+    def _airport_not_found(query: str):
+        # Termenul expirat a fost deja raportat de _make_request; aeroportul nu lipsește
+        if deadline_exceeded():
+            return
+        emit('airport_not_found', ERROR, f"❌ Nu s-a găsit aeroportul: {query}", query=query)
+    
+    def _poll_incomplete(self, data: dict, key: SearchKey) -> Tuple[dict, bool]:
+        """
+        Cere restul itinerariilor cât timp upstream-ul raportează context.status='incomplete'
+        
+        Fiecare răspuns searchIncomplete conține toate itinerariile găsite până
+        atunci. Se oprește la Settings.INCOMPLETE_MAX_POLLS sau când termenul
+        căutării nu mai permite încă o așteptare.
+        
+        Returns:
+            (ultimul răspuns, dacă e complet)
+        """
+        for poll in range(1, Settings.INCOMPLETE_MAX_POLLS + 1):
+            context = data.get('data', {}).get('context', {})
+            if context.get('status') != 'incomplete':
+                return data, True
+            left = remaining_time()
+            if left is not None and left <= Settings.INCOMPLETE_POLL_INTERVAL:
+                break
+            time.sleep(Settings.INCOMPLETE_POLL_INTERVAL)
+            emit('flight_search_incomplete', DEBUG, "⏳ Se așteaptă restul rezultatelor...", poll=poll)
+            with span('search_incomplete', poll=poll):
+                update = self._make_request('flights/searchIncomplete', {
+                    'sessionId': context.get('sessionId', ''),
+                    'currency': key.currency,
+                    'countryCode': 'RO',
+                    'market': 'ro-RO',
+                })
+            if not update.get('status'):
+                break
+            data = update
+        complete = data.get('data', {}).get('context', {}).get('status') != 'incomplete'
+        if not complete:
+            emit('partial_results', WARNING, "⏱️ Timpul căutării a expirat - se afișează primele rezultate găsite")
+        return data, complete
+    
+    def _stale_offers(self, key: SearchKey) -> List[FlightOffer]:
+        """Ultimele rezultate reușite pentru o căutare, folosite când upstream-ul nu răspunde"""
+        stale = cache_manager.get('flights_stale', key)
+        if stale:
+            emit('stale_results', WARNING, "⚠️ Serviciul nu răspunde - se afișează ultimele rezultate salvate",
+                 count=len(stale))
+            return list(stale)
+        return []
     
-    def _parse_flights(self, data: dict, currency: str) -> List[FlightOffer]:
-        """Parsează răspunsul API"""
-        offers = []
+    @traced('parse_flights')
+    def _parse_flights(self, data: dict, currency: str) -> SearchResults:
+        """Parsează răspunsul API; la expirarea termenului păstrează itinerariile parsate până atunci"""
+        offers = SearchResults()
         
         if not data.get('status'):
-            st.warning("⚠️ API nu a returnat date valide")
+            emit('parse_error', WARNING, "⚠️ API nu a returnat date valide")
             return offers
         
         itineraries = data.get('data', {}).get('itineraries', [])
         
         if not itineraries:
-            st.warning("⚠️ Nu s-au găsit zboruri pentru această rută")
+            emit('no_results', WARNING, "⚠️ Nu s-au găsit zboruri pentru această rută")
             return offers
         
-        st.info(f"📊 Se procesează {len(itineraries)} rezultate...")
+        emit('parsing', INFO, f"📊 Se procesează {len(itineraries)} rezultate...", count=len(itineraries))
         
-        for idx, itinerary in enumerate(itineraries[:100]):
+        for idx, itinerary in enumerate(itineraries):
+            if idx % _PARSE_DEADLINE_CHECK == 0 and idx and deadline_exceeded():
+                emit('partial_results', WARNING, "⏱️ Timpul căutării a expirat - se afișează primele rezultate găsite",
+                     parsed=idx, total=len(itineraries))
+                offers.partial = True
+                break
             try:
                 legs = itinerary.get('legs', [])
                 if not legs:
@@ -440,6 +632,7 @@ class SkyScrapperAPI:
                 # Skip invalid entries silently
                 continue
         
+        current_span().set_attributes(itineraries=len(itineraries), offers=len(offers), partial=offers.partial)
         return offers
 
 
@@ -452,7 +645,7 @@ class AirLabsAPI:
     
     def __init__(self):
         self.config = Settings.get_airlabs_config()
-        self.base_url = "https://airlabs.co/api/v9"
+        self.base_url = self.config.base_url.rstrip('/')
     
     def get_airports(self) -> List[dict]:
         """Obține lista de aeroporturi"""
@@ -463,11 +656,14 @@ class AirLabsAPI:
         url = f"{self.base_url}/airports"
         params = {'api_key': self.config.key}
         
+        import requests
+        
         try:
-            response = requests.get(url, params=params, timeout=30)
+            response = request_scheduler.run(requests.get, url, params=params, timeout=Settings.HTTP_TIMEOUT)
             
             if response.status_code != 200:
-                st.warning(f"⚠️ AirLabs Error: {response.status_code}")
+                emit('api_error', WARNING, f"⚠️ AirLabs Error: {response.status_code}",
+                     endpoint='airports', status=response.status_code)
                 return []
             
             data = response.json()
@@ -479,7 +675,7 @@ class AirLabsAPI:
             return airports
             
         except Exception as e:
-            st.error(f"❌ AirLabs Error: {str(e)}")
+            emit('api_error', ERROR, f"❌ AirLabs Error: {str(e)}", endpoint='airports')
             return []
 
 
@@ -494,7 +690,9 @@ class FlightSearchService:
         self.sky_scrapper = SkyScrapperAPI()
         self.airlabs = AirLabsAPI()
         self._airports_cache = {}
+        self._airports_lock = threading.Lock()
     
+    @traced('service.search_flights')
     def search_flights(
         self,
         origin: str,
@@ -509,50 +707,80 @@ class FlightSearchService:
         currency: str = 'EUR',
         max_results: int = 50,
         sort_by: str = 'price'
-    ) -> List[FlightOffer]:
-        """Caută zboruri"""
+    ) -> 'SearchResults':
+        """
+        Caută zboruri
+        
+        Termenul limită din context (request_context) se aplică întregii
+        căutări; la expirare se întorc rezultatele disponibile, cu partial=True.
+        
+        Căutarea și cache-ul folosesc Settings.BASE_CURRENCY pentru orice
+        `currency`; prețurile sunt convertite local la final.
+        """
         
         # Căutare Sky-Scrapper
-        offers = self.sky_scrapper.search_flights(
-            origin=origin,
-            destination=destination,
-            departure_date=departure_date,
-            return_date=return_date,
-            adults=adults,
-            children=children,
-            infants=infants,
-            cabin_class=cabin_class,
-            currency=currency
-        )
-        
-        # Filtrare zboruri directe
-        if non_stop:
-            offers = [o for o in offers if o.stops == 0]
-            st.info(f"✈️ Filtrat: {len(offers)} zboruri directe")
-        
-        # Sortare
-        if sort_by == 'price':
-            offers.sort(key=lambda x: x.price)
-        elif sort_by == 'duration':
-            # Sortare după durată
-            offers.sort(key=lambda x: x.departure_time)
-        elif sort_by == 'stops':
-            offers.sort(key=lambda x: (x.stops, x.price))
-        
-        # Actualizează monitorul de prețuri
+        key = SearchKey.create(origin, destination, departure_date, return_date,
+                               adults, children, infants, cabin_class, Settings.BASE_CURRENCY)
+        started = time.perf_counter()
+        offers, outcome = self.sky_scrapper.lookup_flights(key)
+        self._record_query(key, time.perf_counter() - started, outcome, len(offers))
+        
+        with span('filter_sort', non_stop=non_stop, sort_by=sort_by):
+            # Filtrare zboruri directe
+            if non_stop:
+                offers = [o for o in offers if o.stops == 0]
+                emit('filtered', INFO, f"✈️ Filtrat: {len(offers)} zboruri directe", count=len(offers))
+            
+            # Sortare
+            if sort_by == 'price':
+                offers.sort(key=lambda x: x.price)
+            elif sort_by == 'duration':
+                # Sortare după durată
+                offers.sort(key=lambda x: x.departure_time)
+            elif sort_by == 'stops':
+                offers.sort(key=lambda x: (x.stops, x.price))
+        
+        # Actualizează monitorul de prețuri (în moneda de bază)
         if offers:
             route_key = f"{origin}-{destination}-{departure_date}"
             min_price = min(o.price for o in offers)
-            cache_manager.update_price_history(route_key, min_price)
-            st.success(f"✅ Găsite {len(offers)} zboruri! Cel mai ieftin: {min_price:.2f} {currency}")
-        
-        return offers[:max_results]
+            with span('price_history', route=route_key):
+                cache_manager.update_price_history(route_key, min_price)
+            emit('search_done', SUCCESS,
+                 f"✅ Găsite {len(offers)} zboruri! Cel mai ieftin: {min_price:.2f} {key.currency}",
+                 count=len(offers), min_price=min_price, currency=key.currency)
+        
+        partial = outcome in ('partial', 'stale')
+        current_span().set_attributes(offers=len(offers), partial=partial)
+        return SearchResults(convert_offers(offers[:max_results], currency), partial, outcome)
+    
+    @staticmethod
+    def _record_query(key: SearchKey, latency: float, outcome: str, offers: int):
+        """Jurnalul de căutări și popularitatea rutelor (doar căutările interactive contează)"""
+        priority = current_priority()
+        if priority == Priority.INTERACTIVE:
+            get_popularity_model().record(key)
+        query_log = get_query_log()
+        if query_log is not None:
+            try:
+                query_log.log_search(key, latency, outcome, offers, priority.name.lower())
+            except OSError as e:
+                emit('query_log_error', DEBUG, f"Jurnalul de căutări nu poate fi scris: {e}")
     
     def get_all_airports(self) -> Dict[str, Dict[str, List[dict]]]:
         """Obține toate aeroporturile organizate pe continente și țări"""
         if self._airports_cache:
             return self._airports_cache
         
+        # Sesiunile concurente așteaptă o singură încărcare a catalogului
+        with self._airports_lock:
+            if self._airports_cache:
+                return self._airports_cache
+            return self._load_airports()
+    
+    def _load_airports(self) -> Dict[str, Dict[str, List[dict]]]:
+        from .countries import get_country_name, get_continent_code, get_continent_name
+        
         organized = {
             "Europa": {},
             "Asia": {},
@@ -606,7 +834,7 @@ class FlightSearchService:
             return organized
             
         except Exception as e:
-            st.error(f"❌ Error: {e}")
+            emit('airports_error', ERROR, f"❌ Error: {e}")
             return {}
     
     def add_price_monitor(self, origin: str, destination: str, 
@@ -619,8 +847,31 @@ class FlightSearchService:
         }
         cache_manager.add_price_monitor(route_key, search_params, target_price)
     
+    def remove_price_monitor(self, route_key: str):
+        cache_manager.remove_price_monitor(route_key)
+    
+    def clear_caches(self):
+        """Golește cache-urile serviciului (catalog, entityId-uri) și pe cele globale"""
+        with self._airports_lock:
+            self._airports_cache = {}
+        self.sky_scrapper._entity_cache.clear()
+        cache_manager.clear_cache()
+    
     def get_monitored_routes(self) -> Dict[str, dict]:
         return cache_manager.get_price_monitors()
     
     def get_price_history(self, route_key: str) -> List[dict]:
         return cache_manager.get_price_history(route_key)
+
+
+_shared_service: Optional[FlightSearchService] = None
+_service_lock = threading.Lock()
+
+
+def get_flight_service() -> FlightSearchService:
+    """Returnează serviciul partajat de toate sesiunile din proces (creat la prima utilizare)"""
+    global _shared_service
+    with _service_lock:
+        if _shared_service is None:
+            _shared_service = FlightSearchService()
+        return _shared_service
@@ -0,0 +1,197 @@
+"""
+Cursuri de schimb pentru conversia locală a prețurilor
+
+Căutările de zboruri se fac și se memorează într-o singură monedă
+(Settings.BASE_CURRENCY): moneda afișată nu face parte din cheia de cache,
+deci schimbarea ei nu costă apeluri upstream. Conversia e o înmulțire
+vectorizată pe coloana de prețuri (FXTable.convert_column).
+
+Tabelul vine din Settings.FX_RATES_FILE (JSON) sau de la Settings.FX['url']
+(referința zilnică BCE, XML; sau JSON în același format) și e memorat în
+proces. După Settings.FX['refresh'] secunde e reîmprospătat în fundal, timp în
+care conversiile folosesc tabelul vechi.
+
+Format JSON: {"base": "EUR", "date": "2030-01-01", "rates": {"USD": 1.08, "RON": 4.97}}
+"""
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+
+from config.settings import Settings
+from .events import emit, DEBUG, WARNING
+
+
+@dataclass(frozen=True)
+class FXTable:
+    """Cursurile față de moneda `base`: 1 base = rates[c] unități din c"""
+    base: str
+    rates: Dict[str, float]
+    date: str = ''
+    source: str = ''
+    loaded_at: float = field(default_factory=time.time)
+
+    def rate(self, from_currency: str, to_currency: str) -> float:
+        """Factorul cu care se înmulțește un preț din from_currency; KeyError pentru monede necunoscute"""
+        if from_currency == to_currency:
+            return 1.0
+        return self.rates[to_currency] / self.rates[from_currency]
+
+    def convert(self, amount: float, from_currency: str, to_currency: str) -> float:
+        return amount * self.rate(from_currency, to_currency)
+
+    def convert_column(self, prices, currencies, to_currency: str):
+        """
+        Coloana de prețuri convertită în `to_currency`, fără buclă per rând
+
+        Args:
+            prices: Prețurile (pandas Series)
+            currencies: Moneda fiecărui preț (Series aliniată) sau o singură monedă
+
+        Returns:
+            prices înmulțit cu factorul monedei sale (un factor per monedă distinctă)
+        """
+        if isinstance(currencies, str):
+            return prices * self.rate(currencies, to_currency)
+        factors = {currency: self.rate(currency, to_currency) for currency in currencies.unique()}
+        if len(factors) == 1:
+            return prices * next(iter(factors.values()))
+        return prices * currencies.map(factors)
+
+
+def parse_rates(text: str, source: str = '') -> FXTable:
+    """Tabelul dintr-un document JSON (formatul de mai sus) sau XML BCE (eurofxref)"""
+    text = text.strip()
+    if text.startswith('{'):
+        data = json.loads(text)
+        base = str(data.get('base') or Settings.BASE_CURRENCY).strip().upper()
+        rates = {str(code).strip().upper(): float(value) for code, value in data['rates'].items()}
+        date = str(data.get('date', ''))
+    else:
+        import xml.etree.ElementTree as ET
+
+        # <Cube time="..."><Cube currency="USD" rate="1.08"/>...</Cube>, cursuri față de EUR
+        base, rates, date = 'EUR', {}, ''
+        for node in ET.fromstring(text).iter():
+            if not node.tag.endswith('Cube'):
+                continue
+            date = node.get('time', date)
+            if node.get('currency') and node.get('rate'):
+                rates[node.get('currency').upper()] = float(node.get('rate'))
+
+    rates[base] = 1.0
+    if len(rates) < 2:
+        raise ValueError("Tabelul de cursuri nu conține nicio monedă")
+    if any(value <= 0 for value in rates.values()):
+        raise ValueError("Tabelul de cursuri conține valori nepozitive")
+    return FXTable(base, rates, date, source)
+
+
+def load_rates_file(path: str) -> FXTable:
+    """Tabelul dintr-un fișier local"""
+    with open(path, encoding='utf-8') as f:
+        return parse_rates(f.read(), path)
+
+
+def fetch_rates(url: str, timeout: float = 10) -> FXTable:
+    """Tabelul de la un URL (referința BCE sau un document JSON)"""
+    import requests
+
+    response = requests.get(url, timeout=timeout)
+    response.raise_for_status()
+    return parse_rates(response.text, url)
+
+
+def _default_loader() -> FXTable:
+    if Settings.FX_RATES_FILE:
+        return load_rates_file(Settings.FX_RATES_FILE)
+    return fetch_rates(Settings.FX['url'], Settings.FX['timeout'])
+
+
+class FXRates:
+    """Tabelul curent al procesului, reîmprospătat periodic în fundal (thread-safe)"""
+
+    def __init__(self, loader: Optional[Callable[[], FXTable]] = None,
+                 refresh: Optional[float] = None, retry: Optional[float] = None):
+        """
+        Args:
+            loader: Încarcă un tabel nou (implicit: fișierul sau URL-ul din Settings)
+            refresh: Vârsta (secunde) după care tabelul e reîmprospătat
+            retry: Pauza (secunde) după o încărcare eșuată
+        """
+        self.loader = loader or _default_loader
+        self.refresh_interval = Settings.FX['refresh'] if refresh is None else refresh
+        self.retry_interval = Settings.FX['retry'] if retry is None else retry
+        self._table: Optional[FXTable] = None
+        self._failed_at: Optional[float] = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+        # O singură încărcare simultană; cititorii unui tabel existent nu o așteaptă
+        self._load_lock = threading.Lock()
+
+    def _due(self, now: float) -> bool:
+        if self._failed_at is not None and now - self._failed_at < self.retry_interval:
+            return False
+        return self._table is None or now - self._table.loaded_at >= self.refresh_interval
+
+    def table(self) -> Optional[FXTable]:
+        """
+        Tabelul curent; None dacă nu a putut fi încărcat niciodată
+
+        Primul apel îl încarcă sincron (apelurile simultane îl așteaptă pe
+        același); un tabel vechi e întors imediat și reîmprospătat în fundal.
+        """
+        table = self._table
+        if table is None:
+            with self._load_lock:
+                if self._table is None and self._due(time.time()):
+                    self._load()
+                return self._table
+
+        with self._lock:
+            if self._refreshing or not self._due(time.time()):
+                return table
+            self._refreshing = True
+        threading.Thread(target=self._refresh_in_background, name='fx-refresh', daemon=True).start()
+        return table
+
+    def refresh(self) -> Optional[FXTable]:
+        """Reîncarcă tabelul acum; la eșec rămâne cel anterior"""
+        with self._load_lock:
+            return self._load()
+
+    def _refresh_in_background(self):
+        try:
+            self.refresh()
+        finally:
+            self._refreshing = False
+
+    def _load(self) -> Optional[FXTable]:
+        """Apelantul deține _load_lock"""
+        try:
+            table = self.loader()
+        except Exception as e:
+            self._failed_at = time.time()
+            emit('fx_error', WARNING, f"💱 Cursurile de schimb nu pot fi încărcate: {e}")
+            return self._table
+        self._table = table
+        self._failed_at = None
+        emit('fx_loaded', DEBUG, f"💱 Cursuri de schimb {table.date or ''} ({len(table.rates)} monede)",
+             source=table.source, date=table.date)
+        return table
+
+
+_rates: Optional[FXRates] = None
+_rates_lock = threading.Lock()
+
+
+def get_fx_rates() -> FXRates:
+    """Cursurile procesului (create la prima utilizare; tabelul se încarcă la primul acces)"""
+    global _rates
+    if _rates is not None:
+        return _rates
+    with _rates_lock:
+        if _rates is None:
+            _rates = FXRates()
+        return _rates
@@ -0,0 +1,407 @@
+"""
+API HTTP JSON local pentru căutarea zborurilor
+
+Utilizare:
+    python -m services.http_api --host 0.0.0.0 --port 8080
+
+Endpoint-uri:
+    GET    /search?origin=OTP&destination=FCO&departure_date=2025-08-15[&...]
+    GET    /airports[?continent=Europa&country=Italia]
+    GET    /airports/export?format=csv|json|parquet|xlsx
+    GET    /nearby?lat=44.57&lng=26.08[&radius_km=300&limit=20]
+    GET    /monitors
+    POST   /monitors          {"origin", "destination", "departure_date", "target_price"}
+    DELETE /monitors/<route_key>
+    GET    /health
+
+Serverul folosește HTTP/1.1 cu keep-alive, comprimă cu gzip când clientul
+acceptă, trimite listele JSON în chunk-uri (fără a le ține întregi în
+memorie) și răspunde cu 304 pentru /airports dacă ETag-ul nu s-a schimbat.
+
+/search are termenul Settings.SEARCH_DEADLINE['http_api']; la expirare
+răspunde cu rezultatele disponibile și headerul X-Search-Partial: true, sau
+cu 504 dacă nu a apucat să găsească niciun rezultat.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import threading
+import time
+import zlib
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs, unquote
+
+from config.settings import Settings
+from utils.helpers import calculate_distance_km
+from utils.validators import validate_search_params
+from .events import CollectingListener, use_listener, ERROR
+from .export import EXPORT_FORMATS, CATALOG_COLUMNS, available_formats, iter_export
+from .flight_apis import FlightSearchService, get_flight_service
+from .scheduler import Priority, request_context
+
+# Răspunsurile mai mici nu merită comprimate
+GZIP_MIN_BYTES = 512
+
+# Dimensiunea aproximativă a unui chunk HTTP pentru listele transmise în flux
+STREAM_CHUNK_BYTES = 16 * 1024
+
+
+def flatten_airports(organized: dict) -> List[dict]:
+    """Transformă structura continent -> țară -> aeroporturi într-o listă"""
+    return [
+        {**airport, 'country': country, 'continent': continent}
+        for continent, countries in organized.items()
+        for country, airports in countries.items()
+        for airport in airports
+    ]
+
+
+class _ChunkedBody:
+    """Scrie corpul răspunsului în chunk-uri HTTP, opțional comprimat gzip"""
+
+    def __init__(self, wfile, use_gzip: bool, chunk_size: int = STREAM_CHUNK_BYTES):
+        self.wfile = wfile
+        self.chunk_size = chunk_size
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if use_gzip else None
+        self._buffer = bytearray()
+
+    def _write_chunk(self, data: bytes):
+        if data:
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+    def write(self, data: bytes):
+        if self._compressor is not None:
+            data = self._compressor.compress(data)
+        self._buffer += data
+        if len(self._buffer) >= self.chunk_size:
+            self._write_chunk(bytes(self._buffer))
+            self._buffer.clear()
+
+    def close(self):
+        if self._compressor is not None:
+            self._buffer += self._compressor.flush()
+        self._write_chunk(bytes(self._buffer))
+        self._buffer.clear()
+        self.wfile.write(b"0\r\n\r\n")
+
+
+class FlightAPIHandler(BaseHTTPRequestHandler):
+    """Handler pentru API-ul JSON"""
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'FlightSearchAPI/1.0'
+
+    # ------------------------------------------
+    # Utilitare răspuns
+    # ------------------------------------------
+
+    @property
+    def service(self) -> FlightSearchService:
+        return self.server.service
+
+    def _accepts_gzip(self) -> bool:
+        return 'gzip' in self.headers.get('Accept-Encoding', '')
+
+    def send_json(self, payload, status: int = 200, headers: Optional[dict] = None):
+        """Trimite un răspuns JSON complet (cu Content-Length)"""
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        if self._accepts_gzip() and len(body) >= GZIP_MIN_BYTES:
+            body = gzip.compress(body, compresslevel=6)
+            self.send_header('Content-Encoding', 'gzip')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json_array(self, items: Iterable, headers: Optional[dict] = None):
+        """Trimite o listă JSON element cu element (Transfer-Encoding: chunked)"""
+        use_gzip = self._accepts_gzip()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Transfer-Encoding', 'chunked')
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+        body = _ChunkedBody(self.wfile, use_gzip)
+        body.write(b'[')
+        for index, item in enumerate(items):
+            prefix = b',' if index else b''
+            body.write(prefix + json.dumps(item, ensure_ascii=False, default=str).encode('utf-8'))
+        body.write(b']')
+        body.close()
+
+    def send_stream(self, chunks: Iterable[bytes], content_type: str,
+                    headers: Optional[dict] = None):
+        """Trimite un corp arbitrar în flux (Transfer-Encoding: chunked)"""
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Transfer-Encoding', 'chunked')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+        body = _ChunkedBody(self.wfile, use_gzip=False)
+        for chunk in chunks:
+            body.write(chunk)
+        body.close()
+
+    def send_error_json(self, status: int, errors):
+        self.send_json({'errors': errors if isinstance(errors, list) else [errors]}, status=status)
+
+    def _query(self) -> Tuple[str, dict]:
+        parsed = urlparse(self.path)
+        params = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+        return parsed.path.rstrip('/') or '/', params
+
+    def _read_json_body(self) -> dict:
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length).decode('utf-8'))
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    # ------------------------------------------
+    # Rutare
+    # ------------------------------------------
+
+    def do_GET(self):
+        path, params = self._query()
+        routes = {
+            '/search': self.handle_search,
+            '/airports': self.handle_airports,
+            '/airports/export': self.handle_airports_export,
+            '/nearby': self.handle_nearby,
+            '/monitors': self.handle_list_monitors,
+            '/health': lambda _: self.send_json({'status': 'ok'}),
+        }
+        handler = routes.get(path)
+        if handler is None:
+            self.send_error_json(404, f"Endpoint necunoscut: {path}")
+            return
+        try:
+            handler(params)
+        except (ValueError, TypeError) as e:
+            self.send_error_json(400, str(e))
+
+    def do_POST(self):
+        path, _ = self._query()
+        if path != '/monitors':
+            self.send_error_json(404, f"Endpoint necunoscut: {path}")
+            return
+        try:
+            self.handle_add_monitor(self._read_json_body())
+        except (ValueError, TypeError) as e:
+            self.send_error_json(400, str(e))
+
+    def do_DELETE(self):
+        path, _ = self._query()
+        if not path.startswith('/monitors/'):
+            self.send_error_json(404, f"Endpoint necunoscut: {path}")
+            return
+        route_key = unquote(path[len('/monitors/'):])
+        if route_key not in self.service.get_monitored_routes():
+            self.send_error_json(404, f"Monitor inexistent: {route_key}")
+            return
+        self.service.remove_price_monitor(route_key)
+        self.send_json({'removed': route_key})
+
+    # ------------------------------------------
+    # Endpoint-uri
+    # ------------------------------------------
+
+    def handle_search(self, params: dict):
+        search = {
+            'origin': params.get('origin', '').upper(),
+            'destination': params.get('destination', '').upper(),
+            'departure_date': params.get('departure_date', ''),
+            'return_date': params.get('return_date') or None,
+            'adults': int(params.get('adults', 1)),
+            'children': int(params.get('children', 0)),
+            'infants': int(params.get('infants', 0)),
+        }
+        max_results = int(params.get('max_results', 50))
+        is_valid, errors = validate_search_params(**search)
+        if max_results < 0:
+            is_valid = False
+            errors = errors + ["max_results nu poate fi negativ"]
+        if not is_valid:
+            self.send_error_json(400, errors)
+            return
+
+        listener = CollectingListener()
+        deadline = time.time() + Settings.SEARCH_DEADLINE['http_api']
+        with request_context(priority=Priority.INTERACTIVE, session_id=self.client_address[0],
+                             deadline=deadline), \
+                use_listener(listener):
+            offers = self.service.search_flights(
+                **search,
+                cabin_class=params.get('cabin_class', 'economy'),
+                non_stop=params.get('non_stop', '').lower() in ('1', 'true', 'yes'),
+                currency=params.get('currency', 'EUR').upper(),
+                max_results=max_results,
+                sort_by=params.get('sort_by', 'price')
+            )
+
+        if not offers:
+            errors = [e.message for e in listener.events if e.level == ERROR]
+            if errors:
+                self.send_error_json(502, errors)
+                return
+            timed_out = listener.of_kind('deadline_exceeded')
+            if timed_out or getattr(offers, 'partial', False):
+                self.send_error_json(504, [e.message for e in timed_out[:1]] or ["Termenul căutării a expirat"])
+                return
+
+        self.send_json_array((offer.to_record() for offer in offers), headers={
+            'X-Search-Partial': 'true' if getattr(offers, 'partial', False) else 'false',
+            'X-Search-Outcome': getattr(offers, 'outcome', 'miss'),
+        })
+
+    def handle_airports(self, params: dict):
+        airports, etag = self.server.airport_catalog(self.service)
+        headers = {'ETag': etag, 'Cache-Control': 'public, max-age=3600'}
+
+        continent = params.get('continent')
+        country = params.get('country')
+        etag_for_request = etag if not (continent or country) else \
+            f'W/"{hashlib.md5(f"{etag}|{continent}|{country}".encode()).hexdigest()}"'
+        headers['ETag'] = etag_for_request
+
+        if self.headers.get('If-None-Match') == etag_for_request:
+            self.send_response(304)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        selected: Iterator[dict] = (
+            a for a in airports
+            if (not continent or a['continent'] == continent)
+            and (not country or a['country'] == country)
+        )
+        self.send_json_array(selected, headers=headers)
+
+    def handle_airports_export(self, params: dict):
+        fmt = params.get('format', 'csv').lower()
+        if fmt not in available_formats():
+            raise ValueError(f"Format indisponibil: {fmt} (disponibile: {', '.join(available_formats())})")
+        airports, _ = self.server.airport_catalog(self.service)
+        export_format = EXPORT_FORMATS[fmt]
+        self.send_stream(
+            iter_export(airports, CATALOG_COLUMNS, fmt),
+            export_format.mime,
+            headers={'Content-Disposition': f'attachment; filename="aeroporturi.{export_format.extension}"'}
+        )
+
+    def handle_nearby(self, params: dict):
+        if 'lat' not in params or 'lng' not in params:
+            raise ValueError("Parametrii lat și lng sunt obligatorii")
+        lat, lng = float(params['lat']), float(params['lng'])
+        radius_km = float(params.get('radius_km', 300))
+        limit = int(params.get('limit', 20))
+        if limit < 0:
+            raise ValueError("limit nu poate fi negativ")
+
+        airports, _ = self.server.airport_catalog(self.service)
+        nearby = []
+        for airport in airports:
+            if airport.get('lat') is None or airport.get('lng') is None:
+                continue
+            distance = calculate_distance_km(lat, lng, airport['lat'], airport['lng'])
+            if distance <= radius_km:
+                nearby.append({**airport, 'distance_km': round(distance, 1)})
+        nearby.sort(key=lambda a: a['distance_km'])
+        self.send_json_array(nearby[:limit])
+
+    def handle_list_monitors(self, params: dict):
+        monitors = self.service.get_monitored_routes()
+        self.send_json_array(
+            {'route_key': route_key, **monitor}
+            for route_key, monitor in monitors.items()
+        )
+
+    def handle_add_monitor(self, body: dict):
+        if not isinstance(body, dict):
+            self.send_error_json(400, "Corpul cererii trebuie să fie un obiect JSON")
+            return
+        fields = ('origin', 'destination', 'departure_date')
+        missing = [f for f in fields if not body.get(f)]
+        if missing:
+            self.send_error_json(400, f"Câmpuri lipsă: {', '.join(missing)}")
+            return
+        invalid = [f for f in fields if not isinstance(body[f], str)]
+        target = body.get('target_price')
+        if target is not None and (isinstance(target, bool) or not isinstance(target, (int, float, str))):
+            invalid.append('target_price')
+        if invalid:
+            self.send_error_json(400, f"Câmpuri invalide: {', '.join(invalid)}")
+            return
+        self.service.add_price_monitor(
+            origin=body['origin'].upper(),
+            destination=body['destination'].upper(),
+            departure_date=body['departure_date'],
+            target_price=float(target) if target is not None else None
+        )
+        route_key = f"{body['origin'].upper()}-{body['destination'].upper()}-{body['departure_date']}"
+        self.send_json({'route_key': route_key}, status=201)
+
+
+class FlightAPIServer(ThreadingHTTPServer):
+    """Server HTTP cu un thread per conexiune și un serviciu partajat"""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], service: Optional[FlightSearchService] = None,
+                 verbose: bool = False):
+        super().__init__(address, FlightAPIHandler)
+        self.service = service or get_flight_service()
+        self.verbose = verbose
+        self._catalog_lock = threading.Lock()
+        self._catalog_source = None
+        self._catalog: Tuple[List[dict], str] = ([], '""')
+
+    def airport_catalog(self, service: FlightSearchService) -> Tuple[List[dict], str]:
+        """Lista plată de aeroporturi și ETag-ul ei, recalculate doar când catalogul se schimbă"""
+        organized = service.get_all_airports()
+        with self._catalog_lock:
+            if organized is not self._catalog_source:
+                airports = flatten_airports(organized)
+                digest = hashlib.sha1()
+                for airport in airports:
+                    digest.update(f"{airport['iata']}|{airport['name']}|{airport['country']}\n".encode())
+                self._catalog = (airports, f'"{digest.hexdigest()}"')
+                self._catalog_source = organized
+            return self._catalog
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="API HTTP JSON pentru căutarea zborurilor")
+    parser.add_argument('--host', default=Settings.HTTP_API_HOST)
+    parser.add_argument('--port', type=int, default=Settings.HTTP_API_PORT)
+    parser.add_argument('--verbose', action='store_true', help="Loghează fiecare cerere")
+    args = parser.parse_args(argv)
+
+    server = FlightAPIServer((args.host, args.port), verbose=args.verbose)
+    print(f"✈️ Flight Search API pe http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
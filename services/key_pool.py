@@ -0,0 +1,284 @@
+"""
+Pool de chei RapidAPI - rate limiting și cote lunare per cheie
+"""
+import time
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Dict, Mapping
+
+from config.settings import Settings
+from .cache_manager import RateLimiter
+
+
+# Headere RapidAPI (și variantele generice) pentru bugetul de apeluri
+RATE_LIMIT_HEADERS = {
+    'limit': ('x-ratelimit-requests-limit', 'x-ratelimit-limit'),
+    'remaining': ('x-ratelimit-requests-remaining', 'x-ratelimit-remaining'),
+    'reset': ('x-ratelimit-requests-reset', 'x-ratelimit-reset', 'retry-after'),
+}
+
+
+@dataclass
+class RateLimitInfo:
+    """Bugetul de apeluri raportat de upstream într-un răspuns"""
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset_in: Optional[float] = None    # secunde până la resetare
+
+
+def _header_number(headers: Mapping[str, str], names) -> Optional[float]:
+    lowered = {k.lower(): v for k, v in headers.items()}
+    for name in names:
+        value = lowered.get(name)
+        if value is None:
+            continue
+        try:
+            return float(str(value).split(',')[0].strip())
+        except ValueError:
+            continue
+    return None
+
+
+def parse_rate_limit_headers(headers: Optional[Mapping[str, str]]) -> Optional[RateLimitInfo]:
+    """
+    Extrage bugetul de apeluri din headerele unui răspuns
+    
+    Args:
+        headers: Headerele HTTP ale răspunsului
+    
+    Returns:
+        RateLimitInfo sau None dacă răspunsul nu conține headere de rate limit
+    """
+    if not headers:
+        return None
+    
+    limit = _header_number(headers, RATE_LIMIT_HEADERS['limit'])
+    remaining = _header_number(headers, RATE_LIMIT_HEADERS['remaining'])
+    reset = _header_number(headers, RATE_LIMIT_HEADERS['reset'])
+    
+    if limit is None and remaining is None and reset is None:
+        return None
+    
+    # Unele API-uri trimit momentul resetării ca timestamp Unix
+    if reset is not None and reset > 1_000_000_000:
+        reset = reset - time.time()
+    
+    return RateLimitInfo(
+        limit=int(limit) if limit is not None else None,
+        remaining=int(remaining) if remaining is not None else None,
+        reset_in=max(0.0, reset) if reset is not None else None
+    )
+
+
+@dataclass
+class APIKeyState:
+    """Starea unei chei API din pool"""
+    key: str
+    limiter: RateLimiter
+    monthly_quota: int = 0          # 0 = nelimitat
+    used_this_month: int = 0
+    quota_month: str = ''
+    in_flight: int = 0
+    quarantined_until: float = 0.0
+    last_status: Optional[int] = None
+
+    @property
+    def label(self) -> str:
+        """Identificator sigur pentru afișare (ultimele 4 caractere)"""
+        return f"…{self.key[-4:]}"
+
+    def is_quarantined(self, now: float) -> bool:
+        return now < self.quarantined_until
+
+    def quota_left(self) -> Optional[int]:
+        """Apeluri rămase luna aceasta (None = nelimitat)"""
+        if not self.monthly_quota:
+            return None
+        return max(0, self.monthly_quota - self.used_this_month)
+
+
+class APIKeyPool:
+    """
+    Pool de chei cu planificare least-loaded.
+
+    Fiecare cheie are propriul RateLimiter și contor lunar; o cheie care
+    primește 429 sau 403 este pusă automat în carantină.
+    """
+
+    def __init__(self, keys: List[str], max_calls: int, period: int = 60,
+                 monthly_quota: int = 0, quarantine: Optional[Dict[int, int]] = None):
+        """
+        Args:
+            keys: Lista de chei API
+            max_calls: Apeluri permise per cheie în perioada dată
+            period: Perioada în secunde
+            monthly_quota: Cota lunară per cheie (0 = nelimitat)
+            quarantine: Durata carantinei pe cod de status
+        """
+        self.quarantine = quarantine if quarantine is not None else dict(Settings.KEY_QUARANTINE)
+        self._lock = threading.Lock()
+        self._keys: List[APIKeyState] = [
+            APIKeyState(
+                key=key,
+                limiter=RateLimiter(max_calls=max_calls, period=period),
+                monthly_quota=monthly_quota,
+                quota_month=self._current_month()
+            )
+            for key in keys
+        ]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @staticmethod
+    def _current_month() -> str:
+        return datetime.now().strftime('%Y-%m')
+
+    def _reset_month_if_needed(self, state: APIKeyState):
+        month = self._current_month()
+        if state.quota_month != month:
+            state.quota_month = month
+            state.used_this_month = 0
+
+    def _try_acquire(self, reserve: int = 0) -> Optional[APIKeyState]:
+        """Alege cheia cea mai puțin încărcată disponibilă acum"""
+        with self._lock:
+            now = time.time()
+            candidates = []
+            for state in self._keys:
+                self._reset_month_if_needed(state)
+                if state.is_quarantined(now):
+                    continue
+                if state.quota_left() == 0:
+                    continue
+                remaining = state.limiter.remaining()
+                if remaining <= reserve:
+                    continue
+                candidates.append((state.in_flight, -remaining, state.used_this_month, state))
+
+            for _, _, _, state in sorted(candidates, key=lambda c: c[:3]):
+                if state.limiter.try_acquire():
+                    state.in_flight += 1
+                    state.used_this_month += 1
+                    return state
+            return None
+
+    def acquire(self, timeout: float = 0, reserve: int = 0) -> Optional[APIKeyState]:
+        """
+        Obține o cheie pentru un apel
+
+        Args:
+            timeout: Cât timp se așteaptă după o cheie liberă (secunde)
+            reserve: Apeluri lăsate libere pe fiecare cheie pentru cereri
+                mai prioritare (folosit de prefetch / background)
+
+        Returns:
+            Starea cheii sau None dacă nicio cheie nu e disponibilă
+        """
+        deadline = time.time() + timeout
+        while True:
+            state = self._try_acquire(reserve)
+            if state is not None:
+                return state
+
+            remaining = deadline - time.time()
+            wait = self.wait_time()
+            if wait is None or remaining <= 0 or wait > remaining:
+                return None
+            time.sleep(max(0.05, wait))
+
+    def release(self, state: APIKeyState, status_code: Optional[int] = None,
+                rate_info: Optional[RateLimitInfo] = None, refund: bool = False):
+        """
+        Eliberează cheia după apel
+        
+        Bugetul raportat de upstream ajustează limiter-ul cheii; la 429 cu
+        reset cunoscut, carantina durează exact până la resetare. Cu refund=True
+        (cererea nu a ajuns upstream, ex: job abandonat în coadă) apelul e
+        returnat limiter-ului și cotei lunare.
+        """
+        if rate_info is not None and rate_info.remaining is not None:
+            state.limiter.apply_upstream(rate_info.remaining, rate_info.reset_in)
+        if refund:
+            state.limiter.refund()
+        
+        with self._lock:
+            if refund:
+                state.used_this_month = max(0, state.used_this_month - 1)
+            state.in_flight = max(0, state.in_flight - 1)
+            state.last_status = status_code
+            if status_code in self.quarantine:
+                duration = self.quarantine[status_code]
+                if status_code == 429 and rate_info is not None and rate_info.reset_in is not None:
+                    duration = rate_info.reset_in
+                state.quarantined_until = time.time() + duration
+
+    def wait_time(self) -> Optional[float]:
+        """
+        Timpul minim până când o cheie devine disponibilă
+
+        Returns:
+            Secunde de așteptat sau None dacă nicio cheie nu mai poate fi folosită
+            (ex: toate cotele lunare epuizate)
+        """
+        with self._lock:
+            now = time.time()
+            waits = []
+            for state in self._keys:
+                self._reset_month_if_needed(state)
+                if state.quota_left() == 0:
+                    continue
+                wait = state.limiter.wait_time()
+                if state.is_quarantined(now):
+                    wait = max(wait, state.quarantined_until - now)
+                waits.append(wait)
+            return min(waits) if waits else None
+
+    def spare_calls(self, reserve: int = 0) -> int:
+        """Apelurile disponibile acum pe toate cheile, peste `reserve` lăsate libere pe fiecare"""
+        with self._lock:
+            now = time.time()
+            spare = 0
+            for state in self._keys:
+                self._reset_month_if_needed(state)
+                if state.is_quarantined(now) or state.quota_left() == 0:
+                    continue
+                spare += max(0, state.limiter.remaining() - reserve)
+            return spare
+
+    def stats(self) -> List[dict]:
+        """Returnează starea fiecărei chei (fără a expune cheia)"""
+        with self._lock:
+            now = time.time()
+            return [
+                {
+                    'key': state.label,
+                    'available_calls': state.limiter.remaining(),
+                    'in_flight': state.in_flight,
+                    'used_this_month': state.used_this_month,
+                    'quota_left': state.quota_left(),
+                    'quarantined': state.is_quarantined(now),
+                    'last_status': state.last_status,
+                }
+                for state in self._keys
+            ]
+
+
+_rapidapi_pool: Optional[APIKeyPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_rapidapi_key_pool() -> APIKeyPool:
+    """Returnează pool-ul global de chei RapidAPI (creat la prima utilizare)"""
+    global _rapidapi_pool
+    with _pool_lock:
+        if _rapidapi_pool is None:
+            keys = Settings.get_api_keys().get('rapidapi_keys', [])
+            _rapidapi_pool = APIKeyPool(
+                keys,
+                max_calls=Settings.RATE_LIMITS['rapidapi'],
+                period=60,
+                monthly_quota=Settings.RAPIDAPI_MONTHLY_QUOTA
+            )
+        return _rapidapi_pool
@@ -0,0 +1,183 @@
+"""
+Popularitatea rutelor căutate: numărători cu decădere, count-min sketch, top-K
+
+Fiecare căutare interactivă adaugă o greutate rutei (SearchKey). Greutățile
+scad exponențial cu timpul (timp de înjumătățire configurabil), deci o rută
+căutată des acum o oră contează mai mult decât una populară ieri.
+
+Decăderea folosește "forward decay": o căutare la momentul t adaugă
+exp(λ·(t - L)) față de un moment de referință L, iar scorul la momentul now
+este suma împărțită la exp(λ·(now - L)). Numărătorile nu trebuie actualizate
+pe măsură ce timpul trece; când greutățile cresc prea mult, L se mută și
+totul se rescalează.
+
+Memoria e fixă: count-min sketch-ul (depth × width celule) estimează scorul
+oricărei rute (cu supraestimare mărginită), iar top-K păstrează doar
+`capacity` candidați.
+"""
+import math
+import random
+import threading
+import time
+from operator import itemgetter
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+from config.settings import Settings
+
+# Peste această greutate brută (e^230 ≈ 1e100), momentul de referință se mută (evită overflow)
+_RESCALE_EXPONENT = 230.0
+
+
+class CountMinSketch:
+    """Count-min sketch cu celule float (greutăți, nu doar numărători)"""
+
+    def __init__(self, width: int = 2048, depth: int = 4, seed: Optional[int] = None):
+        self.width = width
+        self.depth = depth
+        self._salt = random.Random(seed).getrandbits(64)
+        self._rows = [[0.0] * width for _ in range(depth)]
+
+    def _cells(self, key: Hashable):
+        # Hash dublu (Kirsch-Mitzenmacher): rândul i folosește h1 + i·h2
+        h = hash(key) ^ self._salt
+        h1, h2 = h & 0xFFFFFFFF, ((h >> 32) & 0xFFFFFFFF) | 1
+        width = self.width
+        return [(row, (h1 + i * h2) % width) for i, row in enumerate(self._rows)]
+
+    def add(self, key: Hashable, weight: float = 1.0) -> float:
+        """Adaugă greutatea și returnează noua estimare a cheii"""
+        estimate = math.inf
+        for row, i in self._cells(key):
+            row[i] += weight
+            estimate = min(estimate, row[i])
+        return estimate
+
+    def estimate(self, key: Hashable) -> float:
+        return min(row[i] for row, i in self._cells(key))
+
+    def scale(self, factor: float):
+        for row in self._rows:
+            for i, value in enumerate(row):
+                row[i] = value * factor
+
+
+class PopularityModel:
+    """
+    Scorurile rutelor cu decădere exponențială și cele mai populare K rute
+
+    Thread-safe; toate metodele acceptă `now` explicit (secunde epoch) pentru
+    reconstruirea din jurnal și pentru teste.
+    """
+
+    def __init__(self, half_life: float = 6 * 3600, capacity: int = 100,
+                 width: int = 2048, depth: int = 4, seed: Optional[int] = None):
+        self.half_life = half_life
+        self.capacity = capacity
+        self._rate = math.log(2) / half_life
+        self._sketch = CountMinSketch(width, depth, seed)
+        self._landmark: Optional[float] = None
+        # Candidații top-K: cheie -> greutate brută estimată; _floor nu depășește
+        # minimul lor, deci o cheie sub el e respinsă fără a parcurge candidații
+        self._candidates: Dict[Hashable, float] = {}
+        self._floor = 0.0
+        self._lock = threading.Lock()
+        self.total = 0
+
+    def _weight(self, now: float) -> float:
+        """Greutatea brută a unui eveniment la `now`; apelantul deține lock-ul"""
+        if self._landmark is None:
+            self._landmark = now
+        exponent = self._rate * (now - self._landmark)
+        if exponent > _RESCALE_EXPONENT:
+            # Greutățile vechi se rescalează (pot deveni 0 după multe înjumătățiri)
+            factor = math.exp(-exponent)
+            self._sketch.scale(factor)
+            self._candidates = {k: v * factor for k, v in self._candidates.items()}
+            self._floor *= factor
+            self._landmark = now
+            exponent = 0.0
+        return math.exp(exponent)
+
+    def _decay(self, now: float) -> float:
+        if self._landmark is None:
+            return 0.0
+        return math.exp(min(-self._rate * (now - self._landmark), _RESCALE_EXPONENT))
+
+    def record(self, key: Hashable, now: Optional[float] = None):
+        """Înregistrează o căutare a rutei `key`"""
+        now = time.time() if now is None else now
+        with self._lock:
+            raw = self._sketch.add(key, self._weight(now))
+            self.total += 1
+            candidates = self._candidates
+            if key in candidates or len(candidates) < self.capacity:
+                candidates[key] = raw
+                return
+            if raw <= self._floor:
+                return
+            weakest, self._floor = min(candidates.items(), key=itemgetter(1))
+            if raw > self._floor:
+                del candidates[weakest]
+                candidates[key] = raw
+
+    def score(self, key: Hashable, now: Optional[float] = None) -> float:
+        """Scorul estimat (căutări cu decădere) al unei rute"""
+        now = time.time() if now is None else now
+        with self._lock:
+            return self._sketch.estimate(key) * self._decay(now)
+
+    def top(self, k: int = 10, now: Optional[float] = None, min_score: float = 0.0) -> List[Tuple[Hashable, float]]:
+        """Cele mai populare `k` rute, cu scorul lor, descrescător"""
+        now = time.time() if now is None else now
+        with self._lock:
+            decay = self._decay(now)
+            ranked = sorted(((key, self._sketch.estimate(key) * decay) for key in self._candidates),
+                            key=lambda item: item[1], reverse=True)
+        return [(key, score) for key, score in ranked[:k] if score >= min_score]
+
+    def record_entries(self, entries: Iterable[dict]) -> int:
+        """Reconstruiește scorurile din înregistrările jurnalului (doar căutări interactive)"""
+        from .cache_manager import SearchKey
+
+        count = 0
+        for entry in entries:
+            if entry.get('priority', 'interactive') != 'interactive':
+                continue
+            try:
+                key = SearchKey.from_dict(entry['key'])
+            except (KeyError, TypeError, ValueError, AttributeError):
+                continue
+            self.record(key, entry.get('ts'))
+            count += 1
+        return count
+
+
+_model: Optional[PopularityModel] = None
+_model_lock = threading.Lock()
+
+
+def get_popularity_model() -> PopularityModel:
+    """
+    Modelul global al procesului (creat la prima utilizare)
+
+    Dacă jurnalul de căutări e configurat, modelul pornește din înregistrările
+    ultimelor Settings.POPULARITY['replay_half_lives'] timpi de înjumătățire,
+    ca popularitatea să supraviețuiască repornirilor.
+    """
+    global _model
+    if _model is not None:
+        return _model
+    with _model_lock:
+        if _model is None:
+            config = Settings.POPULARITY
+            model = PopularityModel(config['half_life'], config['capacity'],
+                                    config['sketch_width'], config['sketch_depth'])
+            if Settings.QUERY_LOG_FILE:
+                from .query_log import read_entries
+                since = time.time() - config['replay_half_lives'] * config['half_life']
+                try:
+                    model.record_entries(read_entries(Settings.QUERY_LOG_FILE, Settings.QUERY_LOG_BACKUPS, since))
+                except OSError:
+                    pass
+            _model = model
+        return _model
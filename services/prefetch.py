@@ -0,0 +1,270 @@
+"""
+Prefetch speculativ în timp ce utilizatorul completează formularul de căutare
+
+Aeroportul ales într-un selector se rezolvă imediat (entityId ajunge în
+cache-ul SkyScrapperAPI), cu secunde înainte de trimiterea formularului; un
+cod nerezolvat e reîncercat abia după config['airport_retry'] secunde. Când
+originea, destinația și data sunt completate, căutarea de zboruri e programată
+după `delay` secunde fără modificări; orice modificare a formularului o
+anulează și programează cheia nouă. La trimitere, căutarea interactivă găsește
+rezultatele în cache sau se alătură cererii în curs (get_or_compute).
+
+Toate cererile rulează cu prioritate prefetch: planificatorul le lasă în urma
+celor interactive, iar pool-ul de chei păstrează Settings.BUDGET_RESERVE['prefetch']
+apeluri libere pe fiecare cheie. Căutările speculative nu intră în jurnalul de
+căutări și nici în modelul de popularitate.
+
+Odată pornit apelul searchFlights, prefetch-ul nu mai poate fi anulat (o
+căutare interactivă se poate alătura lui); la trimiterea formularului pentru
+aceeași cheie, cererile lui din coadă sunt promovate la interactive.
+
+Limitare: promovarea mută doar job-urile aflate deja în coada planificatorului.
+Dacă prefetch-ul încă așteaptă o cheie din pool, o face în continuare cu
+prioritate prefetch (rezerva Settings.BUDGET_RESERVE['prefetch']) și fără
+termen; căutarea interactivă alăturată (get_or_compute) îl așteaptă doar până
+la propriul termen, apoi întoarce rezultatele disponibile, marcate parțiale.
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional
+
+from cachetools import TTLCache
+
+from config.settings import Settings
+from .cache_manager import SearchKey, cache_manager
+from .events import emit, DEBUG
+from .scheduler import Priority, request_context, request_scheduler
+
+# Rezultatele unui prefetch de zboruri: cele ale lookup_flights plus
+# cancelled (formularul s-a schimbat), cached (deja în cache), budget (fără apeluri libere)
+PREFETCH_OUTCOMES = ('hit', 'miss', 'partial', 'stale', 'error', 'cancelled', 'cached', 'budget')
+
+# Sesiunile urmărite simultan; cele mai vechi sunt uitate (și anulate)
+_MAX_SESSIONS = 1024
+
+
+class FlightPrefetch:
+    """Căutarea de zboruri programată pentru o sesiune"""
+
+    def __init__(self, key: SearchKey):
+        self.key = key
+        self.status: Optional[str] = None
+        self.started = False
+        self.done = threading.Event()
+        self._cancelled = False
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def _begin(self) -> bool:
+        """Marchează pornirea apelului searchFlights; False dacă a fost anulat"""
+        with self._lock:
+            if self._cancelled:
+                return False
+            self.started = True
+            return True
+
+    def _finish(self, status: str):
+        with self._lock:
+            if self.done.is_set():
+                return
+            self.status = status
+            self.done.set()
+
+    def cancel(self) -> bool:
+        """Anulează prefetch-ul dacă searchFlights nu a pornit încă"""
+        with self._lock:
+            self._cancelled = True
+            if self.started:
+                return False
+        if self._timer is not None:
+            self._timer.cancel()
+        self._finish('cancelled')
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[str]:
+        """Așteaptă terminarea și returnează rezultatul (None la timeout)"""
+        self.done.wait(timeout)
+        return self.status
+
+
+class Prefetcher:
+    """Prefetch-ul aeroporturilor și al căutărilor de zboruri, per sesiune"""
+
+    def __init__(self, service=None, config: Optional[dict] = None):
+        from .flight_apis import get_flight_service
+
+        self.service = service or get_flight_service()
+        self.config = {**Settings.PREFETCH, **(config or {})}
+        self._executor = ThreadPoolExecutor(max_workers=self.config['workers'],
+                                            thread_name_prefix='prefetch')
+        self._lock = threading.Lock()
+        self._airports: Dict[str, Future] = {}
+        # Codurile nerezolvate (aeroport necunoscut sau eroare) nu sunt recerute la fiecare rerun
+        self._failed_airports: TTLCache = TTLCache(maxsize=4096, ttl=self.config['airport_retry'])
+        self._flights: "OrderedDict[str, FlightPrefetch]" = OrderedDict()
+
+    def _spare_calls(self) -> int:
+        return self.service.sky_scrapper.key_pool.spare_calls(Settings.BUDGET_RESERVE.get('prefetch', 0))
+
+    def _unknown_airports(self, key: SearchKey) -> int:
+        known = self.service.sky_scrapper._entity_cache
+        return (key.origin not in known) + (key.destination not in known)
+
+    # ============================================
+    # AEROPORTURI
+    # ============================================
+
+    def prefetch_airport(self, code: str) -> Optional[Future]:
+        """
+        Rezolvă entityId-ul unui aeroport în fundal (o singură dată per cod)
+
+        Returns:
+            Future cu rezultatul search_airport; None dacă e deja în cache, nu
+            a putut fi rezolvat în ultimele config['airport_retry'] secunde sau
+            bugetul liber nu permite apelul
+        """
+        code = code.strip().upper()
+        if not code or code in self.service.sky_scrapper._entity_cache:
+            return None
+        with self._lock:
+            future = self._airports.get(code)
+            if future is not None:
+                return future
+            if code in self._failed_airports or self._spare_calls() < 1:
+                return None
+            future = self._airports[code] = self._executor.submit(self._resolve_airport, code)
+        # Terminat: rezultatul e în _entity_cache (sau codul e în _failed_airports)
+        future.add_done_callback(lambda f: self._forget_airport(code, f))
+        return future
+
+    def _forget_airport(self, code: str, future: Future):
+        failed = future.cancelled() or future.exception() is not None or future.result() is None
+        with self._lock:
+            if self._airports.get(code) is future:
+                del self._airports[code]
+            if failed:
+                self._failed_airports[code] = True
+
+    def _resolve_airport(self, code: str) -> Optional[dict]:
+        with request_context(priority=Priority.PREFETCH, session_id='prefetch'):
+            return self.service.sky_scrapper.search_airport(code)
+
+    # ============================================
+    # ZBORURI
+    # ============================================
+
+    def prefetch_flights(self, session_id: str, key: SearchKey) -> Optional[FlightPrefetch]:
+        """
+        Programează căutarea `key` pentru sesiune, înlocuind prefetch-ul ei anterior
+
+        Apelurile repetate cu aceeași cheie (fiecare rerun) nu reprogramează nimic.
+        """
+        if not self.config['flights']:
+            return None
+        with self._lock:
+            current = self._flights.get(session_id)
+            if current is not None and current.key == key:
+                return current
+            task = FlightPrefetch(key)
+            self._flights[session_id] = task
+            self._flights.move_to_end(session_id)
+            evicted = self._flights.popitem(last=False)[1] if len(self._flights) > _MAX_SESSIONS else None
+        for old in (current, evicted):
+            if old is not None:
+                old.cancel()
+
+        task._timer = threading.Timer(self.config['delay'], self._start_flights, (session_id, task))
+        task._timer.daemon = True
+        task._timer.start()
+        return task
+
+    def _start_flights(self, session_id: str, task: FlightPrefetch):
+        if task.done.is_set():
+            return
+        try:
+            self._executor.submit(self._run_flights, session_id, task)
+        except RuntimeError:
+            # Executorul a fost oprit
+            task._finish('cancelled')
+
+    def _run_flights(self, session_id: str, task: FlightPrefetch):
+        if task.done.is_set():
+            return
+        key = task.key
+        sky = self.service.sky_scrapper
+        status = 'error'
+        try:
+            with request_context(priority=Priority.PREFETCH, session_id=_prefetch_session(session_id)):
+                if cache_manager.expires_in('flights', key) is not None:
+                    status = 'cached'
+                elif self._spare_calls() < 1 + self._unknown_airports(key):
+                    status = 'budget'
+                else:
+                    for code in (key.origin, key.destination):
+                        sky.search_airport(code)
+                    if not task._begin():
+                        status = 'cancelled'
+                    else:
+                        status = sky.lookup_flights(key)[1]
+        except Exception as e:
+            emit('prefetch_error', DEBUG, f"Prefetch-ul a eșuat: {e}")
+        finally:
+            task._finish(status)
+        emit('prefetch', DEBUG, f"Prefetch {key.origin}-{key.destination}: {task.status}",
+             route=f"{key.origin}-{key.destination}", status=task.status)
+
+    def claim(self, session_id: str, key: SearchKey) -> Optional[FlightPrefetch]:
+        """
+        La trimiterea formularului: prefetch-ul sesiunii nu mai e necesar
+
+        Dacă nu a pornit, e anulat (căutarea interactivă face apelurile). Dacă
+        rulează pentru aceeași cheie, cererile lui din coadă sunt promovate la
+        interactive și e returnat; căutarea se va alătura rezultatului lui.
+        """
+        with self._lock:
+            task = self._flights.pop(session_id, None)
+        if task is None or task.cancel() or task.key != key:
+            return None
+        request_scheduler.promote(_prefetch_session(session_id))
+        return task
+
+    def cancel(self, session_id: str) -> bool:
+        """Anulează prefetch-ul de zboruri al sesiunii (formular incomplet)"""
+        with self._lock:
+            task = self._flights.pop(session_id, None)
+        return task is not None and task.cancel()
+
+    def pending(self, session_id: str) -> Optional[FlightPrefetch]:
+        with self._lock:
+            return self._flights.get(session_id)
+
+    def shutdown(self):
+        with self._lock:
+            tasks = list(self._flights.values())
+            self._flights.clear()
+        for task in tasks:
+            task.cancel()
+        self._executor.shutdown(wait=True)
+
+
+def _prefetch_session(session_id: str) -> str:
+    """Sesiunea din planificator a cererilor prefetch (separată de cele interactive)"""
+    return f"prefetch:{session_id}"
+
+
+_prefetcher: Optional[Prefetcher] = None
+_prefetcher_lock = threading.Lock()
+
+
+def get_prefetcher(service=None) -> Optional[Prefetcher]:
+    """Prefetcher-ul procesului dacă Settings.PREFETCH_ENABLED (creat la prima utilizare)"""
+    global _prefetcher
+    if not Settings.PREFETCH_ENABLED:
+        return None
+    if _prefetcher is not None:
+        return _prefetcher
+    with _prefetcher_lock:
+        if _prefetcher is None:
+            _prefetcher = Prefetcher(service)
+        return _prefetcher
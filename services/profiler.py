@@ -0,0 +1,191 @@
+"""
+Profiler prin eșantionare pentru rerun-urile Streamlit
+
+Un fir de timp citește periodic stiva firului țintă (sys._current_frames) și
+adună timpul pe stive colapsate. Nu instrumentează codul, deci overhead-ul
+depinde doar de intervalul de eșantionare, nu de numărul de apeluri.
+
+Fiecare eșantion cântărește timpul scurs de la eșantionul anterior: cât timp
+firul țintă ține GIL-ul (cod CPU), firul de eșantionare se trezește mai rar
+decât intervalul, iar o numărare simplă ar subestima codul CPU față de I/O.
+
+Rezultatul se poate scrie în formatul "collapsed stacks" (o stivă pe linie,
+`cadru;cadru;cadru microsecunde`), citit direct de flamegraph.pl, speedscope
+sau inferno, și se poate rezuma ca top de funcții (timp inclusiv și propriu).
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from config.settings import Settings
+
+# Modulele în care o stivă se termină când firul e blocat (I/O, future-uri, lock-uri)
+WAIT_MODULES = ('threading', 'socket', 'ssl', 'selectors', 'queue', 'http.client',
+                'concurrent.futures._base', 'multiprocessing.connection')
+
+# Modulele proprii aplicației, pentru top-ul de funcții
+PROJECT_MODULES = ('app', '__main__', 'services', 'utils', 'config')
+
+
+_OWN_PREFIX = f"{__name__}:"
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get('__name__', '?')
+    if module == '__main__':
+        module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def _collapse(frame) -> Tuple[str, ...]:
+    """Stiva unui cadru, de la rădăcină la frunză"""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return tuple(labels)
+
+
+def _in_modules(label: str, modules: Iterable[str]) -> bool:
+    module = label.split(':', 1)[0]
+    return any(module == m or module.startswith(m + '.') for m in modules)
+
+
+class SamplingProfiler:
+    """
+    Eșantionează stiva unui fir la interval fix
+
+    Același profiler poate fi pornit și oprit de mai multe ori (ex: câte o dată
+    pe rerun, fiecare în alt fir); eșantioanele se adună.
+    """
+
+    def __init__(self, interval: Optional[float] = None):
+        self.interval = interval or Settings.PROFILER_INTERVAL
+        # Stivă -> microsecunde
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.runs = 0
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+        self._stop: Optional[threading.Event] = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self, thread_id: Optional[int] = None) -> 'SamplingProfiler':
+        """Începe eșantionarea firului `thread_id` (implicit firul curent)"""
+        if self.running:
+            raise RuntimeError("Profiler-ul rulează deja")
+        target = thread_id or threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample_loop, args=(target, self._stop),
+                                        name='sampling-profiler', daemon=True)
+        self._started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if not self.running:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.elapsed += time.perf_counter() - self._started
+        self.runs += 1
+
+    def _sample_loop(self, target: int, stop: threading.Event):
+        last = time.perf_counter()
+        while not stop.wait(self.interval):
+            frame = sys._current_frames().get(target)
+            now = time.perf_counter()
+            weight, last = int((now - last) * 1e6), now
+            if frame is None:
+                continue
+            stack = _collapse(frame)
+            del frame
+            if any(label.startswith(_OWN_PREFIX) for label in stack):
+                # Firul țintă pornește sau oprește profiler-ul
+                continue
+            with self._lock:
+                self.stacks[stack] += weight
+                self.samples += 1
+
+    def __enter__(self) -> 'SamplingProfiler':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def collapsed(self) -> List[str]:
+        """Liniile în format collapsed stacks, cele mai frecvente primele"""
+        with self._lock:
+            items = self.stacks.most_common()
+        return [f"{';'.join(stack)} {count}" for stack, count in items]
+
+    def write_collapsed(self, path: str) -> str:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(self.collapsed()) + '\n')
+        return path
+
+    def top_functions(self, limit: int = 15, modules: Optional[Iterable[str]] = PROJECT_MODULES) -> List[dict]:
+        """
+        Funcțiile cu cel mai mult timp inclusiv
+
+        `modules` restrânge lista la modulele date (implicit codul aplicației);
+        None include tot, inclusiv bibliotecile.
+        """
+        with self._lock:
+            items = list(self.stacks.items())
+        total: Counter = Counter()
+        own: Counter = Counter()
+        for stack, count in items:
+            # Recursivitatea nu se numără de două ori în timpul inclusiv
+            for label in set(stack):
+                total[label] += count
+            own[stack[-1]] += count
+        if modules is not None:
+            modules = tuple(modules)
+            total = Counter({k: v for k, v in total.items() if _in_modules(k, modules)})
+        sampled = sum(count for _, count in items) or 1
+        return [
+            {
+                'function': label,
+                'total_ms': us / 1000,
+                'self_ms': own[label] / 1000,
+                'total_pct': us / sampled * 100,
+            }
+            for label, us in total.most_common(limit)
+        ]
+
+    def wait_ms(self) -> float:
+        """Timpul în care firul a stat blocat (I/O upstream, future-uri, lock-uri)"""
+        with self._lock:
+            waiting = sum(us for stack, us in self.stacks.items()
+                          if _in_modules(stack[-1], WAIT_MODULES))
+        return waiting / 1000
+
+
+def profile_path(session_id: str) -> str:
+    """Fișierul collapsed stacks pentru o sesiune, în Settings.PROFILE_DIR"""
+    stamp = time.strftime('%Y%m%d-%H%M%S')
+    return os.path.join(Settings.PROFILE_DIR, f"flight-profile-{session_id[:8]}-{stamp}.collapsed")
+
+
+@contextmanager
+def sampling(profiler: Optional[SamplingProfiler]) -> Iterator[Optional[SamplingProfiler]]:
+    """Eșantionează firul curent cu `profiler`; nu face nimic pentru None"""
+    if profiler is None:
+        yield None
+        return
+    with profiler:
+        yield profiler
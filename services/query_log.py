@@ -0,0 +1,132 @@
+"""
+Jurnalul căutărilor: append-only, JSON pe linie, cu rotație după dimensiune
+
+Fiecare căutare din FlightSearchService.search_flights adaugă o înregistrare:
+  {"ts": 1767261600.0, "key": {...SearchKey...}, "latency_ms": 412.5,
+   "cache": "miss", "offers": 37, "priority": "interactive"}
+
+`cache` este unul din: hit (din cache), miss (cerere upstream, inclusiv
+alăturarea la o cerere identică în curs), partial (termenul căutării a expirat
+după primele loturi), stale (rezerva flights_stale) sau error (niciun
+rezultat). Fișierul curent se rotește la max_bytes în path.1 ... path.N, ca logging.handlers.RotatingFileHandler.
+
+Scrierile sunt bufferizate și golite la `flush_interval` secunde, ca jurnalul
+să nu adauge un syscall pe fiecare căutare servită din cache.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from typing import Iterator, List, Optional
+
+from config.settings import Settings
+
+# Rezultatele unei căutări, așa cum apar în câmpul `cache`
+CACHE_OUTCOMES = ('hit', 'miss', 'partial', 'stale', 'error')
+
+
+class QueryLog:
+    """Jurnal de căutări cu rotație după dimensiune (thread-safe)"""
+
+    def __init__(self, path: str, max_bytes: int = 10 * 1024 * 1024, backups: int = 5,
+                 flush_interval: float = 1.0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._file = None
+        self._last_flush = 0.0
+
+    def _open(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def _rotate(self):
+        """Mută path -> path.1 -> ... -> path.N; apelantul deține lock-ul"""
+        self._file.close()
+        for i in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{i}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._open()
+
+    def append(self, record: dict):
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self._lock:
+            if self._file is None:
+                self._open()
+            if self.max_bytes and self._file.tell() + len(line) > self.max_bytes and self._file.tell() > 0:
+                self._rotate()
+            self._file.write(line)
+            now = time.monotonic()
+            if now - self._last_flush >= self.flush_interval:
+                self._file.flush()
+                self._last_flush = now
+
+    def log_search(self, key, latency: float, cache: str, offers: int, priority: str = 'interactive'):
+        """Înregistrează o căutare (`key` este un SearchKey, `latency` în secunde)"""
+        self.append({
+            'ts': round(time.time(), 3),
+            'key': key.to_dict(),
+            'latency_ms': round(latency * 1000, 2),
+            'cache': cache,
+            'offers': offers,
+            'priority': priority,
+        })
+
+    def flush(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                self._last_flush = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def files(self) -> List[str]:
+        """Fișierele jurnalului, de la cel mai vechi la cel curent"""
+        rotated = [f"{self.path}.{i}" for i in range(self.backups, 0, -1)]
+        return [p for p in rotated + [self.path] if os.path.exists(p)]
+
+
+def read_entries(path: str, backups: int = 5, since: Optional[float] = None) -> Iterator[dict]:
+    """Înregistrările din jurnal (inclusiv fișierele rotite), în ordine cronologică"""
+    for file_path in QueryLog(path, backups=backups).files():
+        with open(file_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Ultima linie poate fi incompletă dacă procesul a fost oprit
+                    continue
+                if since is None or entry.get('ts', 0) >= since:
+                    yield entry
+
+
+_query_log: Optional[QueryLog] = None
+_query_log_lock = threading.Lock()
+
+
+def get_query_log() -> Optional[QueryLog]:
+    """Jurnalul configurat prin Settings.QUERY_LOG_FILE (None dacă lipsește)"""
+    global _query_log
+    path = Settings.QUERY_LOG_FILE
+    if not path:
+        return None
+    with _query_log_lock:
+        if _query_log is None or _query_log.path != path:
+            if _query_log is not None:
+                _query_log.close()
+            _query_log = QueryLog(path, Settings.QUERY_LOG_MAX_BYTES, Settings.QUERY_LOG_BACKUPS)
+            atexit.register(_query_log.close)
+        return _query_log
@@ -0,0 +1,199 @@
+"""
+Circuit breaker și cereri hedged pentru clienții upstream
+"""
+import time
+import threading
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeout, wait, FIRST_COMPLETED
+from enum import Enum
+from typing import Callable, Dict, Optional
+
+from config.settings import Settings
+
+
+class CircuitState(Enum):
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker cu rată de eșec pe o fereastră glisantă de timp
+
+    CLOSED: cererile trec; dacă rata de eșec din fereastră depășește pragul
+    (cu un minim de apeluri), circuitul se deschide.
+    OPEN: cererile sunt refuzate până expiră open_seconds.
+    HALF_OPEN: trec câteva cereri de probă; succesul închide circuitul,
+    eșecul îl redeschide.
+    """
+
+    def __init__(self, name: str, window_seconds: float = 60, min_calls: int = 5,
+                 failure_rate: float = 0.5, open_seconds: float = 30,
+                 half_open_calls: int = 1):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._half_open_in_flight = 0
+        self._results: deque = deque()  # (timestamp, success)
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            return self._current_state(time.time())
+
+    def _current_state(self, now: float) -> CircuitState:
+        if self._state == CircuitState.OPEN and now - self._opened_at >= self.open_seconds:
+            self._state = CircuitState.HALF_OPEN
+            self._half_open_in_flight = 0
+        return self._state
+
+    def _trim(self, now: float):
+        while self._results and now - self._results[0][0] > self.window_seconds:
+            self._results.popleft()
+
+    def _open(self, now: float):
+        self._state = CircuitState.OPEN
+        self._opened_at = now
+        self._results.clear()
+
+    def allow_request(self) -> bool:
+        """Verifică dacă o cerere poate trece"""
+        with self._lock:
+            state = self._current_state(time.time())
+            if state == CircuitState.CLOSED:
+                return True
+            if state == CircuitState.HALF_OPEN and self._half_open_in_flight < self.half_open_calls:
+                self._half_open_in_flight += 1
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            now = time.time()
+            if self._current_state(now) == CircuitState.HALF_OPEN:
+                self._state = CircuitState.CLOSED
+                self._results.clear()
+                return
+            self._results.append((now, True))
+            self._trim(now)
+
+    def record_ignored(self):
+        """Cererea nu a ajuns la upstream (ex: fără cheie liberă) - eliberează proba"""
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN:
+                self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+
+    def record_failure(self):
+        with self._lock:
+            now = time.time()
+            if self._current_state(now) == CircuitState.HALF_OPEN:
+                self._open(now)
+                return
+            self._results.append((now, False))
+            self._trim(now)
+            failures = sum(1 for _, ok in self._results if not ok)
+            if len(self._results) >= self.min_calls and failures / len(self._results) >= self.failure_rate:
+                self._open(now)
+
+    def retry_after(self) -> float:
+        """Secunde până la următoarea cerere de probă"""
+        with self._lock:
+            if self._current_state(time.time()) != CircuitState.OPEN:
+                return 0
+            return max(0, self.open_seconds - (time.time() - self._opened_at))
+
+
+class LatencyTracker:
+    """Păstrează ultimele latențe pentru calculul percentilelor"""
+
+    def __init__(self, size: int = 200):
+        self._samples: deque = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Percentila p (0-100) sau None fără eșantioane"""
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def hedge_delay(self) -> float:
+        """Întârzierea după care se trimite cererea hedged (p95)"""
+        if len(self) < Settings.HEDGE_MIN_SAMPLES:
+            return Settings.HEDGE_DEFAULT_DELAY
+        return max(Settings.HEDGE_MIN_DELAY, self.percentile(95))
+
+
+def hedged(primary: Future, start_hedge: Callable[[], Optional[Future]], delay: float,
+           timeout: Optional[float] = None):
+    """
+    Așteaptă rezultatul unei cereri, lansând o a doua după `delay` secunde
+
+    Args:
+        primary: Future-ul cererii inițiale
+        start_hedge: Lansează cererea de rezervă (None dacă nu se poate)
+        delay: Întârzierea înainte de cererea de rezervă
+        timeout: Așteptarea maximă în total (None = nelimitată)
+
+    Returns:
+        Primul rezultat reușit; dacă ambele eșuează, ridică ultima excepție
+
+    Raises:
+        concurrent.futures.TimeoutError: niciun rezultat în `timeout` secunde
+    """
+    ends_at = None if timeout is None else time.monotonic() + timeout
+
+    def left() -> Optional[float]:
+        return None if ends_at is None else max(0.0, ends_at - time.monotonic())
+
+    done, _ = wait([primary], timeout=delay if timeout is None else min(delay, timeout))
+    if done:
+        return primary.result()
+    if ends_at is not None and left() == 0:
+        raise FutureTimeout()
+
+    backup = start_hedge()
+    if backup is None:
+        return primary.result(timeout=left())
+
+    pending = {primary, backup}
+    error: Optional[BaseException] = None
+    while pending:
+        done, pending = wait(pending, timeout=left(), return_when=FIRST_COMPLETED)
+        if not done:
+            raise FutureTimeout()
+        for future in done:
+            if future.exception() is None:
+                for other in pending:
+                    other.cancel()
+                return future.result()
+            error = future.exception()
+    raise error
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """Returnează circuit breaker-ul pentru un endpoint (creat la prima utilizare)"""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name, **Settings.CIRCUIT_BREAKER)
+        return _breakers[name]
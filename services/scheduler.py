@@ -0,0 +1,307 @@
+"""
+Planificator central pentru cererile către upstream
+
+Toate apelurile HTTP către API-uri trec prin același planificator, cu clase
+de prioritate (interactive > prefetch > background), limite de concurență
+per clasă, eliminarea job-urilor expirate și rotație între sesiuni.
+"""
+import time
+import threading
+import contextvars
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Callable, Dict, Optional
+
+from config.settings import Settings
+
+
+class Priority(IntEnum):
+    """Clase de prioritate (valoare mai mică = mai prioritar)"""
+    INTERACTIVE = 0
+    PREFETCH = 1
+    BACKGROUND = 2
+
+
+class DeadlineExceeded(Exception):
+    """Termenul limită a trecut înainte ca job-ul (sau cererea) să fie executat"""
+
+
+class JobExpired(DeadlineExceeded):
+    """Job-ul a fost abandonat în coadă, fără să ruleze"""
+
+
+# Concurență maximă per clasă de prioritate
+DEFAULT_CLASS_LIMITS = {
+    priority: Settings.SCHEDULER_CLASS_LIMITS[priority.name.lower()]
+    for priority in Priority
+}
+
+_current_priority: contextvars.ContextVar = contextvars.ContextVar(
+    'request_priority', default=Priority.INTERACTIVE
+)
+_current_session: contextvars.ContextVar = contextvars.ContextVar(
+    'request_session', default='default'
+)
+_current_deadline: contextvars.ContextVar = contextvars.ContextVar(
+    'request_deadline', default=None
+)
+
+
+def current_priority() -> Priority:
+    """Prioritatea contextului curent"""
+    return _current_priority.get()
+
+
+def current_session() -> str:
+    """Sesiunea contextului curent"""
+    return _current_session.get()
+
+
+def current_deadline() -> Optional[float]:
+    """Termenul limită (time.time()) al contextului curent; None dacă nu există"""
+    return _current_deadline.get()
+
+
+def remaining_time(cap: Optional[float] = None) -> Optional[float]:
+    """
+    Secundele rămase până la termenul limită al contextului curent (minim 0)
+
+    Args:
+        cap: Limita superioară (ex: timeout-ul unei cereri HTTP)
+
+    Returns:
+        min(cap, timp rămas); None dacă nu există nici termen, nici cap
+    """
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return cap
+    left = max(0.0, deadline - time.time())
+    return left if cap is None else min(cap, left)
+
+
+def deadline_exceeded() -> bool:
+    """Termenul limită al contextului curent a trecut"""
+    deadline = _current_deadline.get()
+    return deadline is not None and time.time() >= deadline
+
+
+@contextmanager
+def request_context(priority: Optional[Priority] = None, session_id: Optional[str] = None,
+                    deadline: Optional[float] = None):
+    """
+    Setează prioritatea, sesiunea și termenul limită pentru cererile din bloc
+
+    Args:
+        priority: Clasa de prioritate
+        session_id: Identificatorul sesiunii (pentru rotație echitabilă)
+        deadline: Momentul (time.time()) după care job-urile nepornite sunt
+            abandonate; limitează și așteptările din căutare (vezi remaining_time)
+    """
+    tokens = []
+    if priority is not None:
+        tokens.append((_current_priority, _current_priority.set(priority)))
+    if session_id is not None:
+        tokens.append((_current_session, _current_session.set(session_id)))
+    if deadline is not None:
+        tokens.append((_current_deadline, _current_deadline.set(deadline)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+@dataclass
+class _Job:
+    fn: Callable
+    args: tuple
+    kwargs: dict
+    priority: Priority
+    session_id: str
+    deadline: Optional[float]
+    future: Future = field(default_factory=Future)
+    submitted_at: float = field(default_factory=time.time)
+
+
+class RequestScheduler:
+    """Planificator cu priorități pentru cererile upstream"""
+
+    def __init__(self, max_workers: int = Settings.SCHEDULER_MAX_WORKERS,
+                 class_limits: Optional[Dict[Priority, int]] = None):
+        """
+        Args:
+            max_workers: Numărul total de cereri simultane
+            class_limits: Concurența maximă pentru fiecare clasă
+        """
+        self.max_workers = max_workers
+        self.class_limits = dict(class_limits or DEFAULT_CLASS_LIMITS)
+        self._cond = threading.Condition()
+        # Pentru fiecare clasă: sesiune -> coadă de job-uri (rotație round-robin)
+        self._queues: Dict[Priority, "OrderedDict[str, deque]"] = {p: OrderedDict() for p in Priority}
+        self._running: Dict[Priority, int] = {p: 0 for p in Priority}
+        self._stats = {'submitted': 0, 'completed': 0, 'dropped': 0}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._dispatcher: Optional[threading.Thread] = None
+        self._local = threading.local()
+        self._shutdown = False
+
+    def _ensure_started(self):
+        """Pornește dispatcher-ul la primul job; apelantul deține lock-ul"""
+        if self._dispatcher is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix='upstream',
+                initializer=self._mark_worker
+            )
+            self._dispatcher = threading.Thread(
+                target=self._dispatch_loop, name='upstream-dispatcher', daemon=True
+            )
+            self._dispatcher.start()
+
+    def _mark_worker(self):
+        self._local.is_worker = True
+
+    def submit(self, fn: Callable, *args, priority: Optional[Priority] = None,
+               session_id: Optional[str] = None, deadline: Optional[float] = None,
+               **kwargs) -> Future:
+        """
+        Adaugă un apel în coadă
+
+        Prioritatea, sesiunea și termenul limită sunt preluate din contextul
+        curent (vezi request_context) dacă nu sunt date explicit.
+
+        Returns:
+            Future cu rezultatul apelului
+        """
+        job = _Job(
+            fn=fn,
+            args=args,
+            kwargs=kwargs,
+            priority=Priority(priority if priority is not None else current_priority()),
+            session_id=session_id or current_session(),
+            deadline=deadline if deadline is not None else _current_deadline.get(),
+        )
+
+        # Un job lansat din interiorul unui worker rulează direct (evită blocarea)
+        if getattr(self._local, 'is_worker', False):
+            self._execute(job, track=False)
+            return job.future
+
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("Scheduler oprit")
+            self._ensure_started()
+            self._queues[job.priority].setdefault(job.session_id, deque()).append(job)
+            self._stats['submitted'] += 1
+            self._cond.notify_all()
+        return job.future
+
+    def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Execută un apel prin planificator și așteaptă rezultatul"""
+        return self.submit(fn, *args, **kwargs).result()
+
+    def promote(self, session_id: str, priority: Priority = Priority.INTERACTIVE) -> int:
+        """
+        Mută job-urile din coadă ale unei sesiuni din clasele mai puțin
+        prioritare în `priority` (ex: un prefetch pe care utilizatorul îl așteaptă acum)
+
+        Returns:
+            Numărul de job-uri mutate
+        """
+        moved = 0
+        with self._cond:
+            for lower in Priority:
+                if lower <= priority:
+                    continue
+                jobs = self._queues[lower].pop(session_id, None)
+                if not jobs:
+                    continue
+                for job in jobs:
+                    job.priority = priority
+                self._queues[priority].setdefault(session_id, deque()).extend(jobs)
+                moved += len(jobs)
+            if moved:
+                self._cond.notify_all()
+        return moved
+
+    def _next_job(self) -> Optional[_Job]:
+        """Alege următorul job eligibil; apelantul deține lock-ul"""
+        if sum(self._running.values()) >= self.max_workers:
+            return None
+
+        now = time.time()
+        for priority in Priority:
+            sessions = self._queues[priority]
+            if not sessions or self._running[priority] >= self.class_limits.get(priority, 1):
+                continue
+
+            while sessions:
+                session_id, jobs = next(iter(sessions.items()))
+                job = jobs.popleft()
+                # Sesiunea trece la coada rândului
+                del sessions[session_id]
+                if jobs:
+                    sessions[session_id] = jobs
+
+                if job.future.cancelled():
+                    continue
+                if job.deadline is not None and now > job.deadline:
+                    self._stats['dropped'] += 1
+                    job.future.set_exception(JobExpired(
+                        f"Job {priority.name} expirat după {now - job.submitted_at:.1f}s în coadă"
+                    ))
+                    continue
+                return job
+        return None
+
+    def _dispatch_loop(self):
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None:
+                    if self._shutdown:
+                        return
+                    self._cond.wait(timeout=1.0)
+                    job = self._next_job()
+                self._running[job.priority] += 1
+            self._executor.submit(self._execute, job)
+
+    def _execute(self, job: _Job, track: bool = True):
+        try:
+            if job.future.set_running_or_notify_cancel():
+                try:
+                    job.future.set_result(job.fn(*job.args, **job.kwargs))
+                except BaseException as e:
+                    job.future.set_exception(e)
+        finally:
+            if track:
+                with self._cond:
+                    self._running[job.priority] -= 1
+                    self._stats['completed'] += 1
+                    self._cond.notify_all()
+
+    def stats(self) -> dict:
+        """Statistici despre coadă și execuție"""
+        with self._cond:
+            return {
+                **self._stats,
+                'running': {p.name: n for p, n in self._running.items()},
+                'queued': {
+                    p.name: sum(len(jobs) for jobs in sessions.values())
+                    for p, sessions in self._queues.items()
+                },
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Oprește planificatorul"""
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify_all()
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+
+
+# Instanță globală
+request_scheduler = RequestScheduler()
@@ -0,0 +1,422 @@
+"""
+Server upstream local (stub) pentru teste de încărcare și de haos
+
+Imită endpoint-urile folosite de SkyScrapperAPI și AirLabsAPI, fără a
+consuma din cotă:
+    GET /api/v1/flights/searchAirport?query=OTP
+    GET /api/v1/flights/searchFlights?originSkyId=OTP&destinationSkyId=FCO&date=...
+    GET /api/v1/flights/searchIncomplete?sessionId=...
+    GET /api/v9/airports
+
+Itinerariile și catalogul sunt sintetice și deterministe (aceiași parametri
+dau același răspuns). Latența, erorile 429/5xx și bugetul raportat în
+headerele x-ratelimit-* sunt configurabile prin StubConfig.
+
+Utilizare:
+    python -m services.stub_upstream --port 9100 --latency-ms 200 --latency-sigma 0.5 --error-5xx 0.05
+    export SKY_SCRAPPER_BASE_URL=http://127.0.0.1:9100
+    export AIRLABS_BASE_URL=http://127.0.0.1:9100/api/v9
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from functools import lru_cache
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+from .countries import COUNTRY_NAMES
+
+# ============================================
+# PAYLOAD-URI SINTETICE
+# ============================================
+
+CARRIERS = [
+    ('TAROM', 'RO'), ('Wizz Air', 'W6'), ('Ryanair', 'FR'), ('Lufthansa', 'LH'),
+    ('Air France', 'AF'), ('KLM', 'KL'), ('Turkish Airlines', 'TK'), ('ITA Airways', 'AZ'),
+]
+HUBS = ['MUC', 'FRA', 'VIE', 'IST', 'AMS', 'CDG', 'ZRH', 'WAW']
+
+
+def _iata(index: int) -> str:
+    return f"{chr(65 + index // 676 % 26)}{chr(65 + index // 26 % 26)}{chr(65 + index % 26)}"
+
+
+def search_flights_payload(count: int, origin: str = 'OTP', destination: str = 'FCO',
+                           date: str = '2030-01-01', seed: int = 0) -> dict:
+    """Răspuns searchFlights cu `count` itinerarii"""
+    rng = random.Random(seed)
+    day = datetime.fromisoformat(date)
+    itineraries = []
+    for i in range(count):
+        stops = rng.choice((0, 0, 1, 1, 2))
+        name, code = CARRIERS[rng.randrange(len(CARRIERS))]
+        departure = day + timedelta(minutes=rng.randrange(0, 24 * 60, 5))
+        duration = 120 + stops * rng.randrange(60, 240) + rng.randrange(0, 60)
+        stations = [origin] + rng.sample(HUBS, stops) + [destination]
+        step = duration // len(stations[1:])
+        segments = [
+            {
+                'origin': {'displayCode': stations[s]},
+                'destination': {'displayCode': stations[s + 1]},
+                'operatingCarrier': {'name': name},
+                'flightNumber': f"{code}{100 + i % 900}",
+                'departure': (departure + timedelta(minutes=step * s)).isoformat(),
+                'arrival': (departure + timedelta(minutes=step * (s + 1))).isoformat(),
+            }
+            for s in range(len(stations) - 1)
+        ]
+        price = round(40 + rng.random() * 600, 2)
+        itineraries.append({
+            'id': f"{origin}-{destination}-{i}",
+            'price': {'raw': price, 'formatted': f"€{price:.0f}"},
+            'legs': [{
+                'origin': {'displayCode': origin},
+                'destination': {'displayCode': destination},
+                'departure': departure.isoformat(),
+                'arrival': (departure + timedelta(minutes=duration)).isoformat(),
+                'durationInMinutes': duration,
+                'stopCount': stops,
+                'carriers': {'marketing': [{'name': name, 'alternateId': code}]},
+                'segments': segments,
+            }],
+        })
+    return {'status': True, 'data': {'context': {'status': 'complete'}, 'itineraries': itineraries}}
+
+
+def search_airport_payload(query: str) -> dict:
+    """Răspuns searchAirport pentru un cod IATA"""
+    code = query.upper()
+    return {'status': True, 'data': [{
+        'skyId': code,
+        'entityId': str(95000000 + sum(ord(c) * 31 ** i for i, c in enumerate(code)) % 1000000),
+        'presentation': {'title': f"Aeroport {code}"},
+        'navigation': {'entityType': 'AIRPORT'},
+    }]}
+
+
+def airlabs_airports_payload(count: int, seed: int = 0) -> dict:
+    """Răspuns AirLabs /airports cu `count` aeroporturi, pe țări reale"""
+    rng = random.Random(seed)
+    countries = sorted(COUNTRY_NAMES)
+    airports = []
+    for i in range(count):
+        airports.append({
+            'iata_code': _iata(i) if i % 20 else None,   # unele aeroporturi nu au cod IATA
+            'name': f"Aeroport {i}",
+            'city': f"Oraș {i % 700}",
+            'country_code': countries[rng.randrange(len(countries))],
+            'lat': round(rng.uniform(-60, 70), 4),
+            'lng': round(rng.uniform(-180, 180), 4),
+        })
+    return {'response': airports}
+
+
+@lru_cache(maxsize=1024)
+def _flights_body(count: int, origin: str, destination: str, date: str, seed: int) -> bytes:
+    route_seed = zlib.crc32(f"{seed}|{origin}|{destination}|{date}".encode())
+    return json.dumps(search_flights_payload(count, origin, destination, date, route_seed)).encode()
+
+
+@lru_cache(maxsize=8)
+def _airports_body(count: int, seed: int) -> bytes:
+    return json.dumps(airlabs_airports_payload(count, seed)).encode()
+
+
+# ============================================
+# SERVER
+# ============================================
+
+@dataclass
+class StubConfig:
+    """Comportamentul stub-ului; se poate modifica și cât timp serverul rulează"""
+    itineraries: int = 50                 # itinerarii per searchFlights
+    airports: int = 8000                  # aeroporturi în /airports
+    seed: int = 0
+    latency_ms: float = 0.0               # latența mediană
+    latency_jitter_ms: float = 0.0        # distribuție uniformă în [mediană ± jitter]
+    latency_sigma: float = 0.0            # > 0: distribuție lognormală în jurul medianei
+    error_429: float = 0.0                # probabilitatea unui 429
+    error_5xx: float = 0.0                # probabilitatea unui 500/502/503
+    rate_limit: int = 0                   # apeluri per cheie per fereastră (0 = nelimitat)
+    rate_window: float = 60.0             # secunde
+    # Defecte scriptate după numărul apelului (1, 2, ...): întârziere în secunde, status
+    delays: Dict[int, float] = field(default_factory=dict)
+    errors: Dict[int, int] = field(default_factory=dict)
+    # > 0: searchFlights răspunde 'incomplete' cu o parte din itinerarii, iar
+    # răspunsul devine complet după atâtea apeluri searchIncomplete
+    incomplete_polls: int = 0
+
+
+ROUTES = {
+    '/api/v1/flights/searchAirport': 'search_airport',
+    '/api/v1/flights/searchFlights': 'search_flights',
+    '/api/v1/flights/searchIncomplete': 'search_incomplete',
+    '/api/v9/airports': 'airports',
+}
+
+
+class StubUpstreamHandler(BaseHTTPRequestHandler):
+    """Rutează cererile și aplică latența, erorile și bugetul configurate"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        endpoint = ROUTES.get(parsed.path)
+        if endpoint is None:
+            self.send_body(404, {'message': 'Endpoint not found'})
+            return
+
+        server = self.server
+        api_key = self.headers.get('x-rapidapi-key') or params.get('api_key', '')
+        delay, status, headers = server.next_call(api_key)
+        if delay > 0:
+            time.sleep(delay)
+
+        if status is None:
+            try:
+                status, body = 200, getattr(self, endpoint)(params)
+            except (KeyError, ValueError) as e:
+                status, body = 400, {'status': False, 'message': f"Parametru invalid: {e}"}
+        elif status == 429:
+            body = {'message': 'You have exceeded the rate limit per minute for your plan'}
+        else:
+            body = {'message': 'upstream error'}
+
+        server.record(endpoint, status)
+        self.send_body(status, body, headers)
+
+    def search_airport(self, params: dict) -> dict:
+        query = params['query'].strip()
+        if len(query) != 3 or not query.isalpha():
+            return {'status': True, 'data': []}
+        return search_airport_payload(query)
+
+    def search_flights(self, params: dict) -> bytes:
+        date = params['date']
+        datetime.fromisoformat(date)
+        config = self.server.config
+        route = (params['originSkyId'].upper(), params['destinationSkyId'].upper(), date)
+        body = _flights_body(config.itineraries, *route, config.seed)
+        if config.incomplete_polls <= 0:
+            return body
+        session_id = self.server.open_session(route)
+        return self._incomplete_batch(body, session_id, 0)
+
+    def search_incomplete(self, params: dict) -> bytes:
+        session_id = params['sessionId']
+        route, polls = self.server.poll_session(session_id)
+        config = self.server.config
+        return self._incomplete_batch(_flights_body(config.itineraries, *route, config.seed), session_id, polls)
+
+    def _incomplete_batch(self, body: bytes, session_id: str, polls: int) -> bytes:
+        """Primele (polls + 1) / (incomplete_polls + 1) din itinerarii, cumulativ"""
+        total = self.server.config.incomplete_polls + 1
+        payload = json.loads(body)
+        itineraries = payload['data']['itineraries']
+        complete = polls + 1 >= total
+        payload['data']['itineraries'] = itineraries[:len(itineraries) * min(polls + 1, total) // total]
+        payload['data']['context'] = {'status': 'complete' if complete else 'incomplete', 'sessionId': session_id}
+        return json.dumps(payload).encode()
+
+    def airports(self, params: dict) -> bytes:
+        config = self.server.config
+        return _airports_body(config.airports, config.seed)
+
+    def send_body(self, status: int, body, headers: Optional[dict] = None):
+        data = body if isinstance(body, bytes) else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, str(value))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubUpstreamServer(ThreadingHTTPServer):
+    """
+    Stub pentru Sky-Scrapper și AirLabs
+
+    Exemplu:
+        with StubUpstreamServer(config=StubConfig(error_5xx=0.1)).start() as stub:
+            with patch.object(Settings, 'SKY_SCRAPPER_BASE_URL', stub.url): ...
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int] = ('127.0.0.1', 0), config: Optional[StubConfig] = None):
+        super().__init__(address, StubUpstreamHandler)
+        self.config = config or StubConfig()
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.stats: Counter = Counter()   # (endpoint, status) -> apeluri
+        self._rng = random.Random(self.config.seed)
+        self._windows: Dict[str, Tuple[float, int]] = {}
+        self._sessions: Dict[str, list] = {}   # sessionId -> [rută, apeluri searchIncomplete]
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Adresa de bază, echivalentul https://sky-scrapper.p.rapidapi.com"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def airlabs_url(self) -> str:
+        """Echivalentul https://airlabs.co/api/v9"""
+        return f"{self.url}/api/v9"
+
+    def start(self) -> 'StubUpstreamServer':
+        """Pornește serverul într-un thread de fundal"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server_close()
+
+    def __enter__(self) -> 'StubUpstreamServer':
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _sample_latency(self) -> float:
+        config = self.config
+        if config.latency_sigma > 0:
+            ms = config.latency_ms * math.exp(self._rng.gauss(0, config.latency_sigma))
+        else:
+            ms = config.latency_ms + self._rng.uniform(-config.latency_jitter_ms, config.latency_jitter_ms)
+        return max(0.0, ms) / 1000
+
+    def _rate_limit(self, api_key: str, now: float) -> Tuple[dict, bool]:
+        """Headerele x-ratelimit-* pentru cheie și dacă bugetul ei e epuizat"""
+        config = self.config
+        if config.rate_limit <= 0:
+            return {}, False
+        started, used = self._windows.get(api_key, (now, 0))
+        if now - started >= config.rate_window:
+            started, used = now, 0
+        exceeded = used >= config.rate_limit
+        if not exceeded:
+            used += 1
+        self._windows[api_key] = (started, used)
+        reset = max(0, math.ceil(started + config.rate_window - now))
+        headers = {
+            'x-ratelimit-requests-limit': config.rate_limit,
+            'x-ratelimit-requests-remaining': config.rate_limit - used,
+            'x-ratelimit-requests-reset': reset,
+        }
+        if exceeded:
+            headers['retry-after'] = reset
+        return headers, exceeded
+
+    def next_call(self, api_key: str) -> Tuple[float, Optional[int], dict]:
+        """
+        Decide soarta unui apel
+
+        Returns:
+            (întârziere în secunde, status de eroare sau None, headere de rate limit)
+        """
+        config = self.config
+        with self.lock:
+            self.calls += 1
+            call = self.calls
+            delay = config.delays.get(call)
+            if delay is None:
+                delay = self._sample_latency()
+            headers, exceeded = self._rate_limit(api_key, time.time())
+            status = config.errors.get(call)
+            if status is None and exceeded:
+                status = 429
+            if status is None:
+                roll = self._rng.random()
+                if roll < config.error_429:
+                    status = 429
+                elif roll < config.error_429 + config.error_5xx:
+                    status = self._rng.choice((500, 502, 503))
+        return delay, status, headers
+
+    def open_session(self, route: Tuple[str, str, str]) -> str:
+        """Sesiunea unei căutări incomplete"""
+        with self.lock:
+            session_id = f"stub-{len(self._sessions) + 1}"
+            self._sessions[session_id] = [route, 0]
+        return session_id
+
+    def poll_session(self, session_id: str) -> Tuple[Tuple[str, str, str], int]:
+        """Ruta sesiunii și numărul de apeluri searchIncomplete (inclusiv acesta)"""
+        with self.lock:
+            session = self._sessions[session_id]
+            session[1] += 1
+            return session[0], session[1]
+
+    def record(self, endpoint: str, status: int):
+        with self.lock:
+            self.stats[(endpoint, status)] += 1
+
+    def calls_by_endpoint(self) -> Dict[str, int]:
+        """Numărul de apeluri primite per endpoint"""
+        with self.lock:
+            totals = Counter()
+            for (endpoint, _), count in self.stats.items():
+                totals[endpoint] += count
+            return dict(totals)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Stub local pentru Sky-Scrapper și AirLabs")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9100)
+    parser.add_argument('--itineraries', type=int, default=50)
+    parser.add_argument('--airports', type=int, default=8000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--latency-jitter-ms', type=float, default=0.0)
+    parser.add_argument('--latency-sigma', type=float, default=0.0, help="> 0 pentru latență lognormală")
+    parser.add_argument('--error-429', type=float, default=0.0, help="Probabilitatea unui 429")
+    parser.add_argument('--error-5xx', type=float, default=0.0, help="Probabilitatea unui 5xx")
+    parser.add_argument('--rate-limit', type=int, default=0, help="Apeluri per cheie per fereastră")
+    parser.add_argument('--rate-window', type=float, default=60.0)
+    parser.add_argument('--incomplete-polls', type=int, default=0,
+                        help="Apeluri searchIncomplete până la răspunsul complet")
+    args = parser.parse_args(argv)
+
+    config = StubConfig(
+        itineraries=args.itineraries, airports=args.airports, seed=args.seed,
+        latency_ms=args.latency_ms, latency_jitter_ms=args.latency_jitter_ms,
+        latency_sigma=args.latency_sigma, error_429=args.error_429, error_5xx=args.error_5xx,
+        rate_limit=args.rate_limit, rate_window=args.rate_window,
+        incomplete_polls=args.incomplete_polls,
+    )
+    server = StubUpstreamServer((args.host, args.port), config)
+    print(f"🧪 Stub upstream pe {server.url}")
+    print(f"   SKY_SCRAPPER_BASE_URL={server.url}")
+    print(f"   AIRLABS_BASE_URL={server.airlabs_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
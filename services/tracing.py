@@ -0,0 +1,234 @@
+"""
+Tracing ușor pentru etapele unei căutări
+
+Span-urile se deschid cu `span(name, **attributes)` sau cu decoratorul
+`traced(name)` și se înregistrează doar în interiorul unui `trace(...)` activ
+în contextul curent. Fără trace activ, span() returnează un span nul partajat:
+costul este o singură citire de ContextVar.
+
+Trace-urile terminate pot fi exportate ca JSON compatibil OpenTelemetry
+(OTLP/JSON, câte un obiect pe linie) într-un fișier local.
+"""
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from config.settings import Settings
+
+SERVICE_NAME = 'flight-search'
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar('trace_span', default=None)
+
+
+class Span:
+    """O etapă cronometrată, cu atribute, în cadrul unui trace"""
+
+    __slots__ = ('name', 'trace', 'span_id', 'parent_id', 'attributes',
+                 'start_ns', 'end_ns', 'error', '_token')
+
+    def __init__(self, name: str, trace: 'Trace', parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start_ns = 0
+        self.end_ns = 0
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes):
+        self.attributes.update(attributes)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def __enter__(self) -> 'Span':
+        self._token = _current_span.set(self)
+        self.start_ns = time.time_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end_ns = time.time_ns()
+        if exc_type is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(self._token)
+        self.trace.record(self)
+        return False
+
+
+class _NullSpan:
+    """Span folosit când tracing-ul e inactiv; nu face nimic"""
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def set_attributes(self, **attributes):
+        pass
+
+    def __enter__(self) -> '_NullSpan':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+class Trace:
+    """Span-urile unei singure operații (ex: o căutare)"""
+
+    def __init__(self):
+        self.trace_id = os.urandom(16).hex()
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def record(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    @property
+    def root(self) -> Optional[Span]:
+        with self._lock:
+            return next((s for s in self.spans if s.parent_id is None), None)
+
+    def waterfall(self) -> List[dict]:
+        """Span-urile în ordinea pornirii, cu adâncimea și offset-ul față de rădăcină (ms)"""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start_ns)
+        if not spans:
+            return []
+        origin = spans[0].start_ns
+        depth = {}
+        rows = []
+        for s in spans:
+            depth[s.span_id] = depth.get(s.parent_id, -1) + 1
+            rows.append({
+                'name': s.name,
+                'depth': depth[s.span_id],
+                'start_ms': (s.start_ns - origin) / 1e6,
+                'duration_ms': s.duration_ms,
+                'attributes': dict(s.attributes),
+                'error': s.error,
+            })
+        return rows
+
+    def to_otlp(self) -> dict:
+        """Trace-ul în formatul OTLP/JSON (ExportTraceServiceRequest)"""
+        with self._lock:
+            spans = list(self.spans)
+        return {'resourceSpans': [{
+            'resource': {'attributes': [{'key': 'service.name', 'value': {'stringValue': SERVICE_NAME}}]},
+            'scopeSpans': [{
+                'scope': {'name': __name__},
+                'spans': [
+                    {
+                        'traceId': self.trace_id,
+                        'spanId': s.span_id,
+                        **({'parentSpanId': s.parent_id} if s.parent_id else {}),
+                        'name': s.name,
+                        'kind': 1,
+                        'startTimeUnixNano': str(s.start_ns),
+                        'endTimeUnixNano': str(s.end_ns),
+                        'attributes': [{'key': k, 'value': _otlp_value(v)} for k, v in s.attributes.items()],
+                        'status': {'code': 2, 'message': s.error} if s.error else {'code': 1},
+                    }
+                    for s in spans
+                ],
+            }],
+        }]}
+
+
+class FileSpanExporter:
+    """Adaugă fiecare trace, ca o linie OTLP/JSON, într-un fișier local"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, trace: Trace):
+        line = json.dumps(trace.to_otlp(), ensure_ascii=False)
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+
+_exporters: Dict[str, FileSpanExporter] = {}
+_exporters_lock = threading.Lock()
+
+
+def get_file_exporter() -> Optional[FileSpanExporter]:
+    """Exportatorul configurat prin Settings.TRACE_FILE (None dacă lipsește)"""
+    path = Settings.TRACE_FILE
+    if not path:
+        return None
+    with _exporters_lock:
+        if path not in _exporters:
+            _exporters[path] = FileSpanExporter(path)
+        return _exporters[path]
+
+
+@contextmanager
+def trace(name: str, exporter: Optional[FileSpanExporter] = None, **attributes) -> Iterator[Trace]:
+    """
+    Pornește un trace nou cu span-ul rădăcină `name`
+
+    La ieșire trace-ul se exportă prin `exporter` sau, implicit, în
+    Settings.TRACE_FILE dacă e configurat.
+    """
+    current = Trace()
+    try:
+        with Span(name, current, None, attributes):
+            yield current
+    finally:
+        exporter = exporter or get_file_exporter()
+        if exporter is not None:
+            exporter.export(current)
+
+
+def span(name: str, **attributes):
+    """Span copil al span-ului curent; span nul dacă nu există un trace activ"""
+    parent = _current_span.get()
+    if parent is None:
+        return NULL_SPAN
+    return Span(name, parent.trace, parent.span_id, attributes)
+
+
+def current_span():
+    """Span-ul activ (pentru a-i adăuga atribute); span nul în afara unui trace"""
+    return _current_span.get() or NULL_SPAN
+
+
+def traced(name: str):
+    """Decorator: rulează funcția într-un span, doar dacă există un trace activ"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            parent = _current_span.get()
+            if parent is None:
+                return fn(*args, **kwargs)
+            with Span(name, parent.trace, parent.span_id, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,161 @@
+"""
+Pre-încălzirea cache-ului de zboruri pentru rutele populare
+
+La fiecare `interval` secunde job-ul ia primele rute din modelul de
+popularitate și le reîmprospătează pe cele care lipsesc din cache sau care
+expiră în mai puțin de `refresh_before` secunde. Cererile rulează cu
+prioritate background: planificatorul le lasă în urma celor interactive, iar
+pool-ul de chei păstrează Settings.BUDGET_RESERVE['background'] apeluri libere
+pe fiecare cheie. O rută e reîmprospătată doar dacă bugetul liber îi acoperă
+costul (1 apel searchFlights plus căutările de aeroport încă necunoscute).
+
+Cache-ul e în memoria procesului, deci job-ul rulează în procesul care îl
+deține: aplicația Streamlit (mod local) sau procesul worker, cu FLIGHT_WARMUP=1.
+
+Rulare (doar raportul rutelor din jurnal, fără apeluri):
+    python -m services.warmup --log queries.jsonl [--top 20]
+"""
+import argparse
+import threading
+from dataclasses import dataclass, field
+from datetime import date
+from typing import List, Optional, Tuple
+
+from config.settings import Settings
+from .cache_manager import SearchKey, cache_manager
+from .events import emit, DEBUG, INFO
+from .popularity import PopularityModel, get_popularity_model
+from .scheduler import Priority, request_context
+
+
+@dataclass
+class WarmupReport:
+    """Rezultatul unei treceri a job-ului"""
+    refreshed: List[SearchKey] = field(default_factory=list)
+    failed: List[SearchKey] = field(default_factory=list)
+    fresh: int = 0
+    skipped_budget: int = 0
+
+
+class WarmupJob:
+    """Reîmprospătează periodic rutele populare înainte să le expire TTL-ul"""
+
+    def __init__(self, service=None, model: Optional[PopularityModel] = None,
+                 config: Optional[dict] = None):
+        from .flight_apis import get_flight_service
+
+        self.service = service or get_flight_service()
+        self.model = model or get_popularity_model()
+        self.config = {**Settings.WARMUP, **(config or {})}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _refresh_cost(self, key: SearchKey) -> int:
+        known = self.service.sky_scrapper._entity_cache
+        return 1 + (key.origin not in known) + (key.destination not in known)
+
+    def due_routes(self, now: Optional[float] = None) -> Tuple[List[Tuple[SearchKey, float, Optional[float]]], int]:
+        """
+        Rutele din top (cu plecarea azi sau mai târziu) care lipsesc din
+        cache sau expiră curând
+        
+        Returns:
+            ([(cheie, scor, secunde rămase sau None)], numărul rutelor din top)
+        """
+        today = date.today().isoformat()
+        top = [(key, score) for key, score in self.model.top(self.config['top_k'], now, self.config['min_score'])
+               if key.departure_date >= today]
+        due = []
+        for key, score in top:
+            expires_in = cache_manager.expires_in('flights', key)
+            if expires_in is None or expires_in < self.config['refresh_before']:
+                due.append((key, score, expires_in))
+        return due, len(top)
+
+    def run_once(self, now: Optional[float] = None) -> WarmupReport:
+        due, popular = self.due_routes(now)
+        report = WarmupReport(fresh=popular - len(due))
+        pool = self.service.sky_scrapper.key_pool
+        reserve = Settings.BUDGET_RESERVE.get('background', 0)
+
+        # Rutele care expiră primele (sau lipsesc) au prioritate
+        due.sort(key=lambda item: (item[2] is not None, item[2] or 0, -item[1]))
+        with request_context(priority=Priority.BACKGROUND, session_id='warmup'):
+            for key, score, _ in due[:self.config['max_per_run']]:
+                if pool.spare_calls(reserve) < self._refresh_cost(key):
+                    report.skipped_budget = len(due) - len(report.refreshed) - len(report.failed)
+                    break
+                if self.service.sky_scrapper.refresh_flights(key):
+                    report.refreshed.append(key)
+                else:
+                    report.failed.append(key)
+
+        if report.refreshed or report.skipped_budget:
+            emit('warmup', INFO, f"🔥 Pre-încălzite {len(report.refreshed)} rute populare",
+                 refreshed=len(report.refreshed), failed=len(report.failed),
+                 skipped_budget=report.skipped_budget)
+        return report
+
+    def _loop(self):
+        from .query_log import get_query_log
+
+        while not self._stop.wait(self.config['interval']):
+            try:
+                # Jurnalul devine vizibil și pentru alte procese (ex: raportul CLI)
+                query_log = get_query_log()
+                if query_log is not None:
+                    query_log.flush()
+                self.run_once()
+            except Exception as e:
+                emit('warmup_error', DEBUG, f"Pre-încălzirea a eșuat: {e}")
+
+    def start(self) -> 'WarmupJob':
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name='cache-warmup', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+_job: Optional[WarmupJob] = None
+_job_lock = threading.Lock()
+
+
+def start_warmup(service=None) -> Optional[WarmupJob]:
+    """Pornește job-ul procesului dacă Settings.WARMUP_ENABLED (o singură dată)"""
+    global _job
+    if not Settings.WARMUP_ENABLED:
+        return None
+    with _job_lock:
+        if _job is None:
+            _job = WarmupJob(service).start()
+        return _job
+
+
+def main(argv: Optional[List[str]] = None):
+    from .query_log import read_entries
+
+    parser = argparse.ArgumentParser(description="Rutele populare din jurnalul de căutări")
+    parser.add_argument('--log', default=Settings.QUERY_LOG_FILE, required=not Settings.QUERY_LOG_FILE)
+    parser.add_argument('--top', type=int, default=Settings.WARMUP['top_k'])
+    parser.add_argument('--half-life', type=float, default=Settings.POPULARITY['half_life'],
+                        help="Timpul de înjumătățire al scorurilor (secunde)")
+    args = parser.parse_args(argv)
+
+    model = PopularityModel(args.half_life, Settings.POPULARITY['capacity'])
+    count = model.record_entries(read_entries(args.log, Settings.QUERY_LOG_BACKUPS))
+    print(f"{count} căutări interactive în {args.log}")
+    print(f"{'#':>3} {'Rută':<28} {'Scor':>8}")
+    for i, (key, score) in enumerate(model.top(args.top), 1):
+        route = f"{key.origin}-{key.destination} {key.departure_date}"
+        print(f"{i:>3} {route:<28} {score:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
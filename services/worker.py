@@ -0,0 +1,387 @@
+"""
+Proces worker dedicat apelurilor upstream
+
+Worker-ul deține serviciul de căutare, rate limiter-ele, pool-ul de chei și
+cache-urile. Sesiunile Streamlit trimit job-uri printr-un socket local
+(multiprocessing.connection) și așteaptă rezultatul în pași scurți, astfel
+încât thread-urile de randare nu mai blochează pe HTTP.
+
+Pornire:
+    python -m services.worker --address /tmp/flight-search-worker.sock
+
+Aplicația folosește worker-ul când FLIGHT_WORKER_ADDRESS este setat.
+
+Mesajele sunt obiecte pickle: cine se poate conecta poate executa cod în
+worker. Pe host:port worker-ul pornește doar cu FLIGHT_WORKER_AUTHKEY setat.
+Pe socket-ul Unix, fără FLIGHT_WORKER_AUTHKEY, worker-ul generează la fiecare
+pornire o cheie aleatoare în <socket>.key, citită de clienți; socket-ul și
+fișierul cheii sunt create direct sub umask 077 (doar utilizatorul curent).
+"""
+import argparse
+import itertools
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, Client
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from cachetools import TTLCache
+
+from config.settings import Settings
+from .events import CollectingListener, use_listener, dispatch
+from .flight_apis import FlightSearchService, get_flight_service
+from .scheduler import Priority, request_context, current_priority, current_session, current_deadline
+from .warmup import start_warmup
+
+# Metodele serviciului care pot fi apelate prin worker
+ALLOWED_METHODS = (
+    'search_flights',
+    'get_all_airports',
+    'add_price_monitor',
+    'remove_price_monitor',
+    'get_monitored_routes',
+    'get_price_history',
+    'clear_caches',
+)
+
+Address = Union[str, Tuple[str, int]]
+
+
+def parse_address(address: str) -> Address:
+    """'host:port' -> TCP, altfel cale de socket Unix"""
+    host, sep, port = address.rpartition(':')
+    if sep and port.isdigit() and '/' not in address:
+        return host, int(port)
+    return address
+
+
+def authkey_path(address: str) -> str:
+    """Fișierul cu cheia generată de worker pentru un socket Unix"""
+    return f"{address}.key"
+
+
+def resolve_authkey(address: Address, authkey: bytes, create: bool = False) -> bytes:
+    """
+    Cheia de autentificare pentru o adresă
+
+    Fără cheie explicită, pe socket-ul Unix cheia e citită din authkey_path
+    (create=True: worker-ul generează una nouă; apelantul setează umask-ul).
+
+    Raises:
+        ValueError: adresă TCP fără cheie setată explicit
+        OSError: fișierul cheii lipsește (worker-ul nu rulează)
+    """
+    if authkey:
+        return authkey
+    if not isinstance(address, str):
+        raise ValueError("Worker-ul pe host:port necesită FLIGHT_WORKER_AUTHKEY")
+    path = authkey_path(address)
+    if create:
+        key = os.urandom(32)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(key)
+        return key
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+class _Job:
+    def __init__(self, job_id: str, method: str):
+        self.job_id = job_id
+        self.method = method
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.events: list = []
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+
+
+class SearchWorker:
+    """Coada de job-uri și execuția lor în procesul worker"""
+
+    def __init__(self, service: Optional[FlightSearchService] = None, threads: int = 8,
+                 result_ttl: float = Settings.WORKER_RESULT_TTL):
+        self.service = service or get_flight_service()
+        self._pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='worker-job')
+        self._jobs: Dict[str, _Job] = {}
+        self._finished: TTLCache = TTLCache(maxsize=10000, ttl=result_ttl)
+        self._in_flight: Dict[tuple, str] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, method: str, kwargs: dict, priority: str = 'interactive',
+               session_id: str = 'default', deadline: Optional[float] = None) -> str:
+        """
+        Adaugă un job; cereri identice aflate în execuție împart același job
+
+        `deadline` (time.time() al clientului, pe aceeași mașină) limitează
+        căutarea în worker, ca și în procesul clientului.
+
+        Returns:
+            Identificatorul job-ului
+        """
+        if method not in ALLOWED_METHODS:
+            raise ValueError(f"Metodă nepermisă: {method}")
+
+        dedupe_key = (method, tuple(sorted(kwargs.items())))
+        with self._lock:
+            existing = self._in_flight.get(dedupe_key)
+            if existing is not None:
+                return existing
+            job = _Job(f"{os.getpid()}-{next(self._ids)}", method)
+            self._jobs[job.job_id] = job
+            self._in_flight[dedupe_key] = job.job_id
+
+        self._pool.submit(self._run, job, kwargs, Priority[priority.upper()], session_id, dedupe_key, deadline)
+        return job.job_id
+
+    def _run(self, job: _Job, kwargs: dict, priority: Priority, session_id: str, dedupe_key: tuple,
+             deadline: Optional[float] = None):
+        listener = CollectingListener()
+        try:
+            with request_context(priority=priority, session_id=session_id, deadline=deadline), \
+                    use_listener(listener):
+                job.result = getattr(self.service, job.method)(**kwargs)
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            traceback.print_exc()
+        finally:
+            job.events = listener.events
+            job.finished_at = time.time()
+            with self._lock:
+                self._in_flight.pop(dedupe_key, None)
+                self._finished[job.job_id] = self._jobs.pop(job.job_id, job)
+            job.done.set()
+
+    def _find(self, job_id: str) -> Optional[_Job]:
+        with self._lock:
+            return self._jobs.get(job_id) or self._finished.get(job_id)
+
+    def wait(self, job_id: str, timeout: float = 0) -> dict:
+        """Starea job-ului după cel mult `timeout` secunde de așteptare"""
+        job = self._find(job_id)
+        if job is None:
+            return {'status': 'unknown', 'job_id': job_id}
+        if timeout > 0:
+            job.done.wait(timeout)
+        if not job.done.is_set():
+            return {'status': 'pending', 'job_id': job_id, 'elapsed': time.time() - job.started_at}
+        return {
+            'status': 'error' if job.error else 'done',
+            'job_id': job_id,
+            'result': job.result,
+            'error': job.error,
+            'events': job.events,
+        }
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'pending': len(self._jobs), 'finished': len(self._finished)}
+
+    def handle(self, message: dict) -> dict:
+        """Procesează un mesaj de la client"""
+        if not isinstance(message, dict):
+            return {'status': 'error', 'error': f"Mesaj invalid: {type(message).__name__}"}
+        op = message.get('op')
+        try:
+            if op == 'submit':
+                job_id = self.submit(
+                    message['method'],
+                    message.get('kwargs', {}),
+                    priority=message.get('priority', 'interactive'),
+                    session_id=message.get('session_id', 'default'),
+                    deadline=message.get('deadline')
+                )
+                return {'status': 'ok', 'job_id': job_id}
+            if op in ('poll', 'wait'):
+                return self.wait(message['job_id'], message.get('timeout', 0) if op == 'wait' else 0)
+            if op == 'stats':
+                return {'status': 'ok', **self.stats()}
+            return {'status': 'error', 'error': f"Operație necunoscută: {op}"}
+        except Exception as e:
+            return {'status': 'error', 'error': f"{type(e).__name__}: {e}"}
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
+
+
+def serve(address: Address, worker: SearchWorker, authkey: bytes = Settings.WORKER_AUTHKEY,
+          ready: Optional[threading.Event] = None, stop: Optional[threading.Event] = None):
+    """Acceptă conexiuni și le deservește fiecare pe câte un thread"""
+    if isinstance(address, str) and os.path.exists(address):
+        os.unlink(address)
+
+    # Socket-ul și cheia generată nu sunt accesibile altor utilizatori nici o clipă
+    generated_key = not authkey and isinstance(address, str)
+    umask = os.umask(0o077)
+    try:
+        authkey = resolve_authkey(address, authkey, create=True)
+        listener = Listener(address, authkey=authkey)
+    finally:
+        os.umask(umask)
+
+    def handle_connection(conn):
+        with conn:
+            while True:
+                try:
+                    message = conn.recv()
+                except (EOFError, OSError):
+                    return
+                conn.send(worker.handle(message))
+
+    try:
+        if ready is not None:
+            ready.address = listener.address
+            ready.set()
+
+        while stop is None or not stop.is_set():
+            try:
+                conn = listener.accept()
+            except (AuthenticationError, EOFError, OSError):
+                # Un client cu cheie greșită (sau care închide imediat) nu oprește serverul
+                continue
+            if stop is not None and stop.is_set():
+                conn.close()
+                return
+            threading.Thread(target=handle_connection, args=(conn,), daemon=True).start()
+    finally:
+        listener.close()
+        if generated_key and os.path.exists(authkey_path(address)):
+            os.unlink(authkey_path(address))
+
+
+# ============================================
+# CLIENT
+# ============================================
+
+class WorkerClient:
+    """Client pentru procesul worker; câte o conexiune per thread"""
+
+    def __init__(self, address: Union[str, Address], authkey: bytes = Settings.WORKER_AUTHKEY):
+        self.address = parse_address(address) if isinstance(address, str) else address
+        if not authkey and not isinstance(self.address, str):
+            resolve_authkey(self.address, authkey)  # ValueError: TCP fără cheie
+        self.authkey = authkey
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Cheia generată se recitește la fiecare conexiune: worker-ul repornit are alta
+            conn = Client(self.address, authkey=resolve_authkey(self.address, self.authkey))
+            self._local.conn = conn
+        return conn
+
+    def request(self, message: dict) -> dict:
+        """Trimite un mesaj; reconectează o dată dacă worker-ul a fost repornit"""
+        for attempt in range(2):
+            try:
+                conn = self._connection()
+                conn.send(message)
+                return conn.recv()
+            except (EOFError, OSError):
+                self._local.conn = None
+                if attempt:
+                    raise
+        return {}
+
+    def submit(self, method: str, priority: Optional[Priority] = None,
+               session_id: Optional[str] = None, **kwargs) -> str:
+        response = self.request({
+            'op': 'submit',
+            'method': method,
+            'kwargs': kwargs,
+            'priority': (priority or current_priority()).name.lower(),
+            'session_id': session_id or current_session(),
+            'deadline': current_deadline(),
+        })
+        if response.get('status') != 'ok':
+            raise RuntimeError(response.get('error', 'Worker indisponibil'))
+        return response['job_id']
+
+    def wait(self, job_id: str, timeout: float = 0) -> dict:
+        return self.request({'op': 'wait', 'job_id': job_id, 'timeout': timeout})
+
+    def poll(self, job_id: str) -> dict:
+        return self.request({'op': 'poll', 'job_id': job_id})
+
+    def stats(self) -> dict:
+        return self.request({'op': 'stats'})
+
+
+class RemoteFlightSearchService:
+    """
+    Proxy cu aceeași interfață ca FlightSearchService, executat în worker
+
+    Evenimentele produse în worker sunt retrimise listener-ului local.
+    """
+
+    def __init__(self, client: WorkerClient, poll_interval: float = 0.25):
+        self.client = client
+        self.poll_interval = poll_interval
+
+    def _call(self, method: str, **kwargs):
+        job_id = self.client.submit(method, **kwargs)
+        while True:
+            response = self.client.wait(job_id, timeout=self.poll_interval)
+            if response['status'] != 'pending':
+                break
+
+        for event in response.get('events', []):
+            dispatch(event)
+        if response['status'] == 'unknown':
+            raise RuntimeError(f"Job necunoscut în worker: {job_id}")
+        if response['status'] == 'error':
+            raise RuntimeError(response['error'])
+        return response['result']
+
+    def search_flights(self, **kwargs) -> list:
+        return self._call('search_flights', **kwargs)
+
+    def get_all_airports(self) -> dict:
+        return self._call('get_all_airports')
+
+    def add_price_monitor(self, origin: str, destination: str,
+                          departure_date: str, target_price: Optional[float] = None):
+        return self._call('add_price_monitor', origin=origin, destination=destination,
+                          departure_date=departure_date, target_price=target_price)
+
+    def remove_price_monitor(self, route_key: str):
+        return self._call('remove_price_monitor', route_key=route_key)
+
+    def get_monitored_routes(self) -> dict:
+        return self._call('get_monitored_routes')
+
+    def get_price_history(self, route_key: str) -> List[dict]:
+        return self._call('get_price_history', route_key=route_key)
+
+    def clear_caches(self):
+        return self._call('clear_caches')
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Proces worker pentru apelurile upstream")
+    parser.add_argument('--address', default=Settings.WORKER_ADDRESS or '/tmp/flight-search-worker.sock',
+                        help="Cale socket Unix sau host:port")
+    parser.add_argument('--threads', type=int, default=16, help="Job-uri executate simultan")
+    args = parser.parse_args(argv)
+
+    worker = SearchWorker(threads=args.threads)
+    if start_warmup(worker.service) is not None:
+        print("🔥 Pre-încălzire activă pentru rutele populare")
+    print(f"✈️ Worker pornit pe {args.address} (pid {os.getpid()})")
+    try:
+        serve(parse_address(args.address), worker)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        worker.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -18,7 +18,8 @@ from utils.validators import (
 from utils.helpers import (
     format_duration,
     format_price,
-    get_stops_description
+    get_stops_description,
+    page_bounds
 )
 
 
@@ -120,6 +121,13 @@ class TestHelpers(unittest.TestCase):
         result = format_price(500.00, "RON")
         self.assertEqual(result, "500.00 lei")
     
+    def test_page_bounds(self):
+        """Test limitele paginilor de rezultate"""
+        self.assertEqual(page_bounds(60, 0, 25), (0, 25, 3))
+        self.assertEqual(page_bounds(60, 2, 25), (50, 60, 3))
+        self.assertEqual(page_bounds(60, 9, 25), (50, 60, 3))
+        self.assertEqual(page_bounds(0, 0, 25), (0, 0, 1))
+    
     def test_get_stops_description_direct(self):
         """Test descriere direct"""
         result = get_stops_description(0)
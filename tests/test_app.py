@@ -0,0 +1,240 @@
+"""
+Teste de randare pentru aplicația Streamlit (AppTest, fără apeluri upstream)
+"""
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from datetime import date, datetime, timedelta
+
+import sys
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest
+
+from config.settings import Settings
+from services.cache_manager import SearchKey
+from services.flight_apis import FlightOffer
+
+CATALOG = {
+    'Europa': {
+        'România': [{'iata': 'OTP', 'name': 'Henri Coandă', 'city': 'București', 'lat': 44.57, 'lng': 26.08}],
+        'Italia': [{'iata': 'FCO', 'name': 'Fiumicino', 'city': 'Roma', 'lat': 41.80, 'lng': 12.25}],
+    }
+}
+
+
+def app_script(root, catalog):
+    import sys
+    from unittest import mock
+    sys.path.insert(0, root)
+    import app
+
+    with mock.patch.object(app, 'load_airport_catalog', lambda: (catalog, 'test')):
+        app.main()
+
+
+def make_offers(count=6):
+    departure = datetime(2030, 1, 1, 10, 0)
+    return [
+        FlightOffer(
+            id=f'SKY-{i}', source='Skyscanner', airline='Test Air', airline_code='TA',
+            origin='OTP', destination='FCO', departure_time=departure,
+            arrival_time=departure + timedelta(hours=2), duration='2h 0m',
+            price=100.0 + i, currency='EUR', cabin_class='ECONOMY', stops=i % 2, segments=[]
+        )
+        for i in range(count)
+    ]
+
+
+class TestAppRendering(unittest.TestCase):
+    """Teste pentru secțiunile randate ca fragmente"""
+
+    def setUp(self):
+        self.at = AppTest.from_function(app_script, args=(ROOT, CATALOG), default_timeout=30)
+        self.at.session_state['search_results'] = make_offers()
+        self.at.session_state['last_search'] = {'origin': 'OTP', 'destination': 'FCO',
+                                                'departure_date': '2030-01-01', 'currency': 'EUR'}
+        self.at.run()
+
+    def test_results_panel_filters(self):
+        """Test filtrul de zboruri directe folosește DataFrame-ul memorat"""
+        self.assertFalse(self.at.exception)
+        frame = self.at.session_state['_results_frame'][1]
+        self.assertEqual(len(self.at.dataframe[0].value), 6)
+
+        self.at.checkbox(key='filter_direct_results').check().run()
+        self.assertEqual(len(self.at.dataframe[0].value), 3)
+        self.assertIs(self.at.session_state['_results_frame'][1], frame)
+
+    def test_results_pagination(self):
+        """Test doar pagina curentă e trimisă; filtrul resetează cursorul"""
+        self.at.session_state['search_results'] = make_offers(60)
+        self.at.run()
+        self.assertEqual(len(self.at.dataframe[0].value), 25)
+
+        self.at.button(key='results_next').click().run()
+        self.at.button(key='results_next').click().run()
+        self.assertEqual(self.at.session_state['results_page'], 2)
+        self.assertEqual(len(self.at.dataframe[0].value), 10)
+        self.assertTrue(self.at.button(key='results_next').disabled)
+
+        self.at.checkbox(key='filter_direct_results').check().run()
+        self.assertEqual(self.at.session_state['results_page'], 0)
+        self.assertEqual(len(self.at.dataframe[0].value), 25)
+        self.assertEqual(set(self.at.dataframe[0].value['Escale']), {0})
+
+    def test_results_version_tracks_result_set(self):
+        """Test vizualizarea e legată de versiunea rezultatelor, nu de id()"""
+        version = self.at.session_state['_results_version'][1]
+        self.at.run()
+        self.assertEqual(self.at.session_state['_results_version'][1], version)
+
+        self.at.session_state['search_results'] = make_offers(4)
+        self.at.run()
+        self.assertEqual(self.at.session_state['_results_version'][1], version + 1)
+        self.assertEqual(self.at.session_state['_results_view'][0][0], version + 1)
+        self.assertEqual(len(self.at.dataframe[0].value), 4)
+
+    def test_export_generated_on_demand(self):
+        """Test exportul se generează doar după cerere și e reutilizat"""
+        self.assertEqual(len(self.at.session_state['_export_cache']), 0)
+        self.assertEqual(len(self.at.get('download_button')), 0)
+
+        self.at.button(key='results_export_prepare').click().run()
+        self.assertEqual(len(self.at.session_state['_export_cache']), 1)
+        self.assertEqual(len(self.at.get('download_button')), 1)
+
+        self.at.run()
+        self.assertEqual(len(self.at.session_state['_export_cache']), 1)
+
+    def test_airport_selector_stores_choice(self):
+        """Test selectorul salvează aeroportul în session state"""
+        self.at.selectbox(key='origin_continent_select').set_value('Europa').run()
+        self.at.selectbox(key='origin_country_select').set_value('România').run()
+        self.at.selectbox(key='origin_airport_select').set_value('OTP - Henri Coandă (București)').run()
+        self.assertEqual(self.at.session_state['origin_airport'], 'OTP')
+
+    def test_sections_render_lazily(self):
+        """Test exploratorul e randat doar când secțiunea lui e activă"""
+        self.assertEqual(len(self.at.selectbox(key='sort_by').options), 5)
+        with self.assertRaises(KeyError):
+            self.at.selectbox(key='explorer_continent')
+
+        self.at.session_state['active_section'] = '🌍 Explorează Aeroporturi'
+        self.at.run()
+        self.assertEqual(self.at.selectbox(key='explorer_continent').value, 'Europa')
+        self.assertEqual(self.at.metric[2].value, '2')
+
+    def test_trace_waterfall_panel(self):
+        """Test waterfall-ul ultimei căutări trasate apare sub rezultate"""
+        self.assertFalse(self.at.sidebar.checkbox(key='trace_searches').value)
+        self.at.session_state['last_trace'] = [
+            {'name': 'search', 'depth': 0, 'start_ms': 0.0, 'duration_ms': 120.0,
+             'attributes': {'route': 'OTP-FCO'}, 'error': None},
+            {'name': 'http', 'depth': 1, 'start_ms': 10.0, 'duration_ms': 90.0,
+             'attributes': {'status': 200, 'route': '"><script>x</script>'}, 'error': None},
+        ]
+        self.at.run()
+        self.assertIn('🐞 Trace căutare · 120 ms', [e.label for e in self.at.expander])
+        waterfall = next(m.value for m in self.at.markdown if 'title=' in m.value)
+        self.assertNotIn('<script>', waterfall)
+        self.assertIn('&quot;&gt;&lt;script&gt;', waterfall)
+
+    def test_profiler_admin_only(self):
+        """Test profiler-ul apare doar pentru admin și rulează pe N rerun-uri"""
+        self.assertFalse([b for b in self.at.sidebar.button if b.label.startswith('⏱️')])
+
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch.multiple(Settings, ADMIN_TOKEN='secret', PROFILE_DIR=tmp, PROFILER_INTERVAL=0.001):
+            self.at.query_params['admin'] = 'secret'
+            self.at.run()
+            self.at.sidebar.number_input(key='profile_reruns').set_value(2).run()
+            button = next(b for b in self.at.sidebar.button if b.label.startswith('⏱️'))
+            button.click().run()
+            self.assertEqual(self.at.session_state['profile_reruns_left'], 1)
+            self.at.run()
+
+            report = self.at.session_state['profile_report']
+            self.assertEqual(report['runs'], 2)
+            self.assertTrue(os.path.exists(report['path']))
+            self.assertTrue(any(row['function'].startswith('app:') for row in report['top']))
+            self.assertTrue(any(e.label.startswith('⏱️ Profil · 2 rerun-uri') for e in self.at.expander))
+
+    def test_display_currency_converted_locally(self):
+        """Test schimbarea monedei convertește coloana de prețuri, fără o căutare nouă"""
+        self.assertEqual(self.at.selectbox(key='display_currency').value, 'EUR')
+        base = self.at.session_state['_results_frame'][1]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'fx.json')
+            with open(path, 'w') as f:
+                f.write('{"base": "EUR", "rates": {"USD": 1.5, "RON": 5}}')
+            with patch.object(Settings, 'FX_RATES_FILE', path), patch('services.fx._rates', None):
+                self.at.selectbox(key='display_currency').set_value('RON').run()
+
+        table = self.at.dataframe[0].value
+        self.assertEqual(table['Preț'].tolist(), [500.0, 505.0, 510.0, 515.0, 520.0, 525.0])
+        self.assertEqual(set(table['Monedă']), {'RON'})
+        self.assertIs(self.at.session_state['_results_frame'][1], base)
+        self.assertEqual(base['Preț'].iloc[0], 100.0)
+
+    def test_target_price_saved_in_base_currency(self):
+        """Test prețul țintă introdus în moneda afișată e salvat în moneda de bază"""
+        from services.cache_manager import cache_manager
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'fx.json')
+            with open(path, 'w') as f:
+                f.write('{"base": "EUR", "rates": {"RON": 5}}')
+            with patch.object(Settings, 'FX_RATES_FILE', path), patch('services.fx._rates', None):
+                self.at.selectbox(key='display_currency').set_value('RON').run()
+                target = next(n for n in self.at.number_input if n.label.startswith('💰 Preț țintă'))
+                self.assertEqual(target.label, '💰 Preț țintă în RON (opțional)')
+                target.set_value(500.0).run()
+                next(b for b in self.at.button if b.label == '📈 Adaugă la Monitor').click().run()
+        try:
+            self.assertEqual(cache_manager.get_price_monitors()['OTP-FCO-2030-01-01']['target_price'], 100.0)
+        finally:
+            cache_manager.remove_price_monitor('OTP-FCO-2030-01-01')
+
+    def test_form_changes_drive_prefetch(self):
+        """Test aeroporturile și data aleasă programează prefetch-ul, pe cheia care va fi trimisă"""
+        prefetcher = FakePrefetcher()
+        with patch('services.prefetch._prefetcher', prefetcher), \
+                patch.multiple(Settings, PREFETCH_ENABLED=True, WORKER_ADDRESS=''):
+            for prefix, country, airport in (('origin', 'România', 'OTP - Henri Coandă (București)'),
+                                             ('dest', 'Italia', 'FCO - Fiumicino (Roma)')):
+                self.at.selectbox(key=f'{prefix}_continent_select').set_value('Europa').run()
+                self.at.selectbox(key=f'{prefix}_country_select').set_value(country).run()
+                self.at.selectbox(key=f'{prefix}_airport_select').set_value(airport).run()
+            self.assertEqual(prefetcher.airports, {'OTP', 'FCO'})
+            departure = date.today() + timedelta(days=30)
+            self.assertEqual(prefetcher.flights[-1], SearchKey.create('OTP', 'FCO', departure.isoformat()))
+
+            self.at.date_input(key='departure_date').set_value(departure + timedelta(days=1)).run()
+            self.assertEqual(prefetcher.flights[-1].departure_date, (departure + timedelta(days=1)).isoformat())
+            self.at.radio(key='trip_type').set_value('🔄 Dus-întors').run()
+            self.assertEqual(prefetcher.flights[-1].return_date, (departure + timedelta(days=8)).isoformat())
+
+
+class FakePrefetcher:
+    """Înregistrează cererile de prefetch ale aplicației"""
+
+    def __init__(self):
+        self.airports = set()
+        self.flights = []
+        self.cancelled = 0
+
+    def prefetch_airport(self, code):
+        self.airports.add(code)
+
+    def prefetch_flights(self, session_id, key):
+        self.flights.append(key)
+
+    def cancel(self, session_id):
+        self.cancelled += 1
+        return False
+
+
+if __name__ == '__main__':
+    unittest.main()
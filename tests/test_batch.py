@@ -0,0 +1,144 @@
+"""
+Teste pentru căutarea batch
+"""
+import json
+import os
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.batch import JSONLResultWriter, load_records, prepare_queries, run_batch
+from services.events import emit, WARNING
+from services.flight_apis import FlightOffer, SearchResults
+
+
+def make_offer(price: float) -> FlightOffer:
+    departure = datetime(2030, 1, 1, 10, 0)
+    return FlightOffer(
+        id='SKY-1', source='Skyscanner', airline='Test Air', airline_code='TA',
+        origin='OTP', destination='FCO', departure_time=departure,
+        arrival_time=departure + timedelta(hours=2), duration='2h 0m',
+        price=price, currency='EUR', cabin_class='economy', stops=0, segments=[]
+    )
+
+
+class FakeService:
+    """Serviciu fals care înregistrează apelurile"""
+
+    def __init__(self):
+        self.calls = []
+
+    def search_flights(self, **kwargs):
+        self.calls.append(kwargs)
+        return [make_offer(99.0)]
+
+
+class TestBatch(unittest.TestCase):
+    """Teste pentru run_batch"""
+
+    def setUp(self):
+        self.date = (date.today() + timedelta(days=30)).isoformat()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.tmp.name, 'results.jsonl')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def records(self):
+        return [
+            {'origin': 'OTP', 'destination': 'FCO', 'departure_date': self.date},
+            {'origin': 'otp', 'destination': 'fco', 'departure_date': self.date},
+            {'origin': 'OTP', 'destination': 'LHR', 'departure_date': self.date, 'adults': '2'},
+            {'origin': 'OTP', 'destination': 'OTP', 'departure_date': self.date},
+        ]
+
+    def test_prepare_dedupes_and_validates(self):
+        """Test duplicatele și interogările invalide sunt separate"""
+        queries, invalid, duplicates = prepare_queries(self.records())
+        self.assertEqual(len(queries), 2)
+        self.assertEqual(len(invalid), 1)
+        self.assertEqual(duplicates, 1)
+
+    def test_run_and_resume(self):
+        """Test rularea scrie rezultatele și reluarea sare interogările terminate"""
+        service = FakeService()
+        writer = JSONLResultWriter(self.output)
+        report = run_batch(self.records(), writer, service=service, workers=2)
+        writer.close()
+
+        self.assertEqual(len(service.calls), 2)
+        summary = report.summary()
+        self.assertEqual(summary['completed'], 2)
+        self.assertEqual(summary['invalid'], 1)
+
+        with open(self.output, encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(len(lines), 3)
+
+        # Simulează o linie trunchiată după crash
+        with open(self.output, 'a', encoding='utf-8') as f:
+            f.write('{"query_key": "trunc')
+
+        service = FakeService()
+        writer = JSONLResultWriter(self.output)
+        report = run_batch(self.records(), writer, done_keys=JSONLResultWriter.done_keys(self.output),
+                           service=service)
+        writer.close()
+        self.assertEqual(service.calls, [])
+        self.assertEqual(report.skipped, 2)
+
+    def test_partial_results_resumed(self):
+        """Test interogările cu rezultate parțiale sunt reluate la --resume"""
+        service = FakeService()
+        service.search_flights = lambda **kwargs: SearchResults([make_offer(99.0)], partial=True, outcome='partial')
+        writer = JSONLResultWriter(self.output)
+        report = run_batch(self.records()[:1], writer, service=service)
+        writer.close()
+        self.assertEqual(report.summary()['partial'], 1)
+        self.assertEqual(JSONLResultWriter.done_keys(self.output), set())
+
+    def test_deadline_without_offers_resumed(self):
+        """Test o interogare fără rezultate din cauza termenului e eroare, nu empty"""
+        def timed_out(**kwargs):
+            emit('deadline_exceeded', WARNING, "⏱️ Termenul căutării a expirat")
+            return SearchResults([], outcome='error')
+
+        service = FakeService()
+        service.search_flights = timed_out
+        writer = JSONLResultWriter(self.output)
+        report = run_batch(self.records()[:1], writer, service=service, deadline=0.5)
+        writer.close()
+        self.assertEqual(report.errors, 1)
+        with open(self.output) as f:
+            record = json.loads(f.readline())
+        self.assertEqual(record['status'], 'error')
+        self.assertEqual(record['errors'], ["⏱️ Termenul căutării a expirat"])
+        self.assertEqual(JSONLResultWriter.done_keys(self.output), set())
+
+    def test_non_object_records_invalid_once(self):
+        """Test liniile JSONL care nu sunt obiecte sunt invalide și nu se repetă la --resume"""
+        path = os.path.join(self.tmp.name, 'queries.jsonl')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('["OTP", "LHR"]\n"x"\n3\n')
+            f.write(json.dumps(self.records()[0]) + '\n')
+
+        for _ in range(2):
+            service = FakeService()
+            writer = JSONLResultWriter(self.output)
+            report = run_batch(load_records(path), writer, done_keys=JSONLResultWriter.done_keys(self.output),
+                               service=service)
+            writer.close()
+        self.assertEqual(report.invalid, 3)
+
+        with open(self.output, encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual([line['status'] for line in lines], ['invalid'] * 3 + ['ok'])
+        self.assertEqual(lines[0]['input'], ['OTP', 'LHR'])
+        self.assertTrue(all(line['query_key'] for line in lines))
+
+
+if __name__ == '__main__':
+    unittest.main()
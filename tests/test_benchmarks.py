@@ -0,0 +1,75 @@
+"""
+Teste pentru suita de benchmark-uri offline
+"""
+import json
+import os
+import unittest
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.import_time import DEFAULT_BUDGET, measure_import
+from benchmarks.suite import compare_results, run_suite
+from services.flight_apis import SkyScrapperAPI
+from services.key_pool import APIKeyPool
+from services.stub_upstream import airlabs_airports_payload, search_flights_payload
+
+
+class TestFixtures(unittest.TestCase):
+    """Teste pentru payload-urile sintetice"""
+
+    def test_flights_payload_parses(self):
+        """Test toate itinerariile sintetice sunt parsate"""
+        api = SkyScrapperAPI(key_pool=APIKeyPool(['test'], max_calls=10))
+        offers = api._parse_flights(search_flights_payload(50), 'EUR')
+        self.assertEqual(len(offers), 50)
+        self.assertTrue(all(len(o.segments) == o.stops + 1 for o in offers))
+
+    def test_payloads_are_deterministic(self):
+        """Test aceeași dimensiune dă același payload"""
+        self.assertEqual(search_flights_payload(20), search_flights_payload(20))
+        self.assertEqual(airlabs_airports_payload(100), airlabs_airports_payload(100))
+
+
+class TestCompare(unittest.TestCase):
+    """Teste pentru modul compare"""
+
+    def test_flags_regressions_above_threshold(self):
+        """Test statusurile față de baseline"""
+        baseline = {'results': {'a': {'us': 10.0}, 'b': {'us': 10.0}, 'c': {'us': 10.0}, 'gone': {'us': 1.0}}}
+        current = {'results': {'a': {'us': 13.0}, 'b': {'us': 11.0}, 'c': {'us': 5.0}, 'added': {'us': 1.0}}}
+        rows = {r['name']: r['status'] for r in compare_results(baseline, current, threshold=0.2)}
+        self.assertEqual(rows, {'a': 'regression', 'b': 'ok', 'c': 'improved',
+                                'gone': 'missing', 'added': 'new'})
+
+    def test_run_suite_filter(self):
+        """Test rularea unui subset al suitei"""
+        results = run_suite(repeat=1, only='cache_get')
+        self.assertEqual(list(results['results']), ['cache_get'])
+        self.assertGreater(results['results']['cache_get']['us'], 0)
+
+
+class TestImportBudget(unittest.TestCase):
+    """Teste pentru importurile lazy de la pornirea unui worker"""
+
+    def test_startup_skips_heavy_modules(self):
+        """Test nicio țintă din buget nu încarcă modulele interzise"""
+        with open(DEFAULT_BUDGET, encoding='utf-8') as f:
+            budget = json.load(f)
+        for target, spec in budget['targets'].items():
+            result = measure_import(target, spec.get('preload', []), spec['forbidden'], repeat=1)
+            self.assertEqual(result['loaded'], [], target)
+
+    def test_lazy_package_exports(self):
+        """Test exporturile pachetului services se rezolvă la primul acces"""
+        import services
+        from services import SearchKey, flight_apis
+        self.assertIs(services.SearchKey, SearchKey)
+        self.assertIn('FlightSearchService', dir(services))
+        self.assertEqual(flight_apis.get_country_name('ro'), 'România')
+        with self.assertRaises(AttributeError):
+            services.missing
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,203 @@
+"""
+Teste de concurență pentru CacheManager
+"""
+import os
+import pickle
+import threading
+import time
+import unittest
+from collections import Counter
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.cache_manager import CacheManager, SearchKey, StripedTTLCache, PRICE_HISTORY_SIZE
+
+THREADS = 64
+
+
+def run_threads(target, count: int = THREADS) -> float:
+    """Pornește `count` thread-uri simultan și returnează durata totală"""
+    barrier = threading.Barrier(count)
+    errors = []
+
+    def worker(index):
+        barrier.wait()
+        try:
+            target(index)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    if errors:
+        raise errors[0]
+    return elapsed
+
+
+class TestStripedCache(unittest.TestCase):
+    """Teste pentru StripedTTLCache"""
+
+    def test_get_or_compute_runs_once_per_key(self):
+        """Test 64 de thread-uri pe aceleași chei: un singur calcul per cheie"""
+        cache = StripedTTLCache(maxsize=1000, ttl=60)
+        computed = Counter()
+        lock = threading.Lock()
+
+        def compute(key):
+            with lock:
+                computed[key] += 1
+            time.sleep(0.01)
+            return f"value-{key}"
+
+        def worker(index):
+            for key in range(16):
+                value = cache.get_or_compute(key, lambda k=key: compute(k))
+                self.assertEqual(value, f"value-{key}")
+
+        run_threads(worker)
+        self.assertEqual(set(computed.values()), {1})
+        self.assertEqual(len(cache), 16)
+
+    def test_failed_compute_is_not_cached(self):
+        """Test o excepție ajunge la toți cei care așteaptă și nu e memorată"""
+        cache = StripedTTLCache(maxsize=10, ttl=60)
+
+        def fail():
+            time.sleep(0.02)
+            raise RuntimeError("upstream")
+
+        failures = []
+
+        def worker(index):
+            try:
+                cache.get_or_compute('k', fail)
+            except RuntimeError:
+                failures.append(index)
+
+        run_threads(worker, count=8)
+        self.assertEqual(len(failures), 8)
+        self.assertEqual(cache.get_or_compute('k', lambda: 'ok'), 'ok')
+
+    def test_throughput_scales(self):
+        """Test debitul la 64 de thread-uri nu se prăbușește față de un singur thread"""
+        cache = StripedTTLCache(maxsize=10000, ttl=60)
+        ops = 2000
+
+        def worker(index):
+            for i in range(ops):
+                key = (index * 7919 + i) % 5000
+                cache[key] = i
+                cache.get(key)
+
+        single = ops / run_threads(worker, count=1)
+        parallel = ops * THREADS / run_threads(worker)
+        # Cu GIL-ul nu ne așteptăm la câștig liniar, dar contenția pe lock-uri
+        # nu trebuie să reducă debitul total sub o fracțiune din cel secvențial
+        self.assertGreater(parallel, single * 0.3)
+
+
+class TestSearchKey(unittest.TestCase):
+    """Teste pentru cheile de cache tipizate"""
+
+    def test_normalized_keys_are_equal(self):
+        """Test variații de scriere ale aceleiași căutări dau aceeași cheie"""
+        first = SearchKey.create('otp', 'fco ', '2030-01-01', cabin_class='ECONOMY', currency='eur')
+        second = SearchKey.create('OTP', 'FCO', '2030-01-01')
+        self.assertEqual(first, second)
+        self.assertEqual(hash(first), hash(second))
+        self.assertNotEqual(first, SearchKey.create('OTP', 'FCO', '2030-01-01', adults=2))
+
+    def test_pickle_recomputes_hash(self):
+        """Test cheia încărcată din pickle nu poartă hash-ul procesului care a serializat-o"""
+        key = SearchKey.create('OTP', 'FCO', '2030-01-01', return_date='2030-01-08')
+        # Simulează un hash calculat în alt proces (alt PYTHONHASHSEED)
+        object.__setattr__(key, '_hash', hash(key) + 1)
+        loaded = pickle.loads(pickle.dumps(key))
+        fresh = SearchKey.create('OTP', 'FCO', '2030-01-01', return_date='2030-01-08')
+        self.assertEqual(loaded, fresh)
+        self.assertEqual(hash(loaded), hash(fresh))
+        self.assertEqual({fresh: 'ok'}[loaded], 'ok')
+
+    def test_manager_uses_key_directly(self):
+        """Test SearchKey și părțile simple nu mai trec prin json + md5"""
+        manager = CacheManager()
+        key = SearchKey.create('OTP', 'FCO', '2030-01-01')
+        self.assertIs(manager._make_key((key,)), key)
+        self.assertEqual(manager._make_key(('all_airports_v2',)), ('all_airports_v2',))
+        self.assertIsInstance(manager._make_key(({'a': 1},)), str)
+
+        # 1, 1.0 și True sunt egale ca valori, dar chei diferite
+        manager.set('prices', 'int', 'route', 1)
+        manager.set('prices', 'bool', 'route', True)
+        manager.set('prices', 'float', 'route', 1.0)
+        self.assertEqual([manager.get('prices', 'route', part) for part in (1, True, 1.0)],
+                         ['int', 'bool', 'float'])
+
+        manager.set('flights', ['offer'], key)
+        self.assertEqual(manager.get('flights', SearchKey.create('otp', 'fco', '2030-01-01')), ['offer'])
+        self.assertIsNone(manager.get('flights_stale', key))
+
+    def test_expires_in(self):
+        """Test timpul rămas din TTL pentru o intrare și lipsa ei"""
+        manager = CacheManager()
+        key = SearchKey.create('OTP', 'FCO', '2030-01-01')
+        self.assertIsNone(manager.expires_in('flights', key))
+        manager.get_or_compute('flights', lambda: ['offer'], key)
+        self.assertAlmostEqual(manager.expires_in('flights', key), 300, delta=1)
+        manager.clear_cache('flights')
+        self.assertIsNone(manager.expires_in('flights', key))
+
+
+class TestCacheManagerConcurrency(unittest.TestCase):
+    """Teste pentru istoric și monitoare accesate concurent"""
+
+    def setUp(self):
+        self.manager = CacheManager()
+
+    def test_price_history_no_lost_updates(self):
+        """Test actualizările concurente nu se pierd și istoricul rămâne limitat"""
+        def worker(index):
+            for i in range(50):
+                self.manager.update_price_history(f"R{index % 8}", 100.0 + index + i)
+
+        run_threads(worker)
+        for route in range(8):
+            history = self.manager.get_price_history(f"R{route}")
+            self.assertEqual(len(history), PRICE_HISTORY_SIZE)
+
+        def single_route(index):
+            self.manager.update_price_history("SOLO", float(index))
+
+        run_threads(single_route)
+        self.assertEqual(sorted(p['price'] for p in self.manager.get_price_history("SOLO")),
+                         [float(i) for i in range(THREADS)])
+
+    def test_monitors_safe_iteration(self):
+        """Test iterarea monitoarelor în timp ce alte thread-uri le modifică"""
+        self.manager.add_price_monitor("BASE", {}, 50.0)
+
+        def worker(index):
+            for i in range(200):
+                if index % 2:
+                    key = f"M{index}-{i % 10}"
+                    self.manager.add_price_monitor(key, {}, None)
+                    self.manager.update_price_history(key, float(i))
+                    self.manager.remove_price_monitor(key)
+                else:
+                    for key, monitor in self.manager.get_price_monitors().items():
+                        self.assertIn('target_price', monitor)
+
+        run_threads(worker)
+        self.manager.update_price_history("BASE", 42.0)
+        self.manager.update_price_history("BASE", 45.0)
+        self.assertEqual(self.manager.get_price_monitors()['BASE']['lowest_price'], 42.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+Teste pentru evenimentele emise de servicii
+"""
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.events import CollectingListener, EventListener, use_listener, emit, ERROR, INFO
+from services.key_pool import APIKeyPool
+from services.flight_apis import SkyScrapperAPI
+
+
+class TestEvents(unittest.TestCase):
+    """Teste pentru listener-ele de evenimente"""
+
+    def test_emit_without_listener(self):
+        """Test emit fără listener nu are efect"""
+        emit('test', INFO, 'mesaj')
+
+    def test_listener_is_abstract(self):
+        """Test EventListener nu poate fi instanțiat fără on_event"""
+        with self.assertRaises(TypeError):
+            EventListener()
+
+    def test_collecting_listener(self):
+        """Test evenimentele ajung la listener-ul activ"""
+        listener = CollectingListener()
+        with use_listener(listener):
+            emit('test', INFO, 'mesaj', value=1)
+        emit('test', INFO, 'ignorat')
+        self.assertEqual(len(listener.events), 1)
+        self.assertEqual(listener.events[0].data, {'value': 1})
+
+    def test_service_runs_headless_in_threads(self):
+        """Test serviciul rulează în thread-uri fără Streamlit"""
+        api = SkyScrapperAPI(key_pool=APIKeyPool([], max_calls=5))
+
+        def search():
+            listener = CollectingListener()
+            with use_listener(listener):
+                result = api.search_flights('OTP', 'FCO', '2030-01-01')
+            return result, listener
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            outcomes = list(pool.map(lambda _: search(), range(4)))
+
+        for result, listener in outcomes:
+            self.assertEqual(result, [])
+            errors = [e for e in listener.events if e.level == ERROR]
+            self.assertTrue(any(e.kind == 'config_error' for e in errors))
+
+
+if __name__ == '__main__':
+    unittest.main()
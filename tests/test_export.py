@@ -0,0 +1,82 @@
+"""
+Teste pentru exportul multi-format
+"""
+import csv
+import gc
+import io
+import json
+import os
+import unittest
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.export import (
+    ExportCache, ExportFile, available_formats, export_bytes, export_to_file, iter_catalog_rows, iter_export
+)
+
+ROWS = [{'iata': f'A{i:02d}', 'name': f'Aeroport {i}', 'city': None if i % 5 else 'Oraș'} for i in range(25)]
+COLUMNS = ['iata', 'name', 'city']
+
+
+class TestExport(unittest.TestCase):
+    """Teste pentru iter_export și ExportCache"""
+
+    def test_csv_streams_in_batches(self):
+        """Test CSV e generat în mai multe chunk-uri și se citește înapoi"""
+        chunks = list(iter_export(iter(ROWS), COLUMNS, 'csv', batch_rows=10))
+        self.assertGreaterEqual(len(chunks), 3)
+        rows = list(csv.DictReader(io.StringIO(b''.join(chunks).decode('utf-8'))))
+        self.assertEqual(len(rows), 25)
+        self.assertEqual(rows[0]['iata'], 'A00')
+
+    def test_json_roundtrip(self):
+        """Test JSON valid, inclusiv pentru zero rânduri"""
+        data = json.loads(export_bytes(ROWS, COLUMNS, 'json'))
+        self.assertEqual(data[3], {'iata': 'A03', 'name': 'Aeroport 3', 'city': None})
+        self.assertEqual(json.loads(export_bytes([], COLUMNS, 'json')), [])
+
+    def test_unknown_or_unavailable_format(self):
+        """Test formatele necunoscute sau fără dependențe sunt refuzate"""
+        with self.assertRaises(ValueError):
+            iter_export(ROWS, COLUMNS, 'pdf')
+        for fmt in ('parquet', 'xlsx'):
+            if fmt not in available_formats():
+                with self.assertRaises(ValueError):
+                    iter_export(ROWS, COLUMNS, fmt)
+
+    def test_catalog_to_file(self):
+        """Test catalogul se scrie în fișier din generator"""
+        organized = {'Europa': {'Italia': [{'iata': 'FCO', 'name': 'Fiumicino', 'city': 'Roma'}]}}
+        rows = iter_catalog_rows(organized)
+        path = export_to_file(rows, ['iata', 'country', 'continent'], 'csv')
+        try:
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(f.read().splitlines()[1], 'FCO,Italia,Europa')
+        finally:
+            os.unlink(path)
+
+    def test_export_file_removed_when_released(self):
+        """Test fișierul unui ExportFile e șters când obiectul nu mai e referit"""
+        export_file = ExportFile(export_to_file(iter(ROWS), COLUMNS, 'csv'))
+        path = export_file.path
+        self.assertTrue(export_file.exists())
+        del export_file
+        gc.collect()
+        self.assertFalse(os.path.exists(path))
+
+    def test_cache_evicts_by_size(self):
+        """Test cache-ul păstrează cel mult max_bytes, eliminând cele mai vechi"""
+        cache = ExportCache(max_bytes=10)
+        built = []
+        cache.get_or_build('a', lambda: built.append('a') or b'12345')
+        cache.get_or_build('a', lambda: built.append('a') or b'12345')
+        self.assertEqual(built, ['a'])
+
+        cache.put('b', b'123456')
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('b'), b'123456')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,177 @@
+"""
+Teste pentru cursurile de schimb și conversia locală a prețurilor
+"""
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from config.settings import Settings
+from services import fx, resilience
+from services.cache_manager import cache_manager
+from services.flight_apis import FlightSearchService
+from services.fx import FXRates, FXTable, parse_rates
+from services.key_pool import APIKeyPool
+from services.stub_upstream import StubConfig, StubUpstreamServer
+
+RATES = {'base': 'EUR', 'date': '2030-01-01', 'rates': {'USD': 1.25, 'RON': 5.0}}
+
+ECB_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<gesmes:Envelope xmlns:gesmes="http://www.gesmes.org/xml/2002-08-01" xmlns="http://www.ecb.int/vocabulary/2002-08-01/eurofxref">
+  <gesmes:subject>Reference rates</gesmes:subject>
+  <Cube>
+    <Cube time="2030-01-01">
+      <Cube currency="USD" rate="1.25"/>
+      <Cube currency="GBP" rate="0.8"/>
+    </Cube>
+  </Cube>
+</gesmes:Envelope>"""
+
+
+def write_rates(directory: str, rates: dict = RATES) -> str:
+    path = os.path.join(directory, 'fx.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(rates, f)
+    return path
+
+
+class TestFXTable(unittest.TestCase):
+    """Teste pentru parsarea și aplicarea cursurilor"""
+
+    def test_parse_json_and_ecb(self):
+        """Test tabelul din JSON și din referința BCE"""
+        table = parse_rates(json.dumps(RATES))
+        self.assertEqual((table.base, table.date), ('EUR', '2030-01-01'))
+        self.assertEqual(table.rates['EUR'], 1.0)
+
+        ecb = parse_rates(ECB_XML)
+        self.assertEqual(ecb.rates, {'EUR': 1.0, 'USD': 1.25, 'GBP': 0.8})
+        self.assertEqual(ecb.date, '2030-01-01')
+        with self.assertRaises(ValueError):
+            parse_rates('{"rates": {}}')
+
+    def test_cross_rates(self):
+        """Test conversia între două monede diferite de bază"""
+        table = parse_rates(json.dumps(RATES))
+        self.assertAlmostEqual(table.convert(100, 'EUR', 'USD'), 125.0)
+        self.assertAlmostEqual(table.convert(125, 'USD', 'RON'), 500.0)
+        self.assertEqual(table.rate('XYZ', 'XYZ'), 1.0)
+        with self.assertRaises(KeyError):
+            table.rate('EUR', 'XYZ')
+
+    def test_convert_column(self):
+        """Test coloana de prețuri e convertită vectorizat, și pentru monede amestecate"""
+        table = parse_rates(json.dumps(RATES))
+        prices = pd.Series([100.0, 200.0, 125.0])
+        pd.testing.assert_series_equal(table.convert_column(prices, 'EUR', 'RON'),
+                                       pd.Series([500.0, 1000.0, 625.0]))
+        mixed = table.convert_column(prices, pd.Series(['EUR', 'EUR', 'USD']), 'EUR')
+        self.assertEqual(mixed.tolist(), [100.0, 200.0, 100.0])
+
+
+class TestFXRates(unittest.TestCase):
+    """Teste pentru încărcarea și reîmprospătarea tabelului"""
+
+    def setUp(self):
+        self.loads = 0
+        self.fail = False
+
+    def loader(self) -> FXTable:
+        self.loads += 1
+        if self.fail:
+            raise OSError("offline")
+        return FXTable('EUR', {'EUR': 1.0, 'USD': 1.0 + self.loads})
+
+    def test_loaded_once(self):
+        """Test tabelul e încărcat o singură dată cât e proaspăt"""
+        rates = FXRates(self.loader, refresh=3600)
+        self.assertIs(rates.table(), rates.table())
+        self.assertEqual(self.loads, 1)
+
+    def test_stale_table_refreshed_in_background(self):
+        """Test tabelul vechi e servit imediat și înlocuit în fundal"""
+        rates = FXRates(self.loader, refresh=0)
+        first = rates.table()
+        self.assertIs(rates.table(), first)
+        deadline = time.time() + 5
+        while rates.table().rates['USD'] == first.rates['USD'] and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertGreater(rates.table().rates['USD'], first.rates['USD'])
+
+    def test_failure_keeps_table_and_waits(self):
+        """Test o încărcare eșuată păstrează tabelul și nu e reîncercată imediat"""
+        rates = FXRates(self.loader, refresh=0, retry=3600)
+        first = rates.table()
+        self.fail = True
+        self.assertIs(rates.refresh(), first)
+        loads = self.loads
+        self.assertIs(rates.table(), first)
+        self.assertEqual(self.loads, loads)
+
+        empty = FXRates(self.loader, retry=3600)
+        self.assertIsNone(empty.table())
+        self.assertIsNone(empty.table())
+        self.assertEqual(self.loads, loads + 1)
+
+    def test_default_loader_reads_file(self):
+        """Test cursurile procesului vin din Settings.FX_RATES_FILE"""
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch.object(Settings, 'FX_RATES_FILE', write_rates(tmp)):
+            table = FXRates().table()
+        self.assertEqual(table.rates['USD'], 1.25)
+        self.assertTrue(table.source.endswith('fx.json'))
+
+
+class TestSearchCurrency(unittest.TestCase):
+    """Teste pentru căutarea în moneda de bază"""
+
+    def setUp(self):
+        resilience._breakers.clear()
+        cache_manager.clear_cache()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.stub = StubUpstreamServer(config=StubConfig(itineraries=5)).start()
+        self.patches = [
+            patch.object(Settings, 'SKY_SCRAPPER_BASE_URL', self.stub.url),
+            patch.object(Settings, 'FX_RATES_FILE', write_rates(self.tmp.name)),
+            patch.object(fx, '_rates', None),
+        ]
+        for p in self.patches:
+            p.start()
+        self.service = FlightSearchService()
+        self.service.sky_scrapper.key_pool = APIKeyPool(['test-key'], max_calls=100)
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+        self.stub.stop()
+        self.tmp.cleanup()
+        cache_manager.clear_cache()
+
+    def test_currencies_share_one_search(self):
+        """Test altă monedă e servită din aceeași căutare, convertită local"""
+        base = self.service.search_flights('OTP', 'FCO', '2030-01-01', currency='EUR')
+        usd = self.service.search_flights('OTP', 'FCO', '2030-01-01', currency='usd')
+        self.assertEqual(self.stub.calls_by_endpoint().get('search_flights'), 1)
+        self.assertEqual(usd.outcome, 'hit')
+
+        self.assertEqual({o.currency for o in base}, {'EUR'})
+        self.assertEqual({o.currency for o in usd}, {'USD'})
+        for eur_offer, usd_offer in zip(base, usd):
+            self.assertAlmostEqual(usd_offer.price, round(eur_offer.price * 1.25, 2))
+
+    def test_unknown_currency_kept_in_base(self):
+        """Test fără curs pentru moneda cerută prețurile rămân în moneda de bază"""
+        offers = self.service.search_flights('OTP', 'FCO', '2030-01-01', currency='JPY')
+        self.assertTrue(offers)
+        self.assertEqual({o.currency for o in offers}, {Settings.BASE_CURRENCY})
+
+
+if __name__ == '__main__':
+    unittest.main()
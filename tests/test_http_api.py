@@ -0,0 +1,199 @@
+"""
+Teste pentru API-ul HTTP local
+"""
+import gzip
+import http.client
+import json
+import threading
+import unittest
+from datetime import date, datetime, timedelta
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.cache_manager import cache_manager
+from services.flight_apis import FlightOffer, SearchResults
+from services.http_api import FlightAPIServer
+
+
+AIRPORTS = {
+    'Europa': {
+        'România': [{'iata': 'OTP', 'name': 'Henri Coandă', 'city': 'București', 'lat': 44.57, 'lng': 26.08}],
+        'Italia': [{'iata': 'FCO', 'name': 'Fiumicino', 'city': 'Roma', 'lat': 41.80, 'lng': 12.25}],
+    }
+}
+
+
+class FakeService:
+    """Serviciu fals pentru API"""
+
+    def search_flights(self, **kwargs):
+        departure = datetime(2030, 1, 1, 10, 0)
+        # Destinația LHR simulează o căutare oprită de termen (rezultate salvate),
+        # iar MAD una oprită înainte de primul rezultat
+        if kwargs['destination'] == 'MAD':
+            return SearchResults([], partial=True, outcome='partial')
+        partial = kwargs['destination'] == 'LHR'
+        return SearchResults([
+            FlightOffer(
+                id=f'SKY-{i}', source='Skyscanner', airline='Test Air', airline_code='TA',
+                origin=kwargs['origin'], destination=kwargs['destination'],
+                departure_time=departure, arrival_time=departure + timedelta(hours=2),
+                duration='2h 0m', price=100.0 + i, currency='EUR', cabin_class='economy',
+                stops=0, segments=[]
+            )
+            for i in range(50)
+        ], partial=partial, outcome='stale' if partial else 'miss')
+
+    def get_all_airports(self):
+        return AIRPORTS
+
+    def __init__(self):
+        # Monitoarele serviciului (ex: din worker), separate de cache_manager-ul procesului
+        self.monitors = {}
+
+    def add_price_monitor(self, origin, destination, departure_date, target_price=None):
+        self.monitors[f"{origin}-{destination}-{departure_date}"] = {'origin': origin, 'target_price': target_price}
+
+    def get_monitored_routes(self):
+        return dict(self.monitors)
+
+    def remove_price_monitor(self, route_key):
+        self.monitors.pop(route_key, None)
+
+
+class TestHTTPAPI(unittest.TestCase):
+    """Teste pentru FlightAPIServer"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FlightAPIServer(('127.0.0.1', 0), service=FakeService())
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.port = cls.server.server_address[1]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=5)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def request(self, method, path, body=None, headers=None):
+        self.conn.request(method, path, body=body, headers=headers or {})
+        response = self.conn.getresponse()
+        return response, response.read()
+
+    def test_search_streams_gzip_over_keep_alive(self):
+        """Test /search returnează lista comprimată, pe aceeași conexiune"""
+        departure = (date.today() + timedelta(days=30)).isoformat()
+        path = f'/search?origin=OTP&destination=FCO&departure_date={departure}'
+        for _ in range(2):
+            response, body = self.request('GET', path, headers={'Accept-Encoding': 'gzip'})
+            self.assertEqual(response.status, 200)
+            self.assertEqual(response.getheader('Transfer-Encoding'), 'chunked')
+            self.assertEqual(response.getheader('Content-Encoding'), 'gzip')
+            offers = json.loads(gzip.decompress(body))
+            self.assertEqual(len(offers), 50)
+            self.assertEqual(offers[0]['origin'], 'OTP')
+
+    def test_search_partial_header(self):
+        """Test rezultatele parțiale sunt marcate în headere"""
+        departure = (date.today() + timedelta(days=30)).isoformat()
+        for destination, partial, outcome in (('FCO', 'false', 'miss'), ('LHR', 'true', 'stale')):
+            response, body = self.request('GET', f'/search?origin=OTP&destination={destination}'
+                                                 f'&departure_date={departure}')
+            self.assertEqual(response.getheader('X-Search-Partial'), partial)
+            self.assertEqual(response.getheader('X-Search-Outcome'), outcome)
+            self.assertEqual(len(json.loads(body)), 50)
+
+    def test_search_timeout_without_offers(self):
+        """Test termenul expirat fără niciun rezultat răspunde 504, nu o listă goală"""
+        departure = (date.today() + timedelta(days=30)).isoformat()
+        response, body = self.request('GET', f'/search?origin=OTP&destination=MAD&departure_date={departure}')
+        self.assertEqual(response.status, 504)
+        self.assertTrue(json.loads(body)['errors'])
+
+    def test_search_validation(self):
+        """Test parametri invalizi"""
+        response, body = self.request('GET', '/search?origin=OTP&destination=OTP&departure_date=x')
+        self.assertEqual(response.status, 400)
+        self.assertTrue(json.loads(body)['errors'])
+
+    def test_airports_etag(self):
+        """Test /airports răspunde 304 pentru ETag neschimbat"""
+        response, body = self.request('GET', '/airports')
+        self.assertEqual(response.status, 200)
+        self.assertEqual(len(json.loads(body)), 2)
+        etag = response.getheader('ETag')
+
+        response, body = self.request('GET', '/airports', headers={'If-None-Match': etag})
+        self.assertEqual(response.status, 304)
+        self.assertEqual(body, b'')
+
+    def test_airports_export_streams_csv(self):
+        """Test exportul catalogului e trimis în flux"""
+        response, body = self.request('GET', '/airports/export?format=csv')
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.getheader('Transfer-Encoding'), 'chunked')
+        lines = body.decode('utf-8').splitlines()
+        self.assertEqual(lines[0], 'iata,name,city,country,continent,lat,lng')
+        self.assertEqual(len(lines), 3)
+
+        response, body = self.request('GET', '/airports/export?format=pdf')
+        self.assertEqual(response.status, 400)
+
+    def test_nearby(self):
+        """Test /nearby sortează după distanță"""
+        response, body = self.request('GET', '/nearby?lat=44.4&lng=26.1&radius_km=2000')
+        airports = json.loads(body)
+        self.assertEqual([a['iata'] for a in airports], ['OTP', 'FCO'])
+
+    def test_monitors(self):
+        """Test adăugare și listare monitoare"""
+        payload = json.dumps({'origin': 'otp', 'destination': 'fco', 'departure_date': '2030-01-01'})
+        response, body = self.request('POST', '/monitors', body=payload,
+                                      headers={'Content-Type': 'application/json'})
+        self.assertEqual(response.status, 201)
+        route_key = json.loads(body)['route_key']
+
+        response, body = self.request('GET', '/monitors')
+        self.assertIn(route_key, [m['route_key'] for m in json.loads(body)])
+
+        # Monitoarele sunt ale serviciului, nu ale cache_manager-ului local
+        self.assertNotIn(route_key, cache_manager.get_price_monitors())
+
+        response, body = self.request('DELETE', f'/monitors/{route_key}')
+        self.assertEqual(response.status, 200)
+        response, body = self.request('GET', '/monitors')
+        self.assertEqual(json.loads(body), [])
+        response, body = self.request('DELETE', f'/monitors/{route_key}')
+        self.assertEqual(response.status, 404)
+
+    def test_negative_limits_rejected(self):
+        """Test limit și max_results negative primesc 400"""
+        departure = (date.today() + timedelta(days=30)).isoformat()
+        for path in ('/nearby?lat=44.4&lng=26.1&limit=-1',
+                     f'/search?origin=OTP&destination=FCO&departure_date={departure}&max_results=-5'):
+            response, body = self.request('GET', path)
+            self.assertEqual(response.status, 400, path)
+            self.assertTrue(json.loads(body)['errors'])
+
+    def test_add_monitor_rejects_invalid_body(self):
+        """Test un corp care nu e obiect sau câmpuri de alt tip primesc 400"""
+        payloads = ['[]', '"x"', json.dumps({'origin': 1, 'destination': 'FCO', 'departure_date': '2030-01-01'}),
+                    json.dumps({'origin': 'OTP', 'destination': 'FCO', 'departure_date': '2030-01-01',
+                                'target_price': [1]})]
+        for payload in payloads:
+            response, body = self.request('POST', '/monitors', body=payload,
+                                          headers={'Content-Type': 'application/json'})
+            self.assertEqual(response.status, 400, payload)
+            self.assertIn('errors', json.loads(body))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+Teste pentru pool-ul de chei RapidAPI
+"""
+import unittest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Settings
+from services.cache_manager import RateLimiter
+from services.key_pool import APIKeyPool, RateLimitInfo, parse_rate_limit_headers
+
+
+class TestMergeKeys(unittest.TestCase):
+    """Teste pentru combinarea cheilor din configurare"""
+
+    def test_single_and_list(self):
+        """Test cheie unică plus listă separată prin virgulă"""
+        keys = Settings._merge_keys("k1", "k2, k3 ,k1")
+        self.assertEqual(keys, ["k1", "k2", "k3"])
+
+    def test_list_value(self):
+        """Test listă din secrets"""
+        keys = Settings._merge_keys("", ["a", "b", ""])
+        self.assertEqual(keys, ["a", "b"])
+
+
+class TestAPIKeyPool(unittest.TestCase):
+    """Teste pentru APIKeyPool"""
+
+    def test_least_loaded(self):
+        """Test cheile sunt folosite alternativ"""
+        pool = APIKeyPool(["a", "b"], max_calls=5)
+        first = pool.acquire()
+        second = pool.acquire()
+        self.assertNotEqual(first.key, second.key)
+
+    def test_throughput_scales_with_keys(self):
+        """Test capacitatea totală crește cu numărul de chei"""
+        pool = APIKeyPool(["a", "b", "c"], max_calls=2)
+        acquired = []
+        while True:
+            state = pool.acquire()
+            if state is None:
+                break
+            acquired.append(state)
+            pool.release(state, 200)
+        self.assertEqual(len(acquired), 6)
+
+    def test_quarantine_on_429(self):
+        """Test cheia cu 429 intră în carantină"""
+        pool = APIKeyPool(["a", "b"], max_calls=10, quarantine={429: 60, 403: 3600})
+        state = pool.acquire()
+        pool.release(state, 429)
+        for _ in range(5):
+            other = pool.acquire()
+            self.assertNotEqual(other.key, state.key)
+            pool.release(other, 200)
+
+    def test_monthly_quota(self):
+        """Test cota lunară epuizată"""
+        pool = APIKeyPool(["a"], max_calls=10, monthly_quota=2)
+        pool.release(pool.acquire(), 200)
+        pool.release(pool.acquire(), 200)
+        self.assertIsNone(pool.acquire())
+        self.assertIsNone(pool.wait_time())
+
+    def test_refund_unsent_call(self):
+        """Test un apel rezervat dar netrimis e returnat limiter-ului și cotei"""
+        pool = APIKeyPool(["a"], max_calls=1, monthly_quota=5)
+        state = pool.acquire()
+        self.assertIsNone(pool.acquire())
+        pool.release(state, refund=True)
+        self.assertEqual((state.used_this_month, state.in_flight), (0, 0))
+        self.assertIs(pool.acquire(), state)
+
+    def test_empty_pool(self):
+        """Test pool fără chei"""
+        pool = APIKeyPool([], max_calls=5)
+        self.assertEqual(len(pool), 0)
+        self.assertIsNone(pool.acquire(timeout=1))
+
+
+
+class TestUpstreamRateLimits(unittest.TestCase):
+    """Teste pentru rate limiting adaptiv din headere"""
+
+    def test_parse_rapidapi_headers(self):
+        """Test parsare headere RapidAPI"""
+        info = parse_rate_limit_headers({
+            'X-RateLimit-Requests-Limit': '500',
+            'X-RateLimit-Requests-Remaining': '12',
+            'X-RateLimit-Requests-Reset': '30',
+        })
+        self.assertEqual(info.limit, 500)
+        self.assertEqual(info.remaining, 12)
+        self.assertEqual(info.reset_in, 30)
+
+    def test_parse_missing_headers(self):
+        """Test răspuns fără headere de rate limit"""
+        self.assertIsNone(parse_rate_limit_headers({'Content-Type': 'application/json'}))
+
+    def test_limiter_tightens(self):
+        """Test bugetul upstream epuizat blochează până la reset"""
+        limiter = RateLimiter(max_calls=5, period=60)
+        limiter.apply_upstream(0, reset_in=10)
+        self.assertFalse(limiter.can_call())
+        self.assertAlmostEqual(limiter.wait_time(), 10, delta=0.5)
+
+    def test_limiter_caps_to_upstream(self):
+        """Test limiter-ul nu depășește bugetul upstream"""
+        limiter = RateLimiter(max_calls=5, period=60)
+        limiter.apply_upstream(2, reset_in=10)
+        self.assertTrue(limiter.try_acquire())
+        self.assertTrue(limiter.try_acquire())
+        self.assertFalse(limiter.try_acquire())
+
+    def test_limiter_relaxes_after_reset(self):
+        """Test limita upstream expiră la reset"""
+        limiter = RateLimiter(max_calls=5, period=60)
+        limiter.apply_upstream(0, reset_in=0)
+        self.assertTrue(limiter.can_call())
+        self.assertEqual(limiter.remaining(), 5)
+
+    def test_quarantine_until_reset(self):
+        """Test carantina după 429 durează exact până la reset"""
+        pool = APIKeyPool(["a"], max_calls=10, quarantine={429: 60})
+        state = pool.acquire()
+        pool.release(state, 429, RateLimitInfo(remaining=0, reset_in=0.2))
+        self.assertIsNone(pool.acquire())
+        self.assertIsNotNone(pool.acquire(timeout=1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+Teste pentru modelul de popularitate a rutelor
+"""
+import os
+import unittest
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.popularity import CountMinSketch, PopularityModel
+
+HOUR = 3600
+
+
+class TestCountMinSketch(unittest.TestCase):
+    """Teste pentru estimările sketch-ului"""
+
+    def test_never_underestimates(self):
+        """Test estimarea e cel puțin numărul real, cu eroarea mărginită"""
+        sketch = CountMinSketch(width=256, depth=4, seed=1)
+        counts = {f"route-{i}": (i % 7) + 1 for i in range(500)}
+        for key, count in counts.items():
+            sketch.add(key, count)
+        errors = [sketch.estimate(key) - count for key, count in counts.items()]
+        self.assertTrue(all(e >= 0 for e in errors))
+        # Garanția count-min: eroare sub e·N/width pentru aproape toate cheile
+        bound = 2.72 * sum(counts.values()) / 256
+        self.assertGreater(sum(e <= bound for e in errors) / len(errors), 0.95)
+
+
+class TestPopularityModel(unittest.TestCase):
+    """Teste pentru decădere și top-K"""
+
+    def test_scores_decay_with_half_life(self):
+        """Test scorul se înjumătățește după un timp de înjumătățire"""
+        model = PopularityModel(half_life=HOUR, seed=1)
+        for _ in range(8):
+            model.record('OTP-FCO', now=0)
+        self.assertAlmostEqual(model.score('OTP-FCO', now=0), 8)
+        self.assertAlmostEqual(model.score('OTP-FCO', now=HOUR), 4)
+        self.assertAlmostEqual(model.score('OTP-FCO', now=3 * HOUR), 1)
+
+    def test_top_prefers_recent_routes(self):
+        """Test o rută căutată recent trece înaintea uneia populare demult"""
+        model = PopularityModel(half_life=HOUR, capacity=3, seed=1)
+        for _ in range(10):
+            model.record('old', now=0)
+        for _ in range(4):
+            model.record('recent', now=4 * HOUR)
+        model.record('rare', now=4 * HOUR)
+        ranking = [key for key, _ in model.top(3, now=4 * HOUR)]
+        self.assertEqual(ranking, ['recent', 'rare', 'old'])
+
+    def test_capacity_keeps_heavy_hitters(self):
+        """Test top-K rămâne corect cu mai multe rute decât candidați"""
+        model = PopularityModel(half_life=24 * HOUR, capacity=5, width=1024, seed=1)
+        for i in range(200):
+            model.record(f"tail-{i}", now=i)
+            if i % 10 == 0:
+                for hot in ('A', 'B', 'C'):
+                    model.record(hot, now=i)
+        self.assertEqual({key for key, _ in model.top(3, now=200)}, {'A', 'B', 'C'})
+
+    def test_rescales_long_running(self):
+        """Test greutățile rămân finite după multe zile"""
+        model = PopularityModel(half_life=60, seed=1)
+        model.record('a', now=0)
+        for day in range(1, 10):
+            model.record('a', now=day * 86400)
+        self.assertAlmostEqual(model.score('a', now=9 * 86400), 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
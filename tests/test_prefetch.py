@@ -0,0 +1,111 @@
+"""
+Teste pentru prefetch-ul speculativ din formularul de căutare
+"""
+import os
+import time
+import unittest
+from unittest.mock import patch
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Settings
+from services import resilience
+from services.cache_manager import SearchKey, cache_manager
+from services.flight_apis import FlightSearchService
+from services.key_pool import APIKeyPool
+from services.prefetch import Prefetcher
+from services.stub_upstream import StubConfig, StubUpstreamServer
+
+ROUTE = SearchKey.create('OTP', 'FCO', '2030-01-01')
+CHANGED = SearchKey.create('OTP', 'FCO', '2030-01-02')
+
+
+class TestPrefetcher(unittest.TestCase):
+    """Teste pentru rezolvarea aeroporturilor, programarea și anularea căutărilor"""
+
+    def setUp(self):
+        resilience._breakers.clear()
+        cache_manager.clear_cache()
+        self.stub = StubUpstreamServer(config=StubConfig(itineraries=5)).start()
+        self.urls = patch.object(Settings, 'SKY_SCRAPPER_BASE_URL', self.stub.url)
+        self.urls.start()
+        self.service = FlightSearchService()
+        self.service.sky_scrapper.key_pool = APIKeyPool(['test-key'], max_calls=100)
+        self.prefetcher = Prefetcher(self.service, {'delay': 0.05, 'flights': True})
+
+    def tearDown(self):
+        self.prefetcher.shutdown()
+        self.urls.stop()
+        self.stub.stop()
+        cache_manager.clear_cache()
+
+    def calls(self, endpoint: str) -> int:
+        return self.stub.calls_by_endpoint().get(endpoint, 0)
+
+    def test_airport_resolved_once(self):
+        """Test aeroportul ales e rezolvat o singură dată, apoi servit din cache"""
+        self.prefetcher.prefetch_airport('otp').result(5)
+        self.assertIn('OTP', self.service.sky_scrapper._entity_cache)
+        self.assertIsNone(self.prefetcher.prefetch_airport('OTP'))
+        self.assertEqual(self.calls('search_airport'), 1)
+        # Future-ul terminat e uitat (callback-ul rulează după result())
+        deadline = time.time() + 5
+        while self.prefetcher._airports and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.prefetcher._airports, {})
+
+    def test_unresolved_airport_not_retried(self):
+        """Test un cod nerezolvat nu e recerut la fiecare rerun până la expirarea pauzei"""
+        sky = self.service.sky_scrapper
+        with patch.object(sky, 'search_airport', return_value=None) as search_airport:
+            self.assertIsNone(self.prefetcher.prefetch_airport('XXX').result(5))
+            deadline = time.time() + 5
+            while 'XXX' not in self.prefetcher._failed_airports and time.time() < deadline:
+                time.sleep(0.01)
+            for _ in range(3):
+                self.assertIsNone(self.prefetcher.prefetch_airport('XXX'))
+            self.assertEqual(search_airport.call_count, 1)
+
+            self.prefetcher._failed_airports.clear()
+            self.prefetcher.prefetch_airport('XXX').result(5)
+            self.assertEqual(search_airport.call_count, 2)
+
+    def test_submit_finds_warm_cache(self):
+        """Test căutarea trimisă după prefetch nu mai face apeluri upstream"""
+        task = self.prefetcher.prefetch_flights('s1', ROUTE)
+        self.assertIs(self.prefetcher.prefetch_flights('s1', ROUTE), task)
+        self.assertEqual(task.wait(5), 'miss')
+        calls = sum(self.stub.calls_by_endpoint().values())
+
+        self.assertIs(self.prefetcher.claim('s1', ROUTE), task)
+        self.assertIsNone(self.prefetcher.pending('s1'))
+        offers = self.service.search_flights('OTP', 'FCO', '2030-01-01')
+        self.assertEqual(len(offers), 5)
+        self.assertEqual(sum(self.stub.calls_by_endpoint().values()), calls)
+
+    def test_form_change_cancels(self):
+        """Test o modificare a formularului anulează prefetch-ul programat"""
+        self.prefetcher.config['delay'] = 5
+        first = self.prefetcher.prefetch_flights('s1', ROUTE)
+        self.prefetcher.config['delay'] = 0.05
+        second = self.prefetcher.prefetch_flights('s1', CHANGED)
+        self.assertEqual(first.wait(1), 'cancelled')
+        self.assertEqual(second.wait(5), 'miss')
+        self.assertIsNone(cache_manager.get('flights', ROUTE))
+        self.assertEqual(self.calls('search_flights'), 1)
+
+        self.assertFalse(self.prefetcher.cancel('s1'))
+        self.assertEqual(self.prefetcher.prefetch_flights('s2', CHANGED).wait(5), 'cached')
+
+    def test_respects_spare_budget(self):
+        """Test prefetch-ul nu consumă apelurile rezervate pentru căutările interactive"""
+        # 1 apel pe cheie, rezervat: niciun apel speculativ
+        self.service.sky_scrapper.key_pool = APIKeyPool(['test-key'], max_calls=1)
+        self.assertIsNone(self.prefetcher.prefetch_airport('OTP'))
+        self.assertEqual(self.prefetcher.prefetch_flights('s1', ROUTE).wait(5), 'budget')
+        self.assertEqual(sum(self.stub.calls_by_endpoint().values()), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Teste pentru profiler-ul prin eșantionare
+"""
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.profiler import SamplingProfiler
+
+
+def busy(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def blocked(seconds):
+    threading.Event().wait(seconds)
+
+
+class TestSamplingProfiler(unittest.TestCase):
+    """Teste pentru eșantionare, top-ul de funcții și formatul collapsed"""
+
+    def test_top_functions_and_wait(self):
+        """Test timpul se împarte între funcția ocupată și cea blocată"""
+        profiler = SamplingProfiler(interval=0.001)
+        with profiler:
+            busy(0.15)
+            blocked(0.15)
+
+        self.assertEqual(profiler.runs, 1)
+        self.assertGreater(profiler.samples, 20)
+        top = {row['function']: row for row in profiler.top_functions(modules=(__name__,))}
+        self.assertIn(f'{__name__}:busy', top)
+        self.assertIn(f'{__name__}:blocked', top)
+        self.assertGreater(top[f'{__name__}:busy']['self_ms'], 50)
+        self.assertGreater(profiler.wait_ms(), 50)
+
+    def test_accumulates_across_runs_and_writes_collapsed(self):
+        """Test eșantioanele se adună peste mai multe porniri, în alte fire"""
+        profiler = SamplingProfiler(interval=0.001)
+
+        def rerun():
+            with profiler:
+                busy(0.05)
+
+        for _ in range(2):
+            thread = threading.Thread(target=rerun)
+            thread.start()
+            thread.join()
+
+        self.assertEqual(profiler.runs, 2)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = profiler.write_collapsed(os.path.join(tmp, 'profile.collapsed'))
+            with open(path) as f:
+                lines = f.read().splitlines()
+        self.assertEqual(sum(int(line.rsplit(' ', 1)[1]) for line in lines), sum(profiler.stacks.values()))
+        self.assertTrue(lines[0].split(' ')[0].endswith(f'<locals>.rerun;{__name__}:busy'))
+
+
+if __name__ == '__main__':
+    unittest.main()
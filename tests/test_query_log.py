@@ -0,0 +1,71 @@
+"""
+Teste pentru jurnalul de căutări
+"""
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Settings
+from services import resilience
+from services.cache_manager import SearchKey, cache_manager
+from services.flight_apis import FlightSearchService
+from services.key_pool import APIKeyPool
+from services.query_log import QueryLog, get_query_log, read_entries
+from services.scheduler import Priority, request_context
+from services.stub_upstream import StubConfig, StubUpstreamServer
+
+
+class TestQueryLog(unittest.TestCase):
+    """Teste pentru scriere, rotație și citire"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'queries.jsonl')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_rotation_keeps_order(self):
+        """Test fișierele rotite se citesc în ordine cronologică"""
+        log = QueryLog(self.path, max_bytes=1000, backups=3, flush_interval=0)
+        key = SearchKey.create('OTP', 'FCO', '2030-01-01')
+        for i in range(40):
+            log.log_search(key, latency=i / 1000, cache='miss', offers=i)
+        log.close()
+
+        self.assertEqual(log.files(), [f"{self.path}.3", f"{self.path}.2", f"{self.path}.1", self.path])
+        self.assertTrue(all(os.path.getsize(p) <= 1000 for p in log.files()))
+        entries = list(read_entries(self.path, backups=3))
+        offers = [e['offers'] for e in entries]
+        self.assertEqual(offers, sorted(offers))
+        self.assertEqual(offers[-1], 39)
+        self.assertEqual(SearchKey.from_dict(entries[0]['key']), key)
+
+    def test_search_outcomes_are_logged(self):
+        """Test căutările prin serviciu ajung în jurnal cu rezultatul cache-ului"""
+        resilience._breakers.clear()
+        cache_manager.clear_cache()
+        with StubUpstreamServer(config=StubConfig(itineraries=10)).start() as stub, \
+                patch.multiple(Settings, SKY_SCRAPPER_BASE_URL=stub.url, QUERY_LOG_FILE=self.path):
+            service = FlightSearchService()
+            service.sky_scrapper.key_pool = APIKeyPool(['test-key'], max_calls=100)
+            service.search_flights('OTP', 'FCO', '2030-01-01')
+            service.search_flights('otp', 'fco', '2030-01-01')
+            with request_context(priority=Priority.BACKGROUND):
+                service.search_flights('OTP', 'MXP', '2030-01-01')
+            get_query_log().close()
+        cache_manager.clear_cache()
+
+        entries = list(read_entries(self.path))
+        self.assertEqual([e['cache'] for e in entries], ['miss', 'hit', 'miss'])
+        self.assertEqual([e['priority'] for e in entries], ['interactive', 'interactive', 'background'])
+        self.assertEqual(entries[0]['offers'], 10)
+        self.assertGreater(entries[0]['latency_ms'], entries[1]['latency_ms'])
+
+
+if __name__ == '__main__':
+    unittest.main()
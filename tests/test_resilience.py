@@ -0,0 +1,210 @@
+"""
+Teste pentru circuit breaker și cereri hedged
+"""
+import time
+import unittest
+from unittest.mock import patch
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import resilience
+from services.resilience import CircuitBreaker, CircuitState
+from services.key_pool import APIKeyPool
+from config.settings import Settings
+from services.cache_manager import SearchKey, cache_manager
+from services.flight_apis import FlightSearchService, SkyScrapperAPI
+from services.scheduler import DeadlineExceeded, request_context
+from services.events import CollectingListener, use_listener
+from services.stub_upstream import StubConfig, StubUpstreamServer, search_airport_payload
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Teste pentru CircuitBreaker"""
+
+    def test_opens_on_failure_rate(self):
+        """Test circuitul se deschide peste pragul de eșec"""
+        breaker = CircuitBreaker('test', min_calls=4, failure_rate=0.5, open_seconds=30)
+        breaker.record_success()
+        breaker.record_success()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+        self.assertFalse(breaker.allow_request())
+
+    def test_half_open_recovers(self):
+        """Test proba reușită închide circuitul"""
+        breaker = CircuitBreaker('test', min_calls=1, failure_rate=0.5, open_seconds=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        self.assertEqual(breaker.state, CircuitState.HALF_OPEN)
+        self.assertTrue(breaker.allow_request())
+        self.assertFalse(breaker.allow_request())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+
+    def test_half_open_failure_reopens(self):
+        """Test proba eșuată redeschide circuitul"""
+        breaker = CircuitBreaker('test', min_calls=1, failure_rate=0.5, open_seconds=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow_request())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+
+
+class TestSkyScrapperResilience(unittest.TestCase):
+    """Teste pentru SkyScrapperAPI contra unui server stub local"""
+
+    def setUp(self):
+        self.server = StubUpstreamServer().start()
+        resilience._breakers.clear()
+        with patch.object(Settings, 'SKY_SCRAPPER_BASE_URL', self.server.url):
+            self.api = SkyScrapperAPI(key_pool=APIKeyPool(['test-key'], max_calls=100))
+
+    def tearDown(self):
+        self.server.stop()
+        resilience._breakers.clear()
+
+    def test_breaker_fails_fast(self):
+        """Test după eșecuri repetate cererile nu mai ajung la server"""
+        self.server.config.errors = {call: 500 for call in range(1, 100)}
+        with patch.dict('config.settings.Settings.CIRCUIT_BREAKER',
+                        {'min_calls': 3, 'failure_rate': 0.5, 'open_seconds': 60}):
+            for _ in range(3):
+                self.assertEqual(self.api._make_request('flights/searchFlights', {}), {})
+            calls = self.server.calls
+            started = time.time()
+            self.assertEqual(self.api._make_request('flights/searchFlights', {}), {})
+            self.assertEqual(self.server.calls, calls)
+            self.assertLess(time.time() - started, 0.5)
+
+    def test_hedged_airport_search(self):
+        """Test cererea hedged ocolește un răspuns lent"""
+        self.server.config.delays = {1: 2.0}
+        with patch('config.settings.Settings.HEDGE_DEFAULT_DELAY', 0.1):
+            started = time.time()
+            result = self.api.search_airport('OTP')
+            elapsed = time.time() - started
+        self.assertEqual(result['entityId'], search_airport_payload('OTP')['data'][0]['entityId'])
+        self.assertLess(elapsed, 1.5)
+        self.assertEqual(self.server.calls, 2)
+
+
+class TestSearchDeadline(unittest.TestCase):
+    """Teste pentru termenul limită al căutării și rezultatele parțiale"""
+
+    def setUp(self):
+        resilience._breakers.clear()
+        cache_manager.clear_cache()
+        self.server = StubUpstreamServer(config=StubConfig(itineraries=30)).start()
+        self.service = FlightSearchService()
+        with patch.object(Settings, 'SKY_SCRAPPER_BASE_URL', self.server.url):
+            self.service.sky_scrapper = SkyScrapperAPI(key_pool=APIKeyPool(['test-key'], max_calls=100))
+
+    def tearDown(self):
+        self.server.stop()
+        resilience._breakers.clear()
+        cache_manager.clear_cache()
+
+    def search(self, deadline: float = None):
+        started = time.time()
+        with request_context(deadline=started + deadline if deadline else None):
+            results = self.service.search_flights('OTP', 'FCO', '2030-01-01', max_results=100)
+        return results, time.time() - started
+
+    def test_slow_upstream_returns_stale_within_deadline(self):
+        """Test căutarea se oprește la termen și întoarce rezultatele salvate, marcate parțiale"""
+        results, _ = self.search()
+        self.assertFalse(results.partial)
+        self.assertEqual(results.outcome, 'miss')
+        cache_manager.clear_cache('flights')
+
+        self.server.config.latency_ms = 2000
+        results, elapsed = self.search(deadline=0.4)
+        self.assertLess(elapsed, 1.0)
+        self.assertTrue(results.partial)
+        self.assertEqual(results.outcome, 'stale')
+        self.assertEqual(len(results), 30)
+        # Termenul depășit nu e un eșec al upstream-ului
+        self.assertEqual(resilience.get_circuit_breaker('flights/searchFlights').state, CircuitState.CLOSED)
+
+    def test_deadline_during_airport_lookup(self):
+        """Test termenul expirat la rezolvarea aeroportului nu e raportat ca aeroport negăsit"""
+        self.server.config.latency_ms = 2000
+        listener = CollectingListener()
+        with use_listener(listener):
+            results, elapsed = self.search(deadline=0.3)
+        # Fără niciun rezultat în termen căutarea e parțială, nu un eșec upstream
+        self.assertEqual((list(results), results.partial, results.outcome), ([], True, 'partial'))
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(listener.of_kind('airport_not_found'), [])
+        self.assertEqual(len(listener.of_kind('deadline_exceeded')), 1)
+
+    def test_key_released_once(self):
+        """Test cheia e eliberată o singură dată, fie că job-ul a expirat în coadă, fie în _send"""
+        api = self.service.sky_scrapper
+        url = f"{api.base_url}/flights/searchAirport"
+
+        def released(count):
+            # Callback-urile future-ului rulează după trezirea lui result()
+            deadline = time.time() + 5
+            while release.call_count < count and time.time() < deadline:
+                time.sleep(0.01)
+            return release.call_count
+
+        with patch.object(api.key_pool, 'release', wraps=api.key_pool.release) as release:
+            with request_context(deadline=time.time() - 1):
+                future = api._submit(url, {}, api.key_pool.acquire())
+                with self.assertRaises(DeadlineExceeded):
+                    future.result(5)
+            self.assertEqual(released(1), 1)
+
+            with patch.object(Settings, 'HTTP_TIMEOUT', 0):
+                future = api._submit(url, {}, api.key_pool.acquire())
+                with self.assertRaises(DeadlineExceeded):
+                    future.result(5)
+            self.assertEqual(released(2), 2)
+            time.sleep(0.05)
+            self.assertEqual(release.call_count, 2)
+
+        # Cererile netrimise nu consumă bugetul cheii
+        state = api.key_pool._keys[0]
+        self.assertEqual((state.limiter.remaining(), state.used_this_month, state.in_flight), (100, 0, 0))
+
+    def test_incomplete_search_polled_until_deadline(self):
+        """Test searchIncomplete e apelat până la răspunsul complet sau până la termen"""
+        self.server.config.incomplete_polls = 2
+        with patch.object(Settings, 'INCOMPLETE_POLL_INTERVAL', 0.05):
+            results, _ = self.search(deadline=5)
+        self.assertEqual((len(results), results.partial, results.outcome), (30, False, 'miss'))
+        self.assertEqual(self.server.calls_by_endpoint()['search_incomplete'], 2)
+
+        cache_manager.clear_cache()
+        with patch.object(Settings, 'INCOMPLETE_POLL_INTERVAL', 0.3):
+            results, elapsed = self.search(deadline=0.4)
+        # Un singur lot suplimentar încape în termen
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual((len(results), results.partial, results.outcome), (20, True, 'partial'))
+        self.assertEqual(self.server.calls_by_endpoint()['search_incomplete'], 3)
+        # Primele loturi nu intră în cache: următoarea căutare reîncearcă
+        self.assertIsNone(cache_manager.get('flights', SearchKey.create('OTP', 'FCO', '2030-01-01')))
+
+    def test_incomplete_refresh_not_cached(self):
+        """Test reîmprospătarea (warmup) terminată cu primele loturi nu scrie în cache"""
+        self.server.config.incomplete_polls = 2
+        key = SearchKey.create('OTP', 'FCO', '2030-01-01')
+        with patch.object(Settings, 'INCOMPLETE_POLL_INTERVAL', 0.3), \
+                request_context(deadline=time.time() + 0.4):
+            self.assertFalse(self.service.sky_scrapper.refresh_flights(key))
+        self.assertIsNone(cache_manager.get('flights', key))
+
+        with patch.object(Settings, 'INCOMPLETE_POLL_INTERVAL', 0.01):
+            self.assertTrue(self.service.sky_scrapper.refresh_flights(key))
+        self.assertEqual(len(cache_manager.get('flights', key)), 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
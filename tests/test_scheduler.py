@@ -0,0 +1,112 @@
+"""
+Teste pentru planificatorul de cereri upstream
+"""
+import time
+import threading
+import unittest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.scheduler import (
+    RequestScheduler, Priority, DeadlineExceeded, request_context, current_priority
+)
+
+
+class TestRequestScheduler(unittest.TestCase):
+    """Teste pentru RequestScheduler"""
+
+    def setUp(self):
+        self.scheduler = RequestScheduler(max_workers=1, class_limits={
+            Priority.INTERACTIVE: 1, Priority.PREFETCH: 1, Priority.BACKGROUND: 1
+        })
+
+    def tearDown(self):
+        self.scheduler.shutdown()
+
+    def _block_worker(self):
+        """Ocupă singurul worker până la eliberarea evenimentului"""
+        gate = threading.Event()
+        started = threading.Event()
+
+        def blocker():
+            started.set()
+            gate.wait(5)
+
+        future = self.scheduler.submit(blocker)
+        started.wait(5)
+        return gate, future
+
+    def test_run_returns_result(self):
+        """Test rezultatul apelului"""
+        self.assertEqual(self.scheduler.run(lambda x: x * 2, 21), 42)
+
+    def test_exception_propagates(self):
+        """Test excepțiile ajung la apelant"""
+        def fail():
+            raise ValueError("boom")
+        with self.assertRaises(ValueError):
+            self.scheduler.run(fail)
+
+    def test_priority_order(self):
+        """Test interactive trece înaintea background"""
+        gate, blocker = self._block_worker()
+        order = []
+        background = self.scheduler.submit(order.append, 'background', priority=Priority.BACKGROUND)
+        prefetch = self.scheduler.submit(order.append, 'prefetch', priority=Priority.PREFETCH)
+        interactive = self.scheduler.submit(order.append, 'interactive', priority=Priority.INTERACTIVE)
+        gate.set()
+        for future in (blocker, background, prefetch, interactive):
+            future.result(5)
+        self.assertEqual(order, ['interactive', 'prefetch', 'background'])
+
+    def test_stale_background_dropped(self):
+        """Test job-urile expirate sunt abandonate"""
+        gate, blocker = self._block_worker()
+        stale = self.scheduler.submit(lambda: 'x', priority=Priority.BACKGROUND,
+                                      deadline=time.time() + 0.05)
+        time.sleep(0.1)
+        gate.set()
+        blocker.result(5)
+        with self.assertRaises(DeadlineExceeded):
+            stale.result(5)
+        self.assertEqual(self.scheduler.stats()['dropped'], 1)
+
+    def test_session_fairness(self):
+        """Test sesiunile sunt servite prin rotație"""
+        gate, blocker = self._block_worker()
+        order = []
+        futures = [self.scheduler.submit(order.append, f'a{i}', session_id='a') for i in range(3)]
+        futures += [self.scheduler.submit(order.append, f'b{i}', session_id='b') for i in range(2)]
+        gate.set()
+        for future in [blocker] + futures:
+            future.result(5)
+        self.assertEqual(order, ['a0', 'b0', 'a1', 'b1', 'a2'])
+
+    def test_promote(self):
+        """Test job-urile promovate ale unei sesiuni trec înaintea celor din clasa veche"""
+        gate, blocker = self._block_worker()
+        order = []
+        futures = [
+            self.scheduler.submit(order.append, 'other', priority=Priority.PREFETCH, session_id='q'),
+            self.scheduler.submit(order.append, 'promoted', priority=Priority.PREFETCH, session_id='p'),
+        ]
+        self.assertEqual(self.scheduler.promote('p'), 1)
+        self.assertEqual(self.scheduler.promote('missing'), 0)
+        self.assertEqual(self.scheduler.stats()['queued']['INTERACTIVE'], 1)
+        gate.set()
+        for future in [blocker] + futures:
+            future.result(5)
+        self.assertEqual(order, ['promoted', 'other'])
+
+    def test_request_context(self):
+        """Test prioritatea preluată din context"""
+        self.assertEqual(current_priority(), Priority.INTERACTIVE)
+        with request_context(priority=Priority.BACKGROUND):
+            self.assertEqual(current_priority(), Priority.BACKGROUND)
+        self.assertEqual(current_priority(), Priority.INTERACTIVE)
+
+
+if __name__ == '__main__':
+    unittest.main()
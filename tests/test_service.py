@@ -0,0 +1,63 @@
+"""
+Teste pentru serviciul partajat per proces
+"""
+import os
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.flight_apis import AirLabsAPI, FlightSearchService, get_flight_service
+
+RAW_AIRPORTS = [
+    {'iata_code': 'OTP', 'name': 'Henri Coandă', 'city': 'București', 'country_code': 'RO'},
+    {'iata_code': 'FCO', 'name': 'Fiumicino', 'city': 'Roma', 'country_code': 'IT'},
+]
+
+
+class TestSharedService(unittest.TestCase):
+    """Teste pentru get_flight_service și încărcarea catalogului"""
+
+    def test_singleton(self):
+        """Test aceeași instanță din orice thread"""
+        seen = []
+        threads = [threading.Thread(target=lambda: seen.append(get_flight_service())) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len({id(s) for s in seen}), 1)
+        self.assertIs(seen[0], get_flight_service())
+
+    def test_catalog_loaded_once_under_concurrency(self):
+        """Test sesiunile concurente declanșează o singură încărcare a catalogului"""
+        calls = []
+
+        def slow_get_airports(self):
+            calls.append(1)
+            time.sleep(0.1)
+            return RAW_AIRPORTS
+
+        service = FlightSearchService()
+        results = []
+        with patch.object(AirLabsAPI, 'get_airports', slow_get_airports):
+            threads = [threading.Thread(target=lambda: results.append(service.get_all_airports()))
+                       for _ in range(10)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(r is results[0] for r in results))
+        self.assertEqual(sum(len(countries) for countries in results[0].values()), 2)
+
+        service.clear_caches()
+        self.assertEqual(service._airports_cache, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
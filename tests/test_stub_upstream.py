@@ -0,0 +1,77 @@
+"""
+Teste pentru serverul upstream stub
+"""
+import os
+import unittest
+from unittest.mock import patch
+
+import requests
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Settings
+from services import resilience
+from services.cache_manager import cache_manager
+from services.flight_apis import AirLabsAPI, SkyScrapperAPI
+from services.key_pool import APIKeyPool
+from services.stub_upstream import StubConfig, StubUpstreamServer
+
+
+class TestStubUpstream(unittest.TestCase):
+    """Teste pentru StubUpstreamServer folosit de clienții reali"""
+
+    def setUp(self):
+        self.server = StubUpstreamServer(config=StubConfig(itineraries=30, airports=500)).start()
+        resilience._breakers.clear()
+        cache_manager.clear_cache()
+        self.urls = patch.multiple(Settings, SKY_SCRAPPER_BASE_URL=self.server.url,
+                                   AIRLABS_BASE_URL=self.server.airlabs_url)
+        self.urls.start()
+
+    def tearDown(self):
+        self.urls.stop()
+        self.server.stop()
+        resilience._breakers.clear()
+        cache_manager.clear_cache()
+
+    def test_clients_use_stub(self):
+        """Test căutarea și catalogul merg prin stub, cu rezultate deterministe"""
+        api = SkyScrapperAPI(key_pool=APIKeyPool(['test-key'], max_calls=100))
+        offers = api.search_flights('OTP', 'FCO', '2030-01-01')
+        self.assertEqual(len(offers), 30)
+        # Fără cache, stub-ul generează același răspuns (entityId-urile rămân în cache-ul clientului)
+        cache_manager.clear_cache()
+        again = api.search_flights('OTP', 'FCO', '2030-01-01')
+        self.assertEqual([o.price for o in offers], [o.price for o in again])
+
+        self.assertEqual(len(AirLabsAPI().get_airports()), 500)
+        self.assertEqual(self.server.calls_by_endpoint(),
+                         {'search_airport': 2, 'search_flights': 2, 'airports': 1})
+
+    def test_rate_limit_headers(self):
+        """Test bugetul per cheie apare în headere și se termină cu 429"""
+        self.server.config.rate_limit = 2
+        url = f"{self.server.url}/api/v1/flights/searchAirport"
+        statuses = []
+        for _ in range(3):
+            response = requests.get(url, params={'query': 'OTP'}, headers={'x-rapidapi-key': 'k1'})
+            statuses.append(response.status_code)
+        self.assertEqual(statuses, [200, 200, 429])
+        self.assertEqual(response.headers['x-ratelimit-requests-remaining'], '0')
+        self.assertIn('retry-after', response.headers)
+        other = requests.get(url, params={'query': 'OTP'}, headers={'x-rapidapi-key': 'k2'})
+        self.assertEqual(other.status_code, 200)
+
+    def test_error_injection(self):
+        """Test rata de erori 5xx configurată"""
+        self.server.config.error_5xx = 0.5
+        url = f"{self.server.url}/api/v1/flights/searchAirport"
+        statuses = [requests.get(url, params={'query': 'OTP'}).status_code for _ in range(200)]
+        errors = sum(status >= 500 for status in statuses)
+        self.assertGreater(errors, 60)
+        self.assertLess(errors, 140)
+
+
+if __name__ == '__main__':
+    unittest.main()
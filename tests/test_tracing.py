@@ -0,0 +1,87 @@
+"""
+Teste pentru tracing-ul etapelor de căutare
+"""
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Settings
+from services import resilience
+from services.cache_manager import cache_manager
+from services.flight_apis import FlightSearchService
+from services.key_pool import APIKeyPool
+from services.stub_upstream import StubConfig, StubUpstreamServer
+from services.tracing import NULL_SPAN, FileSpanExporter, current_span, span, trace, traced
+
+
+class TestTracing(unittest.TestCase):
+    """Teste pentru span-uri, waterfall și export"""
+
+    def test_disabled_is_noop(self):
+        """Test fără trace activ span-urile sunt nule"""
+        self.assertIs(span('x', a=1), NULL_SPAN)
+        self.assertIs(current_span(), NULL_SPAN)
+
+        @traced('f')
+        def f(x):
+            current_span().set_attribute('x', x)
+            return x * 2
+
+        self.assertEqual(f(3), 6)
+
+    def test_nested_spans_and_export(self):
+        """Test ierarhia span-urilor și exportul OTLP/JSON"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'traces.jsonl')
+            with trace('search', exporter=FileSpanExporter(path), route='OTP-FCO') as t:
+                with span('resolve', query='OTP') as s:
+                    s.set_attribute('cache_hit', False)
+                    with span('http', status=200, bytes=1024):
+                        pass
+                with self.assertRaises(ValueError):
+                    with span('parse'):
+                        raise ValueError('bad json')
+
+            rows = t.waterfall()
+            self.assertEqual([(r['name'], r['depth']) for r in rows],
+                             [('search', 0), ('resolve', 1), ('http', 2), ('parse', 1)])
+            self.assertEqual(rows[3]['error'], 'ValueError: bad json')
+
+            with open(path) as f:
+                exported = json.loads(f.readline())
+            spans = exported['resourceSpans'][0]['scopeSpans'][0]['spans']
+            self.assertEqual(len(spans), 4)
+            by_name = {s['name']: s for s in spans}
+            self.assertNotIn('parentSpanId', by_name['search'])
+            self.assertEqual(by_name['http']['parentSpanId'], by_name['resolve']['spanId'])
+            self.assertIn({'key': 'bytes', 'value': {'intValue': '1024'}}, by_name['http']['attributes'])
+            self.assertEqual(by_name['parse']['status']['code'], 2)
+
+    def test_search_pipeline_spans(self):
+        """Test o căutare prin stub produce toate etapele pipeline-ului"""
+        cache_manager.clear_cache()
+        resilience._breakers.clear()
+        with StubUpstreamServer(config=StubConfig(itineraries=20)).start() as stub, \
+                patch.object(Settings, 'SKY_SCRAPPER_BASE_URL', stub.url):
+            service = FlightSearchService()
+            service.sky_scrapper.key_pool = APIKeyPool(['test-key'], max_calls=100)
+            with trace('search', exporter=FileSpanExporter(os.devnull)) as t:
+                service.search_flights('OTP', 'FCO', '2030-01-01')
+        cache_manager.clear_cache()
+
+        rows = {r['name']: r for r in t.waterfall()}
+        for name in ('service.search_flights', 'flights_lookup', 'resolve_origin', 'resolve_destination',
+                     'http', 'json_decode', 'parse_flights', 'filter_sort', 'price_history'):
+            self.assertIn(name, rows)
+        self.assertEqual(rows['parse_flights']['attributes']['offers'], 20)
+        self.assertFalse(rows['flights_lookup']['attributes']['cache_hit'])
+        self.assertGreater(rows['http']['attributes']['bytes'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
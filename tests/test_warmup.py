@@ -0,0 +1,76 @@
+"""
+Teste pentru pre-încălzirea cache-ului de zboruri
+"""
+import os
+import unittest
+from unittest.mock import patch
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Settings
+from services import resilience
+from services.cache_manager import SearchKey, cache_manager
+from services.flight_apis import FlightSearchService
+from services.key_pool import APIKeyPool
+from services.popularity import PopularityModel
+from services.stub_upstream import StubConfig, StubUpstreamServer
+from services.warmup import WarmupJob
+
+POPULAR = SearchKey.create('OTP', 'FCO', '2030-01-01')
+SECOND = SearchKey.create('OTP', 'MXP', '2030-01-01')
+PAST = SearchKey.create('OTP', 'LHR', '2020-01-01')
+
+
+class TestWarmupJob(unittest.TestCase):
+    """Teste pentru alegerea rutelor și bugetul job-ului"""
+
+    def setUp(self):
+        resilience._breakers.clear()
+        cache_manager.clear_cache()
+        self.stub = StubUpstreamServer(config=StubConfig(itineraries=5)).start()
+        self.urls = patch.object(Settings, 'SKY_SCRAPPER_BASE_URL', self.stub.url)
+        self.urls.start()
+        self.service = FlightSearchService()
+        self.service.sky_scrapper.key_pool = APIKeyPool(['test-key'], max_calls=100)
+        self.model = PopularityModel(half_life=3600, seed=1)
+        for key, count in ((POPULAR, 5), (SECOND, 2), (PAST, 9)):
+            for _ in range(count):
+                self.model.record(key)
+
+    def tearDown(self):
+        self.urls.stop()
+        self.stub.stop()
+        cache_manager.clear_cache()
+
+    def make_job(self, **config) -> WarmupJob:
+        return WarmupJob(self.service, self.model, {'min_score': 0.5, **config})
+
+    def test_refreshes_missing_and_expiring_routes(self):
+        """Test rutele populare lipsă sunt încărcate, apoi doar cele care expiră"""
+        job = self.make_job()
+        report = job.run_once()
+        self.assertEqual(report.refreshed, [POPULAR, SECOND])
+        self.assertEqual(len(cache_manager.get('flights', POPULAR)), 5)
+        self.assertIsNone(cache_manager.get('flights', PAST))
+
+        self.assertEqual(job.run_once().refreshed, [])
+        self.assertEqual(job.run_once().fresh, 2)
+
+        # Cu pragul peste TTL, fiecare trecere le reîmprospătează
+        calls = self.stub.calls_by_endpoint()['search_flights']
+        self.assertEqual(len(self.make_job(refresh_before=400).run_once().refreshed), 2)
+        self.assertEqual(self.stub.calls_by_endpoint()['search_flights'], calls + 2)
+
+    def test_respects_spare_budget(self):
+        """Test job-ul se oprește când bugetul liber nu acoperă o reîmprospătare"""
+        # 5 apeluri pe cheie, 2 rezervate: ajung pentru prima rută (3 apeluri), nu și a doua
+        self.service.sky_scrapper.key_pool = APIKeyPool(['test-key'], max_calls=5)
+        report = self.make_job().run_once()
+        self.assertEqual(report.refreshed, [POPULAR])
+        self.assertEqual(report.skipped_budget, 1)
+        self.assertEqual(self.service.sky_scrapper.key_pool.spare_calls(), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+"""
+Teste pentru procesul worker
+"""
+import os
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.events import CollectingListener, use_listener, emit, INFO
+from services.flight_apis import FlightOffer
+from multiprocessing import AuthenticationError
+
+from services.worker import SearchWorker, WorkerClient, RemoteFlightSearchService, serve, parse_address, authkey_path
+
+
+class SlowService:
+    """Serviciu fals, lent, care numără apelurile"""
+
+    def __init__(self, delay=0.3):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def search_flights(self, **kwargs):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        emit('search_done', INFO, 'gata')
+        departure = datetime(2030, 1, 1, 10, 0)
+        return [FlightOffer(
+            id='SKY-1', source='Skyscanner', airline='Test Air', airline_code='TA',
+            origin=kwargs['origin'], destination=kwargs['destination'],
+            departure_time=departure, arrival_time=departure + timedelta(hours=2),
+            duration='2h 0m', price=99.0, currency='EUR', cabin_class='economy',
+            stops=0, segments=[]
+        )]
+
+    def get_monitored_routes(self):
+        raise KeyError('boom')
+
+
+class TestWorker(unittest.TestCase):
+    """Teste pentru SearchWorker și clientul său"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.address = os.path.join(cls.tmp.name, 'worker.sock')
+        cls.service = SlowService()
+        cls.worker = SearchWorker(service=cls.service, threads=4)
+        cls.stop = threading.Event()
+        ready = threading.Event()
+        cls.thread = threading.Thread(target=serve, args=(cls.address, cls.worker),
+                                      kwargs={'ready': ready, 'stop': cls.stop}, daemon=True)
+        cls.thread.start()
+        ready.wait(5)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.stop.set()
+        # O conexiune deblochează accept() ca serverul să se oprească
+        WorkerClient(cls.address)._connection().close()
+        cls.thread.join(5)
+        cls.worker.shutdown()
+        cls.tmp.cleanup()
+
+    def test_parse_address(self):
+        """Test host:port devine adresă TCP"""
+        self.assertEqual(parse_address('127.0.0.1:9000'), ('127.0.0.1', 9000))
+        self.assertEqual(parse_address('/tmp/w.sock'), '/tmp/w.sock')
+
+    def test_remote_search_replays_events(self):
+        """Test căutare prin worker cu evenimentele retrimise local"""
+        remote = RemoteFlightSearchService(WorkerClient(self.address), poll_interval=0.05)
+        listener = CollectingListener()
+        with use_listener(listener):
+            offers = remote.search_flights(origin='OTP', destination='FCO', departure_date='2030-01-01')
+        self.assertEqual(offers[0].origin, 'OTP')
+        self.assertEqual(len(listener.of_kind('search_done')), 1)
+
+    def test_identical_jobs_share_execution(self):
+        """Test cereri identice simultane folosesc același job"""
+        client = WorkerClient(self.address)
+        before = self.service.calls
+        first = client.submit('search_flights', origin='OTP', destination='LHR', departure_date='2030-02-01')
+        second = client.submit('search_flights', origin='OTP', destination='LHR', departure_date='2030-02-01')
+        self.assertEqual(first, second)
+        self.assertEqual(client.poll(first)['status'], 'pending')
+        self.assertEqual(client.wait(first, timeout=5)['status'], 'done')
+        self.assertEqual(self.service.calls, before + 1)
+
+    def test_bad_authkey_does_not_stop_server(self):
+        """Test un client cu cheie greșită e respins, iar serverul rămâne pornit"""
+        with self.assertRaises(AuthenticationError):
+            WorkerClient(self.address, authkey=b'wrong')._connection()
+        self.assertEqual(WorkerClient(self.address).stats()['status'], 'ok')
+        # Niciun drept pentru grup sau alți utilizatori, de la creare
+        self.assertEqual(os.stat(self.address).st_mode & 0o077, 0)
+
+    def test_generated_socket_authkey(self):
+        """Test fără FLIGHT_WORKER_AUTHKEY cheia e aleatoare și lizibilă doar de proprietar"""
+        path = authkey_path(self.address)
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o600)
+        with open(path, 'rb') as f:
+            self.assertEqual(len(f.read()), 32)
+        with self.assertRaises(AuthenticationError):
+            WorkerClient(self.address, authkey=b'flight-search')._connection()
+
+    def test_invalid_message(self):
+        """Test un mesaj care nu e dict primește o eroare, iar conexiunea rămâne utilizabilă"""
+        client = WorkerClient(self.address)
+        self.assertEqual(client.request(['stats'])['status'], 'error')
+        self.assertEqual(client.stats()['status'], 'ok')
+
+    def test_tcp_requires_authkey(self):
+        """Test worker-ul nu pornește pe host:port fără cheie explicită"""
+        with self.assertRaises(ValueError):
+            serve(('127.0.0.1', 0), self.worker, authkey=b'')
+        with self.assertRaises(ValueError):
+            WorkerClient('127.0.0.1:9000', authkey=b'')
+
+    def test_errors_are_reported(self):
+        """Test excepțiile din worker ajung la client"""
+        remote = RemoteFlightSearchService(WorkerClient(self.address), poll_interval=0.05)
+        with self.assertRaises(RuntimeError):
+            remote.get_monitored_routes()
+        with self.assertRaises(RuntimeError):
+            WorkerClient(self.address).submit('clear_cache')
+
+
+if __name__ == '__main__':
+    unittest.main()
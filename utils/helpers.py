@@ -2,7 +2,8 @@
 Funcții helper pentru aplicație
 """
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
+import math
 import re
 
 
@@ -46,6 +47,15 @@ def format_duration(duration_str: str) -> str:
     return duration_str
 
 
+CURRENCY_SYMBOLS = {
+    'EUR': '€',
+    'USD': '$',
+    'GBP': '£',
+    'RON': 'lei',
+    'CHF': 'CHF'
+}
+
+
 def format_price(price: float, currency: str = 'EUR') -> str:
     """
     Formatează prețul
@@ -57,15 +67,7 @@ def format_price(price: float, currency: str = 'EUR') -> str:
     Returns:
         String formatat (ex: "€123.45")
     """
-    currency_symbols = {
-        'EUR': '€',
-        'USD': '$',
-        'GBP': '£',
-        'RON': 'lei',
-        'CHF': 'CHF'
-    }
-    
-    symbol = currency_symbols.get(currency, currency)
+    symbol = CURRENCY_SYMBOLS.get(currency, currency)
     
     if currency in ['EUR', 'USD', 'GBP']:
         return f"{symbol}{price:,.2f}"
@@ -216,3 +218,38 @@ def calculate_price_per_person(total_price: float, passengers: int) -> float:
     if passengers <= 0:
         return total_price
     return round(total_price / passengers, 2)
+
+
+def calculate_distance_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """
+    Calculează distanța ortodromică dintre două puncte (formula haversine)
+    
+    Args:
+        lat1, lng1: Coordonatele primului punct
+        lat2, lng2: Coordonatele celui de-al doilea punct
+    
+    Returns:
+        Distanța în kilometri
+    """
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = (math.sin((lat2 - lat1) / 2) ** 2 +
+         math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2)
+    return 2 * 6371.0 * math.asin(math.sqrt(a))
+
+
+def page_bounds(total: int, page: int, page_size: int) -> Tuple[int, int, int]:
+    """
+    Limitele unei pagini de rezultate
+    
+    Args:
+        total: Numărul total de elemente
+        page: Indexul paginii (de la 0); e limitat la intervalul valid
+        page_size: Elemente pe pagină
+    
+    Returns:
+        (start, end, număr_pagini)
+    """
+    page_count = max(1, math.ceil(total / page_size))
+    page = min(max(page, 0), page_count - 1)
+    start = page * page_size
+    return start, min(start + page_size, total), page_count